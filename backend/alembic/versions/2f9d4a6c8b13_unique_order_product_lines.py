@@ -0,0 +1,115 @@
+"""unique_order_product_lines
+
+Revision ID: 2f9d4a6c8b13
+Revises: 8e4b7c2d9f61
+Create Date: 2026-10-18 22:40:19.217304
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f9d4a6c8b13'
+down_revision: Union[str, Sequence[str], None] = '8e4b7c2d9f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNIQUE_INDEX = 'uq_order_products_order_id_product_id'
+
+
+def _index_is_valid(name: str) -> bool | None:
+    """Whether the index is usable; ``None`` when it does not exist."""
+    return op.get_bind().execute(
+        sa.text(
+            """
+            SELECT i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name
+            """
+        ),
+        {"name": name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Older code could store the same product twice in an order; fold the
+    # duplicates into one line so the unique index can be built.
+    op.execute(
+        """
+        UPDATE order_products op
+        SET quantity = merged.quantity
+        FROM (
+            SELECT min(id) AS id, sum(quantity) AS quantity
+            FROM order_products
+            GROUP BY order_id, product_id
+            HAVING count(*) > 1
+        ) merged
+        WHERE op.id = merged.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM order_products op
+        USING order_products kept
+        WHERE op.order_id = kept.order_id
+          AND op.product_id = kept.product_id
+          AND op.id > kept.id
+        """
+    )
+
+    # The unique index is the ON CONFLICT target of order line upserts and
+    # also serves lookups by order_id, which makes the old index redundant.
+    with op.get_context().autocommit_block():
+        # A concurrent build that failed, e.g. on a duplicate inserted after
+        # the cleanup above, leaves an invalid index behind that
+        # IF NOT EXISTS would take for done.
+        if _index_is_valid(UNIQUE_INDEX) is False:
+            op.drop_index(
+                UNIQUE_INDEX,
+                table_name='order_products',
+                postgresql_concurrently=True,
+            )
+        op.create_index(
+            UNIQUE_INDEX,
+            'order_products',
+            ['order_id', 'product_id'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Upserts cannot use an invalid index; keep the old one until the
+        # new one is usable.
+        if not _index_is_valid(UNIQUE_INDEX):
+            raise RuntimeError(
+                f"{UNIQUE_INDEX} was not built; run the migration again"
+            )
+        op.drop_index(
+            'ix_order_products_order_id',
+            table_name='order_products',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_order_products_order_id',
+            'order_products',
+            ['order_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            UNIQUE_INDEX,
+            table_name='order_products',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
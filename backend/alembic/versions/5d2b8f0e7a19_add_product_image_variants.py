@@ -0,0 +1,31 @@
+"""add_product_image_variants
+
+Revision ID: 5d2b8f0e7a19
+Revises: c4e1a9d27b53
+Create Date: 2026-10-18 19:05:41.528930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8f0e7a19'
+down_revision: Union[str, Sequence[str], None] = 'c4e1a9d27b53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "product_images",
+        sa.Column("variants", sa.JSON(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("product_images", "variants")
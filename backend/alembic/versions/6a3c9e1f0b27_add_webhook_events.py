@@ -0,0 +1,53 @@
+"""add_webhook_events
+
+Revision ID: 6a3c9e1f0b27
+Revises: 2f9d4a6c8b13
+Create Date: 2026-10-18 23:41:15.208517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a3c9e1f0b27'
+down_revision: Union[str, Sequence[str], None] = '2f9d4a6c8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('webhook_events',
+    sa.Column('provider', sa.String(length=32), nullable=False),
+    sa.Column('event_id', sa.String(length=255), nullable=False),
+    sa.Column('event_type', sa.String(length=128), nullable=False),
+    sa.Column('object_id', sa.String(length=255), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('provider', 'event_id', name='uq_webhook_events_provider_event_id')
+    )
+    op.create_index(
+        'ix_webhook_events_pending',
+        'webhook_events',
+        ['provider', 'object_id'],
+        unique=False,
+        postgresql_where=sa.text('processed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_webhook_events_pending',
+        table_name='webhook_events',
+        postgresql_where=sa.text('processed_at IS NULL'),
+    )
+    op.drop_table('webhook_events')
@@ -0,0 +1,76 @@
+"""add_sales_rollups
+
+Revision ID: 8e4b7c2d9f61
+Revises: 5d2b8f0e7a19
+Create Date: 2026-10-18 21:12:07.643215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b7c2d9f61'
+down_revision: Union[str, Sequence[str], None] = '5d2b8f0e7a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', postgresql.ENUM(name='orderstatus', create_type=False), nullable=False),
+    sa.Column('orders_count', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'status', name='uq_sales_rollups_day_status')
+    )
+    op.create_table('product_sales_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'product_id', name='uq_product_sales_rollups_day_product_id')
+    )
+
+    # Backfill history once; the scheduled task only revisits recent days.
+    op.execute(
+        """
+        INSERT INTO sales_rollups (day, status, orders_count, amount)
+        SELECT date(created_at), status, count(id), coalesce(sum(amount), 0)
+        FROM orders
+        GROUP BY date(created_at), status
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO product_sales_rollups
+            (day, product_id, category_id, quantity, revenue)
+        SELECT date(o.created_at), op.product_id, p.category_id,
+               sum(op.quantity), sum(op.quantity * op.price)
+        FROM order_products op
+        JOIN orders o ON o.id = op.order_id
+        JOIN products p ON p.id = op.product_id
+        WHERE o.status = 'PAYED'
+        GROUP BY date(o.created_at), op.product_id, p.category_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('product_sales_rollups')
+    op.drop_table('sales_rollups')
@@ -0,0 +1,64 @@
+"""add_secondary_indexes
+
+Revision ID: c4e1a9d27b53
+Revises: 110307a101c2
+Create Date: 2026-10-18 17:30:12.104381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a9d27b53'
+down_revision: Union[str, Sequence[str], None] = '110307a101c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# users.email, users.token and promocodes.code are already covered by their
+# unique constraints, promocode_actions.promo_id by its primary key.
+INDEXES = [
+    ('ix_orders_user_id_status_created_at', 'orders', ['user_id', 'status', 'created_at'], None),
+    ('ix_orders_created_at', 'orders', ['created_at'], None),
+    ('ix_order_products_order_id', 'order_products', ['order_id'], None),
+    ('ix_order_products_product_id', 'order_products', ['product_id'], None),
+    ('ix_products_category_id_price', 'products', ['category_id', 'price'], None),
+    ('ix_products_price_id', 'products', ['price', 'id'], None),
+    ('ix_products_available_price_id', 'products', ['price', 'id'], 'in_stock AND quantity > 0'),
+    ('ix_product_images_product_id_order', 'product_images', ['product_id', 'order'], None),
+    ('ix_invoices_uid', 'invoices', ['uid'], None),
+    ('ix_invoices_order_id', 'invoices', ['order_id'], None),
+    ('ix_invoices_provider_uid', 'invoices', ['provider_uid'], 'provider_uid IS NOT NULL'),
+    ('ix_promocode_actions_user_id_promo_id', 'promocode_actions', ['user_id', 'promo_id'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while indexes build, but it
+    # cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
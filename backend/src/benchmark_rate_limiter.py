@@ -0,0 +1,166 @@
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from redis.asyncio import Redis
+
+from clients import RedisClient
+from core.rate_limiter import Algorithm, LocalRateLimitFilter, RateLimiter
+from core.rate_limiter.rate_limiter_factory import parse_policy
+from entrypoint.config import create_config
+
+MODES = [
+    (Algorithm.SLIDING_WINDOW, False),
+    (Algorithm.SLIDING_WINDOW, True),
+    (Algorithm.GCRA, False),
+    (Algorithm.GCRA, True),
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare the rate limiter algorithms, with and without the local "
+            "filter, against the configured Redis"
+        ),
+    )
+    parser.add_argument("--redis-url", type=str, default=None)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=1_000)
+    parser.add_argument(
+        "--hot-clients",
+        type=int,
+        default=10,
+        help="Clients sending --hot-share of all requests",
+    )
+    parser.add_argument("--hot-share", type=float, default=0.8)
+    parser.add_argument("--policy", type=str, default="5/m;20/h;50/d")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def make_identifiers(args) -> list[str]:
+    rng = random.Random(args.seed)
+    identifiers = []
+    for _ in range(args.requests):
+        if rng.random() < args.hot_share:
+            identifiers.append(f"hot-{rng.randrange(args.hot_clients)}")
+        else:
+            identifiers.append(f"client-{rng.randrange(args.clients)}")
+    return identifiers
+
+
+async def commands_processed(redis: Redis) -> int:
+    stats = await redis.info("stats")
+    return int(stats.get("total_commands_processed", 0))
+
+
+async def memory_usage(redis: Redis, pattern: str) -> tuple[int, int]:
+    keys = total = 0
+    async for key in redis.scan_iter(match=pattern, count=1000):
+        keys += 1
+        total += await redis.memory_usage(key) or 0
+    return keys, total
+
+
+async def run_mode(
+        redis: Redis,
+        algorithm: Algorithm,
+        local_filter: bool,
+        identifiers: list[str],
+        windows: tuple[tuple[int, int], ...],
+        concurrency: int,
+) -> dict:
+    endpoint = f"/benchmark/{algorithm.value}/{int(local_filter)}"
+    rate_limiter = RateLimiter(
+        redis,
+        algorithm=algorithm,
+        local_filter=LocalRateLimitFilter() if local_filter else None,
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    limited = 0
+
+    async def one(identifier: str):
+        nonlocal limited
+        async with semaphore:
+            started = time.perf_counter()
+            result = await rate_limiter.hit(identifier, endpoint, windows)
+            latencies.append(time.perf_counter() - started)
+            limited += result.limited
+
+    commands_before = await commands_processed(redis)
+    started = time.perf_counter()
+    await asyncio.gather(*(one(identifier) for identifier in identifiers))
+    elapsed = time.perf_counter() - started
+    commands = await commands_processed(redis) - commands_before
+
+    keys, memory = await memory_usage(redis, f"rate_limiter:*{endpoint}:*")
+    latencies.sort()
+    return {
+        "mode": f"{algorithm.value}{' + local' if local_filter else ''}",
+        "rps": len(identifiers) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "limited": limited,
+        "commands": commands,
+        "keys": keys,
+        "memory": memory,
+    }
+
+
+async def run_benchmark(redis: Redis, args) -> list[dict]:
+    windows = parse_policy(args.policy)
+    identifiers = make_identifiers(args)
+    results = []
+    for algorithm, local_filter in MODES:
+        results.append(
+            await run_mode(
+                redis,
+                algorithm,
+                local_filter,
+                identifiers,
+                windows,
+                args.concurrency,
+            ),
+        )
+
+    async for key in redis.scan_iter(match="rate_limiter:*/benchmark/*"):
+        await redis.delete(key)
+    return results
+
+
+def print_results(results: list[dict]) -> None:
+    print(
+        f"{'mode':<24}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'limited':>9}{'redis cmds':>12}{'keys':>7}{'bytes':>11}"
+    )
+    for row in results:
+        print(
+            f"{row['mode']:<24}{row['rps']:>10.0f}{row['p50_ms']:>9.2f}"
+            f"{row['p99_ms']:>9.2f}{row['limited']:>9}{row['commands']:>12}"
+            f"{row['keys']:>7}{row['memory']:>11}"
+        )
+
+
+async def main():
+    args = parse_args()
+    if args.redis_url:
+        redis = Redis.from_url(args.redis_url)
+    else:
+        redis = RedisClient(create_config()).get_redis()
+
+    try:
+        print_results(await run_benchmark(redis, args))
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,14 +1,101 @@
-from redis.asyncio import Redis
+import time
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialWithJitterBackoff
+from redis.exceptions import ConnectionError, TimeoutError
 
 from entrypoint.config import Config
+from middlewares.metrics import (APP_NAME, REDIS_POOL_CONNECTIONS,
+                                 REDIS_POOL_EXHAUSTED_TOTAL,
+                                 REDIS_POOL_MAX_CONNECTIONS,
+                                 REDIS_POOL_WAIT_DURATION)
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Blocking pool that reports its usage to Prometheus.
+
+    Callers wait up to ``timeout`` for a free connection instead of opening
+    unbounded new ones when Redis is slow.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._in_use_gauge = REDIS_POOL_CONNECTIONS.labels(
+            state="in_use", app_name=APP_NAME,
+        )
+        self._idle_gauge = REDIS_POOL_CONNECTIONS.labels(
+            state="idle", app_name=APP_NAME,
+        )
+        self._wait_histogram = REDIS_POOL_WAIT_DURATION.labels(app_name=APP_NAME)
+        # Gauges move by deltas so pools in the same process add up.
+        self._reported_in_use = 0
+        self._reported_idle = 0
+        REDIS_POOL_MAX_CONNECTIONS.labels(app_name=APP_NAME).inc(
+            self.max_connections,
+        )
+
+    async def get_connection(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except ConnectionError:
+            if not self.can_get_connection():
+                REDIS_POOL_EXHAUSTED_TOTAL.labels(app_name=APP_NAME).inc()
+            raise
+        finally:
+            self._wait_histogram.observe(time.perf_counter() - started)
+            self._report()
+        return connection
+
+    async def release(self, connection) -> None:
+        await super().release(connection)
+        self._report()
+
+    async def disconnect(self, inuse_connections: bool = True) -> None:
+        await super().disconnect(inuse_connections)
+        self._report()
+
+    def _report(self) -> None:
+        in_use = len(self._in_use_connections)
+        idle = len(self._available_connections)
+        self._in_use_gauge.inc(in_use - self._reported_in_use)
+        self._idle_gauge.inc(idle - self._reported_idle)
+        self._reported_in_use = in_use
+        self._reported_idle = idle
 
 
 class RedisClient:
+    """Owns the process-wide Redis connection pool.
+
+    Every component gets the same ``Redis`` from ``get_redis()``, and
+    ``close()`` disconnects the pool with it.
+    """
+
     def __init__(self, config: Config):
-        self.redis = Redis(
+        pool = InstrumentedConnectionPool(
             host=config.redis.HOST,
             port=config.redis.PORT,
+            max_connections=config.redis.MAX_CONNECTIONS,
+            timeout=config.redis.POOL_TIMEOUT,
+            socket_timeout=config.redis.SOCKET_TIMEOUT,
+            socket_connect_timeout=config.redis.SOCKET_CONNECT_TIMEOUT,
+            socket_keepalive=True,
+            health_check_interval=config.redis.HEALTH_CHECK_INTERVAL,
+            retry=Retry(
+                ExponentialWithJitterBackoff(
+                    cap=config.redis.RETRY_BACKOFF_CAP,
+                    base=config.redis.RETRY_BACKOFF_BASE,
+                ),
+                config.redis.RETRIES,
+            ),
+            retry_on_error=[ConnectionError, TimeoutError],
         )
+        self.redis = Redis.from_pool(pool)
 
-    def get_redis(self):
+    def get_redis(self) -> Redis:
         return self.redis
+
+    async def close(self) -> None:
+        # from_pool hands the pool to the client, so this disconnects it too.
+        await self.redis.aclose()
@@ -1,28 +1,52 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
 
+from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
 
 
 class S3Client:
+    """Keeps one aiobotocore client (and its connection pool) open.
+
+    The client is created on first use and lives until ``close()``, so
+    requests reuse pooled connections instead of a fresh TLS handshake per
+    upload.
+    """
+
     def __init__(
         self,
         access_key: str,
         secret_key: str,
         endpoint_url: str,
         bucket_name: str,
+        max_pool_connections: int = 10,
     ):
         self.config = {
             "aws_access_key_id": access_key,
             "aws_secret_access_key": secret_key,
             "endpoint_url": endpoint_url,
+            "config": AioConfig(max_pool_connections=max_pool_connections),
         }
         self.bucket_name = bucket_name
         self.session = get_session()
+        self._client = None
+        self._exit_stack: AsyncExitStack | None = None
+        self._lock = asyncio.Lock()
 
     @asynccontextmanager
     async def get_client(self):
-        async with self.session.create_client(
-            "s3",
-            **self.config,
-        ) as client:
-            yield client
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    exit_stack = AsyncExitStack()
+                    self._client = await exit_stack.enter_async_context(
+                        self.session.create_client("s3", **self.config),
+                    )
+                    self._exit_stack = exit_stack
+        yield self._client
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._client = None
+        self._exit_stack = None
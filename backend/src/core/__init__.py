@@ -1,3 +1,3 @@
-from .broker import broker
+from .broker import broker, scheduler
 
-__all__ = ["broker"]
+__all__ = ["broker", "scheduler"]
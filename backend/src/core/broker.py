@@ -1,9 +1,20 @@
 from entrypoint.config import config
 
-from taskiq import InMemoryBroker
+from taskiq import InMemoryBroker, TaskiqEvents, TaskiqScheduler, TaskiqState
+from taskiq.schedule_sources import LabelScheduleSource
 from taskiq_aio_pika import AioPikaBroker
 
+from utils.prometheus import mark_process_dead
+
 if config.app.MODE == "tests":
     broker = InMemoryBroker()
 else:
     broker = AioPikaBroker(url=config.rabbitmq.URL)
+
+# Kicks tasks declared with a ``schedule`` label, see ``taskiq scheduler``.
+scheduler = TaskiqScheduler(broker, sources=[LabelScheduleSource(broker)])
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def drop_worker_metrics(state: TaskiqState) -> None:
+    mark_process_dead()
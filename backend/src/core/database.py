@@ -0,0 +1,57 @@
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import (AsyncEngine, async_sessionmaker,
+                                    create_async_engine)
+
+from core.db_pool import InstrumentedAsyncQueuePool
+from core.db_routing import RoutingSession
+from entrypoint.config import DatabaseConfig, config
+
+
+def _statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def connect_args(database: DatabaseConfig) -> dict:
+    if database.PGBOUNCER:
+        # PgBouncer may run each transaction on a different server
+        # connection, so nothing may rely on statements prepared earlier.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _statement_name,
+        }
+    return {"prepared_statement_cache_size": database.STATEMENT_CACHE_SIZE}
+
+
+def build_engine(url: str, database: DatabaseConfig, name: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name=name,
+        pool_size=database.POOL_SIZE,
+        max_overflow=database.MAX_OVERFLOW,
+        pool_timeout=database.POOL_TIMEOUT,
+        pool_recycle=database.POOL_RECYCLE,
+        pool_pre_ping=database.POOL_PRE_PING,
+        echo=database.ECHO,
+        connect_args=connect_args(database),
+    )
+
+
+engine = build_engine(config.database.DATABASE_URI, config.database, "primary")
+replica_engine = None
+if config.database.REPLICA_DATABASE_URI:
+    replica_engine = build_engine(
+        config.database.REPLICA_DATABASE_URI,
+        config.database,
+        "replica",
+    )
+
+session_factory = async_sessionmaker(
+    engine,
+    sync_session_class=RoutingSession,
+    replica=replica_engine.sync_engine if replica_engine else None,
+    expire_on_commit=False,
+    autoflush=False,
+)
@@ -0,0 +1,64 @@
+import time
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from middlewares.metrics import (APP_NAME, DB_CONNECTION_HOLD_DURATION,
+                                 DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW,
+                                 DB_POOL_SIZE, DB_POOL_TIMEOUTS_TOTAL,
+                                 DB_POOL_WAIT_DURATION)
+
+CHECKED_OUT_AT = "checked_out_at"
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that reports its usage to Prometheus.
+
+    Metrics are labelled with the engine's ``pool_logging_name``, which
+    SQLAlchemy keeps when it recreates the pool after ``dispose()``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        name = self._orig_logging_name or "default"
+        self._checked_out_gauge = DB_POOL_CHECKED_OUT.labels(
+            pool=name, app_name=APP_NAME,
+        )
+        self._overflow_gauge = DB_POOL_OVERFLOW.labels(
+            pool=name, app_name=APP_NAME,
+        )
+        self._wait_histogram = DB_POOL_WAIT_DURATION.labels(
+            pool=name, app_name=APP_NAME,
+        )
+        self._timeouts_counter = DB_POOL_TIMEOUTS_TOTAL.labels(
+            pool=name, app_name=APP_NAME,
+        )
+        self._hold_histogram = DB_CONNECTION_HOLD_DURATION.labels(
+            pool=name, app_name=APP_NAME,
+        )
+        DB_POOL_SIZE.labels(pool=name, app_name=APP_NAME).set(self.size())
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except TimeoutError:
+            self._timeouts_counter.inc()
+            raise
+        finally:
+            self._wait_histogram.observe(time.perf_counter() - started)
+        record.info[CHECKED_OUT_AT] = time.perf_counter()
+        self._report()
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        checked_out_at = record.info.pop(CHECKED_OUT_AT, None)
+        if checked_out_at is not None:
+            self._hold_histogram.observe(time.perf_counter() - checked_out_at)
+        super()._do_return_conn(record)
+        self._report()
+
+    def _report(self) -> None:
+        self._checked_out_gauge.set(self.checkedout())
+        # overflow() counts down from -pool_size while the pool fills up.
+        self._overflow_gauge.set(max(self.overflow(), 0))
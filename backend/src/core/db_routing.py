@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from sqlalchemy import CompoundSelect, Engine, Select
+from sqlalchemy.orm import Session
+
+_prefer_replica: ContextVar[bool] = ContextVar("prefer_replica", default=False)
+
+
+def read_replica(func):
+    """Let plain SELECTs issued while ``func`` runs go to the read replica.
+
+    Only for methods that can tolerate replication lag. Anything the
+    session has written before stays readable, see ``RoutingSession``.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _prefer_replica.set(True)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _prefer_replica.reset(token)
+
+    return wrapper
+
+
+@contextmanager
+def read_primary():
+    """Send the reads of this block to the primary, even in ``read_replica``.
+
+    For reads whose result outlives the request, such as cache fills,
+    when the replica may not have caught up with a recent write yet.
+    """
+    token = _prefer_replica.set(False)
+    try:
+        yield
+    finally:
+        _prefer_replica.reset(token)
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica inside ``read_replica`` calls.
+
+    Everything else uses the primary bind. Once the session flushes or runs
+    anything other than a plain SELECT it is pinned to the primary, so a
+    read after a write in the same unit of work sees that write.
+    """
+
+    def __init__(self, *args, replica: Engine | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._replica = replica
+        self._pinned_to_primary = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        read = _is_plain_select(clause)
+        if self._flushing or (clause is not None and not read):
+            self._pinned_to_primary = True
+        elif (
+                read
+                and self._replica is not None
+                and not self._pinned_to_primary
+                and _prefer_replica.get()
+        ):
+            return self._replica
+
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def _is_plain_select(clause) -> bool:
+    if isinstance(clause, Select):
+        # Row locks are not available on a hot standby.
+        return clause._for_update_arg is None
+    return isinstance(clause, CompoundSelect)
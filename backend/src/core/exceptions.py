@@ -88,3 +88,17 @@ class InvoiceNotFoundError(ValueError):
             super().__init__(f"Invoice with uid '{uid}' not found")
         else:
             super().__init__(f"Invoice with id {invoice_id} not found")
+
+
+class PasswordHasherBusyError(ValueError):
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        super().__init__(
+            f"Password hasher is busy: {max_pending} operations pending"
+        )
+
+
+class UploadTooLargeError(ValueError):
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"Uploaded files exceed the limit of {max_bytes} bytes")
@@ -0,0 +1,53 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from middlewares.metrics import APP_NAME, IMAGE_VARIANTS_DURATION
+from utils.images import render_variants, supported_formats
+
+
+class ImageProcessor:
+    """Renders image variants in a process pool.
+
+    Decoding and encoding hold the GIL for most of their run time, so they
+    go to separate processes and the worker's event loop keeps serving
+    other tasks meanwhile.
+    """
+
+    def __init__(
+        self,
+        sizes: dict[str, int],
+        formats: list[str],
+        quality: int = 80,
+        workers: int = 2,
+    ):
+        self.sizes = sizes
+        self.formats = supported_formats(formats)
+        self.quality = quality
+        self._workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def render(self, content: bytes) -> dict[str, dict[str, bytes]]:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                render_variants,
+                content,
+                self.sizes,
+                self.formats,
+                self.quality,
+            )
+        finally:
+            IMAGE_VARIANTS_DURATION.labels(app_name=APP_NAME).observe(
+                time.perf_counter() - start
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from core.exceptions import PasswordHasherBusyError
+from middlewares.metrics import (APP_NAME, PASSWORD_HASH_DURATION,
+                                 PASSWORD_HASH_IN_FLIGHT,
+                                 PASSWORD_HASH_REJECTED_TOTAL)
+from utils.jwt_utils import hash_password, validate_password
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop in a bounded worker pool.
+
+    At most ``workers + max_pending`` calls may be queued or running; past
+    that new calls fail fast with ``PasswordHasherBusyError`` instead of
+    piling up behind a login storm.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_pending: int = 64,
+        use_processes: bool = False,
+    ):
+        # bcrypt releases the GIL, so threads are enough unless the
+        # process is already CPU bound on other work.
+        executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor: Executor = executor_cls(max_workers=workers)
+        self._limit = workers + max_pending
+        self._max_pending = max_pending
+        self._in_flight = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run("verify", validate_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, operation: str, func, *args):
+        if self._in_flight >= self._limit:
+            PASSWORD_HASH_REJECTED_TOTAL.labels(
+                operation=operation, app_name=APP_NAME
+            ).inc()
+            raise PasswordHasherBusyError(self._max_pending)
+
+        self._in_flight += 1
+        PASSWORD_HASH_IN_FLIGHT.labels(app_name=APP_NAME).inc()
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+            PASSWORD_HASH_IN_FLIGHT.labels(app_name=APP_NAME).dec()
+            PASSWORD_HASH_DURATION.labels(
+                operation=operation, app_name=APP_NAME
+            ).observe(time.perf_counter() - start)
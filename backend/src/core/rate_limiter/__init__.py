@@ -1,9 +1,13 @@
-from core.rate_limiter.rate_limiter import RateLimiter
+from core.rate_limiter.rate_limiter import (LocalRateLimitFilter,
+                                           RateLimiter, RateLimitResult)
 from core.rate_limiter.rate_limiter_factory import rate_limit
-from core.rate_limiter.strategy import Strategy
+from core.rate_limiter.strategy import Algorithm, Strategy
 
 __all__ = [
     "rate_limit",
+    "Algorithm",
+    "LocalRateLimitFilter",
     "RateLimiter",
+    "RateLimitResult",
     "Strategy",
 ]
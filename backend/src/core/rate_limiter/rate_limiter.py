@@ -1,47 +1,245 @@
 import random
-from time import time
+import time
+from collections import OrderedDict
+from typing import NamedTuple
 
 from redis.asyncio import Redis
 
+from core.rate_limiter.strategy import Algorithm
+
+# Sliding window over a sorted set of hit timestamps, evaluated and
+# recorded atomically. Uses the Redis clock so app instances with skewed
+# clocks still agree.
+#
+# KEYS[1]  hits of one identifier on one endpoint
+# ARGV[1]  unique suffix for this hit's member
+# ARGV[2.] pairs of (max_requests, window_ms)
+#
+# Returns {limited, limit, remaining, reset_ms, retry_after_ms} where the
+# limit/remaining/reset describe the window closest to being exhausted.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local longest = 0
+for i = 2, #ARGV, 2 do
+    longest = math.max(longest, tonumber(ARGV[i + 1]))
+end
+redis.call('ZREMRANGEBYSCORE', key, 0, now - longest)
+
+local limited = 0
+local retry_after = 0
+local limit, remaining, reset
+for i = 2, #ARGV, 2 do
+    local max_requests = tonumber(ARGV[i])
+    local window = tonumber(ARGV[i + 1])
+    local start = '(' .. (now - window)
+    local count = redis.call('ZCOUNT', key, start, '+inf')
+    local left = max_requests - count
+
+    local window_reset = window
+    if count > 0 then
+        local oldest = redis.call('ZRANGEBYSCORE', key, start, '+inf', 'WITHSCORES', 'LIMIT', 0, 1)
+        window_reset = tonumber(oldest[2]) + window - now
+    end
+
+    if left <= 0 then
+        limited = 1
+        -- The hit that has to expire before one more request fits.
+        local blocking = redis.call('ZRANGEBYSCORE', key, start, '+inf', 'WITHSCORES', 'LIMIT', count - max_requests, 1)
+        retry_after = math.max(retry_after, tonumber(blocking[2]) + window - now)
+    end
+
+    if remaining == nil or left < remaining then
+        limit, remaining, reset = max_requests, left, window_reset
+    end
+end
+
+if limited == 0 then
+    redis.call('ZADD', key, now, now .. '-' .. ARGV[1])
+    redis.call('PEXPIRE', key, longest)
+    remaining = remaining - 1
+end
+
+return {limited, limit, math.max(remaining, 0), reset, retry_after}
+"""
+
+# Generic cell rate algorithm: per window only the theoretical arrival time
+# (TAT) of the next request is kept, in one hash field, so memory does not
+# grow with traffic. A window of N requests per W ms lets one request in
+# every W/N ms and a burst of N. Like the sliding window it never records a
+# rejected hit, but unlike it, it refills gradually instead of all at once.
+#
+# KEYS[1]  hash of TATs of one identifier on one endpoint
+# ARGV     pairs of (max_requests, window_ms)
+#
+# Returns the same {limited, limit, remaining, reset_ms, retry_after_ms}.
+GCRA_SCRIPT = """
+local key = KEYS[1]
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + tonumber(time[2]) / 1000
+
+local fields = {}
+for i = 1, #ARGV / 2 do
+    fields[i] = tostring(i)
+end
+local stored = redis.call('HMGET', key, unpack(fields))
+
+local limited = 0
+local retry_after = 0
+local limit, remaining, reset, reset_interval
+local tats = {}
+local ttl = 0
+for i = 1, #fields do
+    local max_requests = tonumber(ARGV[i * 2 - 1])
+    local window = tonumber(ARGV[i * 2])
+    local interval = window / max_requests
+    local tat = math.max(tonumber(stored[i]) or now, now)
+    local left = math.floor((now + window - tat) / interval)
+
+    if left < 1 then
+        limited = 1
+        retry_after = math.max(retry_after, tat + interval - window - now)
+    end
+
+    tats[i] = tat + interval
+    ttl = math.max(ttl, tats[i] - now)
+    if remaining == nil or left < remaining then
+        limit, remaining, reset = max_requests, left, tat - now
+        reset_interval = interval
+    end
+end
+
+if limited == 0 then
+    for i = 1, #fields do
+        redis.call('HSET', key, fields[i], string.format('%.3f', tats[i]))
+    end
+    redis.call('PEXPIRE', key, math.ceil(ttl))
+    remaining = remaining - 1
+    reset = reset + reset_interval
+end
+
+return {limited, limit, math.max(remaining, 0), math.ceil(reset), math.ceil(retry_after)}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    limited: bool
+    limit: int
+    remaining: int
+    # seconds until the most constrained window has room again
+    reset_after: float
+    # seconds until a limited client may retry, 0 when not limited
+    retry_after: float
+
+
+class LocalRateLimitFilter:
+    """Remembers, per process, which keys Redis has just rejected.
+
+    Neither algorithm records a rejected hit, so until retry_after has
+    passed Redis would keep rejecting the key and the round trip can be
+    skipped. The block is measured from when the answer arrived, so it may
+    outlast the one in Redis by about the network latency.
+    """
+
+    def __init__(self, max_keys: int = 10_000):
+        self._max_keys = max_keys
+        # key -> (monotonic deadline, result that caused the block)
+        self._blocked: OrderedDict[str, tuple[float, RateLimitResult]] = (
+            OrderedDict()
+        )
+
+    def check(self, key: str) -> RateLimitResult | None:
+        entry = self._blocked.get(key)
+        if entry is None:
+            return None
+
+        deadline, result = entry
+        left = deadline - time.monotonic()
+        if left <= 0:
+            del self._blocked[key]
+            return None
+
+        elapsed = result.retry_after - left
+        return result._replace(
+            reset_after=max(result.reset_after - elapsed, 0),
+            retry_after=left,
+        )
+
+    def block(self, key: str, result: RateLimitResult) -> None:
+        if result.retry_after <= 0:
+            return
+
+        self._blocked[key] = (time.monotonic() + result.retry_after, result)
+        self._blocked.move_to_end(key)
+        while len(self._blocked) > self._max_keys:
+            self._blocked.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._blocked)
+
 
 class RateLimiter:
-    def __init__(self, redis: Redis):
+    def __init__(
+            self,
+            redis: Redis,
+            algorithm: Algorithm = Algorithm.SLIDING_WINDOW,
+            local_filter: LocalRateLimitFilter | None = None,
+    ):
         self._redis = redis
+        self._algorithm = algorithm
+        self._local_filter = local_filter
+        # EVALSHA with a SCRIPT LOAD fallback when Redis doesn't know it yet.
+        self._scripts = {
+            Algorithm.SLIDING_WINDOW: redis.register_script(SLIDING_WINDOW_SCRIPT),
+            Algorithm.GCRA: redis.register_script(GCRA_SCRIPT),
+        }
 
-    async def is_limited(
+    async def hit(
             self,
             identifier: str,
             endpoint: str,
             windows: list[tuple[int, int]],
-    ) -> bool:
-        key = f"rate_limiter:{endpoint}:{identifier}"
-
-        current_ms = time() * 1000
-        current_request = f"{current_ms}--{random.randint(0, 100_000_000)}"
-
-        max_window_seconds = max(ws for (_, ws) in windows)
-        oldest_window_start_ms = current_ms - max_window_seconds * 1000
+            algorithm: Algorithm | None = None,
+    ) -> RateLimitResult:
+        """Check every window and, if none is exhausted, record the hit."""
+        algorithm = algorithm or self._algorithm
+        if algorithm == Algorithm.SLIDING_WINDOW:
+            # Kept without a prefix so existing keys stay valid.
+            key = f"rate_limiter:{endpoint}:{identifier}"
+            args = [random.getrandbits(32)]
+        else:
+            key = f"rate_limiter:{algorithm.value}:{endpoint}:{identifier}"
+            args = []
 
-        async with self._redis.pipeline() as pipe:
-            await pipe.zremrangebyscore(
-                name=key,
-                min=0,
-                max=oldest_window_start_ms,
-            )
+        if self._local_filter is not None:
+            result = self._local_filter.check(key)
+            if result is not None:
+                return result
 
-            for _, ws in windows:
-                window_start_ms = current_ms - ws * 1000
-                await pipe.zcount(key, window_start_ms, "+inf")
+        for max_requests, window_seconds in windows:
+            args.extend((max_requests, window_seconds * 1000))
 
-            res = await pipe.execute()
-        counts = res[1: 1 + len(windows)]
-        for (max_requests, _), count in zip(windows, counts, strict=False):
-            if count >= max_requests:
-                return True
+        limited, limit, remaining, reset_ms, retry_after_ms = (
+            await self._scripts[algorithm](keys=[key], args=args)
+        )
+        result = RateLimitResult(
+            limited=bool(limited),
+            limit=int(limit),
+            remaining=int(remaining),
+            reset_after=int(reset_ms) / 1000,
+            retry_after=int(retry_after_ms) / 1000,
+        )
+        if result.limited and self._local_filter is not None:
+            self._local_filter.block(key, result)
+        return result
 
-        async with self._redis.pipeline() as pipe:
-            await pipe.zadd(key, {current_request: current_ms})
-            await pipe.expire(key, max_window_seconds)
-            await pipe.execute()
-
-        return False
+    async def is_limited(
+            self,
+            identifier: str,
+            endpoint: str,
+            windows: list[tuple[int, int]],
+    ) -> bool:
+        result = await self.hit(identifier, endpoint, windows)
+        return result.limited
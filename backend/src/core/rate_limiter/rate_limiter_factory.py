@@ -1,123 +1,217 @@
+import inspect
+import logging
+import math
 import re
 from functools import wraps
 
-from fastapi import HTTPException, Request, status
-
-from core.rate_limiter.strategy import Strategy
-
+from fastapi import HTTPException, Request, Response, status
+
+from core.rate_limiter.rate_limiter import RateLimiter, RateLimitResult
+from core.rate_limiter.strategy import Algorithm, Strategy
+
+logger = logging.getLogger(__name__)
+
+POLICY_PATTERN = re.compile(r"^(\d+)/([smhd])$")
+UNIT_SECONDS = {
+    "s": 1,
+    "m": 60,
+    "h": 60 * 60,
+    "d": 24 * 60 * 60,
+}
+MAX_WINDOWS = 3
+
+# Extra endpoint parameter through which FastAPI hands us the response, so
+# the RateLimit-* headers can be set on successful calls too.
+RESPONSE_PARAM = "rate_limit_response"
+USER_PARAMS = ("current_user", "user")
+
+
+def parse_policy(policy: str | None) -> tuple[tuple[int, int], ...]:
+    """Turn "5/m;20/h" into ((5, 60), (20, 3600))."""
+    segments = policy.split(";") if policy else []
+    if not segments or len(segments) > MAX_WINDOWS:
+        raise ValueError(
+            f"Invalid request policy: {policy}. "
+            "Expected format: '5/s', '10/m', '20/h', '30/d'"
+        )
+
+    windows = []
+    for segment in segments:
+        match = POLICY_PATTERN.match(segment)
+        if not match:
+            raise ValueError(
+                f"Invalid policy segment: {segment}. "
+                "Expected format like '5/s', '10/m', '20/h', '30/d'"
+            )
+        windows.append((int(match.group(1)), UNIT_SECONDS[match.group(2)]))
+    return tuple(windows)
+
+
+def rate_limit_headers(result: RateLimitResult) -> dict[str, str]:
+    headers = {
+        "RateLimit-Limit": str(result.limit),
+        "RateLimit-Remaining": str(result.remaining),
+        "RateLimit-Reset": str(math.ceil(result.reset_after)),
+    }
+    if result.limited:
+        headers["Retry-After"] = str(max(1, math.ceil(result.retry_after)))
+    return headers
+
+
+def _find_param(
+        signature: inspect.Signature,
+        names: tuple[str, ...],
+        annotation: type | None = None,
+) -> inspect.Parameter | None:
+    for param in signature.parameters.values():
+        if param.name in names:
+            return param
+        if annotation is not None and _is_annotated_as(param, annotation):
+            return param
+    return None
+
+
+def _is_annotated_as(param: inspect.Parameter, annotation: type) -> bool:
+    # FromDishka[X] is Annotated[X, ...], whose __origin__ is X.
+    hint = getattr(param.annotation, "__origin__", param.annotation)
+    return isinstance(hint, type) and issubclass(hint, annotation)
+
+
+def _resolver(signature: inspect.Signature, param: inspect.Parameter | None):
+    """Build a lookup of one endpoint argument, by keyword or by position."""
+    if param is None:
+        return lambda args, kwargs: None
+
+    name = param.name
+    index = list(signature.parameters).index(name)
+
+    def resolve(args, kwargs):
+        if name in kwargs:
+            return kwargs[name]
+        return args[index] if index < len(args) else None
+
+    return resolve
+
+
+def _client_ip(request: Request) -> str:
+    forwarded = request.headers.get("X-Forwarded-For")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _user_id(request: Request, user) -> str:
+    if user is None or not hasattr(user, "id"):
+        user = getattr(request.state, "user", None)
+    if user is not None and hasattr(user, "id"):
+        return str(user.id)
+
+    identifier = request.headers.get("X-User-Id")
+    if identifier is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not authenticated for USER rate-limiting strategy.",
+        )
+    return identifier
+
+
+def rate_limit(
+        strategy: Strategy = Strategy.IP,
+        policy: str | None = None,
+        algorithm: Algorithm | None = None,
+):
+    # Everything that only depends on the decorated endpoint is worked out
+    # once here, so a request pays for a few dict lookups and one Redis call.
+    windows = parse_policy(policy)
 
-def rate_limit(strategy: Strategy = Strategy.IP, policy: str | None = None):
     def decorator(func):
+        signature = inspect.signature(func)
+        get_request = _resolver(
+            signature,
+            _find_param(signature, ("request",), Request),
+        )
+        get_limiter = _resolver(
+            signature,
+            _find_param(signature, ("rate_limiter",), RateLimiter),
+        )
+        get_user = _resolver(signature, _find_param(signature, USER_PARAMS))
+
+        # Reuse the endpoint's own Response parameter when it has one.
+        response_param = _find_param(signature, (), Response)
+        response_name = response_param.name if response_param else RESPONSE_PARAM
+        if response_param is None:
+            signature = signature.replace(
+                parameters=[
+                    *signature.parameters.values(),
+                    inspect.Parameter(
+                        RESPONSE_PARAM,
+                        inspect.Parameter.KEYWORD_ONLY,
+                        annotation=Response,
+                    ),
+                ],
+            )
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            request = None
-
-            for arg in args:
-                if isinstance(arg, Request):
-                    request = arg
-                    break
-
-            if request is None:
-                request = kwargs.get("request")
+            if response_param is None:
+                response = kwargs.pop(RESPONSE_PARAM, None)
+            else:
+                response = kwargs.get(response_name)
 
+            request = get_request(args, kwargs)
             if request is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Request object not found",
                 )
 
-            if not policy or not re.match(
-                    r"^(\d+\/[smhd])(;\d+\/[smhd]){0,2}$",
-                    policy,
-            ):
-                raise ValueError(
-                    f"Invalid request policy: {policy}.",
-                    "Expected format: '5/s', '10/m', '20/h', '30/d'",
-                )
-
-            request_policy = policy.split(";")
-
-            identifier = None
-            if strategy == Strategy.IP:
-                forwarded = request.headers.get("X-Forwarded-For")
-                if forwarded:
-                    identifier = forwarded.split(",")[0].strip()
-                else:
-                    identifier = request.client.host if request.client else "unknown"
-
-            elif strategy == Strategy.USER:
-                user = kwargs.get("current_user") or kwargs.get("user")
-                if user is not None and hasattr(user, "id"):
-                    identifier = str(user.id)
-                else:
-                    state_user = getattr(request.state, "user", None)
-                    if state_user is not None and hasattr(state_user, "id"):
-                        identifier = str(state_user.id)
-                    else:
-                        identifier = request.headers.get("X-User-Id")
-
-                if identifier is None:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail=(
-                            "User not authenticated ",
-                            "for USER rate-limiting strategy.",
-                        )
-                    )
-
-            if identifier is None:
-                identifier = "unknown"
-
-            print(identifier)
-
-            rate_limiter = kwargs.get("rate_limiter")
-            if rate_limiter is None:
-                for arg in args:
-                    if hasattr(arg, 'is_limited'):
-                        rate_limiter = arg
-                        break
-
+            rate_limiter = get_limiter(args, kwargs)
             if rate_limiter is None:
                 raise ValueError("Rate limiter not found in arguments")
 
-            endpoint = request.url.path
+            if strategy == Strategy.USER:
+                identifier = _user_id(request, get_user(args, kwargs))
+            else:
+                identifier = _client_ip(request)
 
-            windows = []
-            for rp in request_policy:
-                m = re.match(r"^(\d+)\/([smhd])$", rp)
-                if not m:
-                    raise ValueError(
-                        f"Invalid policy segment: {rp}.",
-                        "Expected format like '5/s', '10/m', '20/h', '30/d'",
-                    )
-
-                max_requests = int(m.group(1))
-                unit = m.group(2)
-
-                if unit == "s":
-                    window_seconds = 1
-                elif unit == "m":
-                    window_seconds = 60
-                elif unit == "h":
-                    window_seconds = 60 * 60
-                else:
-                    window_seconds = 24 * 60 * 60
-
-                windows.append((max_requests, window_seconds))
-
-            limited = await rate_limiter.is_limited(
+            endpoint = request.url.path
+            result = await rate_limiter.hit(
                 identifier,
                 endpoint,
                 windows,
+                algorithm,
             )
-            if limited:
+            headers = rate_limit_headers(result)
+            if result.limited:
+                logger.info(
+                    "Rate limit exceeded",
+                    extra={
+                        "rate_limit_strategy": strategy.value,
+                        "rate_limit_identifier": identifier,
+                        "rate_limit_endpoint": endpoint,
+                        "rate_limit_retry_after": result.retry_after,
+                    },
+                )
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     detail="Too many requests. Please try again later.",
+                    headers=headers,
                 )
 
+            logger.debug(
+                "Rate limit hit",
+                extra={
+                    "rate_limit_strategy": strategy.value,
+                    "rate_limit_identifier": identifier,
+                    "rate_limit_endpoint": endpoint,
+                    "rate_limit_remaining": result.remaining,
+                },
+            )
+            if response is not None:
+                response.headers.update(headers)
             return await func(*args, **kwargs)
 
+        wrapper.__signature__ = signature
         return wrapper
 
     return decorator
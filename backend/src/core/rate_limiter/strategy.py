@@ -4,3 +4,10 @@ from enum import Enum
 class Strategy(Enum):
     IP = "ip"
     USER = "user"
+
+
+class Algorithm(Enum):
+    # Exact, one sorted-set member per allowed hit in the longest window.
+    SLIDING_WINDOW = "sliding_window"
+    # Generic cell rate algorithm, one timestamp per window and key.
+    GCRA = "gcra"
@@ -1,17 +1,62 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
 
 
 class UnitOfWork:
+    """Commits or rolls back the request session on exit.
+
+    The outermost block owns the transaction. Blocks opened inside it run
+    in a SAVEPOINT, so a failing inner block only undoes its own work.
+    Committing hands the connection back to the pool but keeps the session
+    usable, so a service may open the unit of work several times. The
+    session itself is closed by whoever created it.
+    """
+
     def __init__(self, session: AsyncSession):
         self.session = session
+        self._savepoints: list[AsyncSessionTransaction | None] = []
+        self._marks: list[int] = []
+        self._after_commit: list[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def active(self) -> bool:
+        return bool(self._savepoints)
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Await ``callback`` once the outermost block has committed.
+
+        For side effects outside the database, such as dropping cache
+        entries, that must not be seen before the change is. Dropped if
+        the block that registered it rolls back.
+        """
+        if not self._savepoints:
+            raise RuntimeError("after_commit() needs an open unit of work")
+        self._after_commit.append(callback)
 
     async def __aenter__(self):
+        if self._savepoints:
+            self._savepoints.append(await self.session.begin_nested())
+        else:
+            self._savepoints.append(None)
+        self._marks.append(len(self._after_commit))
         return self
 
     async def __aexit__(self, exception_type, exception, traceback):
+        savepoint = self._savepoints.pop()
+        mark = self._marks.pop()
         if exception_type:
+            del self._after_commit[mark:]
+
+        if savepoint is not None:
+            if exception_type:
+                await savepoint.rollback()
+            else:
+                await savepoint.commit()
+        elif exception_type:
             await self.session.rollback()
         else:
             await self.session.commit()
-
-        await self.session.close()
+            callbacks, self._after_commit = self._after_commit, []
+            for callback in callbacks:
+                await callback()
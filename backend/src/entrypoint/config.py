@@ -32,6 +32,14 @@ class StripeConfig(BaseSettings):
     SUCCESS_URL: str | None = None
     CANCEL_URL: str | None = None
     CURRENCY: str | None = "rub"
+    # Webhook events are applied by a worker; stored events still pending
+    # after EVENTS_RETRY_AFTER seconds are queued again by the scheduler.
+    EVENTS_RETRY_AFTER: int = 60
+    EVENTS_RETRY_CRON: str = "* * * * *"
+    EVENTS_RETRY_BATCH: int = 100
+    # Events of a session no invoice refers to are given up on after this
+    # many seconds.
+    EVENTS_GIVE_UP_AFTER: int = 3600
 
 
 class DatabaseConfig(BaseSettings):
@@ -41,6 +49,23 @@ class DatabaseConfig(BaseSettings):
     PORT: int
     NAME: str
 
+    # Per process: the API and every worker get their own pool.
+    POOL_SIZE: int = 20
+    MAX_OVERFLOW: int = 10
+    # Seconds to wait for a free connection before failing.
+    POOL_TIMEOUT: float = 10
+    POOL_RECYCLE: int = 1800
+    POOL_PRE_PING: bool = True
+    ECHO: bool = False
+    # Prepared statements cached per connection by the asyncpg dialect.
+    STATEMENT_CACHE_SIZE: int = 100
+    # Connecting through PgBouncer in transaction mode, where a connection
+    # can't keep named prepared statements between transactions.
+    PGBOUNCER: bool = False
+    # Streaming replica for lag-tolerant reads, same credentials and database.
+    REPLICA_HOST: str | None = None
+    REPLICA_PORT: int | None = None
+
     model_config = SettingsConfigDict(
         env_prefix="POSTGRES_",
         env_file_encoding="utf-8",
@@ -51,6 +76,13 @@ class DatabaseConfig(BaseSettings):
     def DATABASE_URI(self) -> str:
         return f"postgresql+asyncpg://{self.USER}:{self.PASSWORD}@{self.HOST}:{self.PORT}/{self.NAME}"
 
+    @property
+    def REPLICA_DATABASE_URI(self) -> str | None:
+        if not self.REPLICA_HOST:
+            return None
+        port = self.REPLICA_PORT or self.PORT
+        return f"postgresql+asyncpg://{self.USER}:{self.PASSWORD}@{self.REPLICA_HOST}:{port}/{self.NAME}"
+
     @property
     def ALEMBIC_DATABASE_URI(self) -> str:
         return f"postgresql+psycopg://{self.USER}:{self.PASSWORD}@{self.HOST}:{self.PORT}/{self.NAME}"
@@ -67,6 +99,7 @@ class AuthJWT(BaseSettings):
     ALGORITM: str = "RS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 90  # 14
+    VERIFIED_TOKENS_CACHE_SIZE: int = 1024
 
 
 class S3Config(BaseSettings):
@@ -82,6 +115,11 @@ class S3Config(BaseSettings):
     SECRET_KEY: str
     BUCKET_NAME: str
     REGION: str
+    MAX_POOL_CONNECTIONS: int = 10
+    UPLOAD_CONCURRENCY: int = 4
+    # S3 needs parts of at least 5 MiB, so this is also the part size.
+    MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    MAX_REQUEST_BYTES: int = 50 * 1024 * 1024
 
     def get_s3_public_url(self) -> str:
         return self.PUBLIC_ENDPOINT
@@ -97,6 +135,100 @@ class RedisConfig(BaseSettings):
 
     PORT: int
     HOST: str
+    # One pool per process, shared by the app, DI and the rate limiter.
+    MAX_CONNECTIONS: int = 50
+    # Seconds to wait for a free connection before failing the command.
+    POOL_TIMEOUT: float = 5
+    SOCKET_TIMEOUT: float = 2
+    SOCKET_CONNECT_TIMEOUT: float = 2
+    HEALTH_CHECK_INTERVAL: int = 30
+    RETRIES: int = 3
+    RETRY_BACKOFF_BASE: float = 0.05
+    RETRY_BACKOFF_CAP: float = 1
+
+
+class CacheConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="CACHE_",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    ENABLED: bool = True
+    PRODUCTS_TTL: int = 300
+    USERS_TTL: int = 60
+    # Seconds after a product change during which cache misses are filled
+    # from the primary; keep it above the read replica's usual lag.
+    PRODUCTS_REPLICA_LAG: int = 5
+
+
+class CartConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="CART_",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    # Carts live in Redis; orders/order_products only get a copy on
+    # checkout and from the write-behind task.
+    TTL: int = 7 * 24 * 60 * 60
+    PERSIST_CRON: str = "* * * * *"
+    PERSIST_BATCH: int = 500
+
+
+class AnalyticsConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="ANALYTICS_",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    # The scheduler rebuilds this many past days of rollups on every run.
+    # Status changes of older orders queue a rebuild of their own day.
+    REFRESH_DAYS: int = 3
+    REFRESH_CRON: str = "*/10 * * * *"
+
+
+class PasswordHasherConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="PASSWORD_HASHER_",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    WORKERS: int = 4
+    MAX_PENDING: int = 64
+    USE_PROCESSES: bool = False
+
+
+class RateLimitConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="RATE_LIMIT_",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    # Every allowed hit is logged at DEBUG, rejected ones at INFO.
+    LOG_LEVEL: str = "INFO"
+    # Used by endpoints that don't pick one: sliding_window or gcra.
+    ALGORITHM: str = "sliding_window"
+    # Reject clients Redis has just rejected without asking it again.
+    LOCAL_FILTER: bool = True
+    LOCAL_FILTER_MAX_KEYS: int = 10_000
+
+
+class ImagesConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="IMAGES_",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    # Longest edge in pixels per variant name.
+    VARIANT_SIZES: dict[str, int] = {"thumbnail": 320, "medium": 1024}
+    VARIANT_FORMATS: list[str] = ["webp", "avif"]
+    QUALITY: int = 80
+    WORKERS: int = 2
 
 
 class EmailConfig(BaseSettings):
@@ -174,6 +306,12 @@ class Config(BaseSettings):
     s3: S3Config = S3Config()
     auth_jwt: AuthJWT = AuthJWT()
     redis: RedisConfig = RedisConfig()
+    cache: CacheConfig = CacheConfig()
+    cart: CartConfig = CartConfig()
+    analytics: AnalyticsConfig = AnalyticsConfig()
+    password_hasher: PasswordHasherConfig = PasswordHasherConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
+    images: ImagesConfig = ImagesConfig()
     email: EmailConfig = EmailConfig()
     rabbitmq: RabbitMQConfig = RabbitMQConfig()
     frontend: FrontendConfig = FrontendConfig()
@@ -1,10 +1,12 @@
 from .auth import AuthProvider
 from .config import ConfigProvider
 from .database import DatabaseProvider
+from .password_hasher import PasswordHasherProvider
 from .payment import IPaymentProvider
 from .rate_limiter import RateLimiterProvider
 from .redis import RedisProvider
 from .repositories import RepositoryProvider
+from .s3 import S3Provider
 from .servicies import ServiceProvider
 
 __all__ = [
@@ -12,8 +14,10 @@ __all__ = [
     "ConfigProvider",
     "DatabaseProvider",
     "IPaymentProvider",
+    "PasswordHasherProvider",
     "RateLimiterProvider",
     "RedisProvider",
     "RepositoryProvider",
+    "S3Provider",
     "ServiceProvider",
 ]
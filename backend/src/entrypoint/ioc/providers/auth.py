@@ -2,6 +2,7 @@ from dishka import Provider, Scope, provide
 from fastapi import HTTPException, Request, status
 from jwt import InvalidTokenError
 
+from repositories import IUserCacheRepository
 from schemas.user import UserResponse
 from services.user import UserService
 from utils.jwt_utils import decode_jwt
@@ -14,6 +15,7 @@ class AuthProvider(Provider):
     async def get_current_user(
         self,
         user_service: UserService,
+        user_cache: IUserCacheRepository,
         request: Request,
     ) -> UserResponse:
         authorization = request.headers.get("Authorization")
@@ -53,6 +55,10 @@ class AuthProvider(Provider):
         user_id = int(decoded_token.get("sub"))
 
         if user_id:
+            principal = await user_cache.get_user(user_id)
+            if principal is not None:
+                return principal
+
             user = await user_service.get_user_by_id(user_id)
             if not user:
                 raise HTTPException(
@@ -60,9 +66,11 @@ class AuthProvider(Provider):
                     detail="User not found",
                 )
 
-            return UserResponse(
+            principal = UserResponse(
                 id=user.id,
                 email=user.email,
                 username=user.username,
                 role=user.role,
             )
+            await user_cache.set_user(principal)
+            return principal
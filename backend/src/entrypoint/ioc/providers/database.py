@@ -5,12 +5,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.uow import UnitOfWork
 from dishka import provide, Scope, Provider
 
-from entrypoint.ioc.providers.engine import session_factory
+from core.database import session_factory
 
 
 class DatabaseProvider(Provider):
     @provide(scope=Scope.REQUEST)
     async def session(self) -> AsyncIterable[AsyncSession]:
+        # Creating the session is cheap: it only checks a connection out of
+        # the pool for its first statement, so requests answered from cache
+        # or rejected early never hold one.
         async with session_factory() as session:
             yield session
 
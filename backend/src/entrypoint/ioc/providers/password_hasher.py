@@ -0,0 +1,20 @@
+from collections.abc import Iterator
+
+from dishka import Provider, Scope, provide
+
+from core.password_hasher import PasswordHasher
+from entrypoint.config import Config
+
+
+class PasswordHasherProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def get_password_hasher(self, config: Config) -> Iterator[PasswordHasher]:
+        hasher = PasswordHasher(
+            workers=config.password_hasher.WORKERS,
+            max_pending=config.password_hasher.MAX_PENDING,
+            use_processes=config.password_hasher.USE_PROCESSES,
+        )
+        yield hasher
+        hasher.shutdown()
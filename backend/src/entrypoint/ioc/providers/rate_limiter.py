@@ -1,12 +1,23 @@
 from dishka import Provider, Scope, provide
 from redis.asyncio import Redis
 
-from core.rate_limiter import RateLimiter
+from core.rate_limiter import Algorithm, LocalRateLimitFilter, RateLimiter
+from entrypoint.config import Config
 
 
 class RateLimiterProvider(Provider):
-    scope = Scope.REQUEST
+    scope = Scope.APP
 
     @provide
-    def get_rate_limiter(self, redis: Redis) -> RateLimiter:
-        return RateLimiter(redis)
+    def get_rate_limiter(self, redis: Redis, config: Config) -> RateLimiter:
+        local_filter = None
+        if config.rate_limit.LOCAL_FILTER:
+            local_filter = LocalRateLimitFilter(
+                max_keys=config.rate_limit.LOCAL_FILTER_MAX_KEYS,
+            )
+
+        return RateLimiter(
+            redis,
+            algorithm=Algorithm(config.rate_limit.ALGORITHM),
+            local_filter=local_filter,
+        )
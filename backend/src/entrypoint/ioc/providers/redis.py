@@ -1,6 +1,9 @@
+from collections.abc import AsyncIterator
+
 from dishka import Provider, Scope, provide
 from redis.asyncio import Redis
 
+from clients import RedisClient
 from entrypoint.config import Config
 
 
@@ -8,8 +11,7 @@ class RedisProvider(Provider):
     scope = Scope.APP
 
     @provide
-    def get_redis(self, config: Config) -> Redis:
-        return Redis(
-            host=config.redis.HOST,
-            port=config.redis.PORT,
-        )
+    async def get_redis(self, config: Config) -> AsyncIterator[Redis]:
+        client = RedisClient(config)
+        yield client.get_redis()
+        await client.close()
@@ -1,24 +1,37 @@
 from dishka import Provider, Scope, provide
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from clients.s3_client import S3Client
 from core.uow import UnitOfWork
+from entrypoint.config import Config
 from repositories import (
+    AnalyticsRepository,
+    CartRepository,
     CategoryRepository,
+    IAnalyticsRepository,
+    ICartRepository,
     ICategoryRepository,
     IInvoiceRepository,
     IOrderRepository,
+    IProductCacheRepository,
     IProductImageRepository,
     IProductRepository,
     IPromocodeRepository,
     IS3Repository,
+    IUserCacheRepository,
     IUserRepository,
+    IWebhookEventRepository,
     OrderRepository,
+    ProductCacheRepository,
     ProductImageRepository,
     ProductRepository,
     PromocodeRepository,
     S3Repository,
+    UserCacheRepository,
     UserRepository,
     InvoiceRepository,
+    WebhookEventRepository,
 )
 
 
@@ -37,6 +50,19 @@ class RepositoryProvider(Provider):
     ) -> IProductRepository:
         return ProductRepository(session)
 
+    @provide
+    def get_product_cache_repository(
+        self,
+        redis: Redis,
+        config: Config,
+    ) -> IProductCacheRepository:
+        return ProductCacheRepository(
+            redis,
+            ttl=config.cache.PRODUCTS_TTL,
+            enabled=config.cache.ENABLED,
+            replica_lag=config.cache.PRODUCTS_REPLICA_LAG,
+        )
+
     @provide
     def get_category_repository(
         self,
@@ -52,13 +78,37 @@ class RepositoryProvider(Provider):
         return ProductImageRepository(session)
 
     @provide
-    def get_s3_repository(self) -> IS3Repository:
-        return S3Repository()
+    def get_s3_repository(
+        self,
+        s3_client: S3Client,
+        config: Config,
+    ) -> IS3Repository:
+        return S3Repository(
+            s3_client,
+            max_concurrency=config.s3.UPLOAD_CONCURRENCY,
+            part_size=config.s3.MULTIPART_THRESHOLD,
+            max_request_bytes=config.s3.MAX_REQUEST_BYTES,
+        )
 
     @provide
     def get_order_repository(self, session: AsyncSession) -> IOrderRepository:
         return OrderRepository(session)
 
+    @provide
+    def get_cart_repository(
+        self,
+        redis: Redis,
+        config: Config,
+    ) -> ICartRepository:
+        return CartRepository(redis, ttl=config.cart.TTL)
+
+    @provide
+    def get_analytics_repository(
+        self,
+        session: AsyncSession,
+    ) -> IAnalyticsRepository:
+        return AnalyticsRepository(session)
+
     @provide
     def get_promocode_repository(self, session: AsyncSession) -> IPromocodeRepository:
         return PromocodeRepository(session)
@@ -67,6 +117,25 @@ class RepositoryProvider(Provider):
     def get_user_repository(self, session: AsyncSession) -> IUserRepository:
         return UserRepository(session)
 
+    @provide
+    def get_user_cache_repository(
+        self,
+        redis: Redis,
+        config: Config,
+    ) -> IUserCacheRepository:
+        return UserCacheRepository(
+            redis,
+            ttl=config.cache.USERS_TTL,
+            enabled=config.cache.ENABLED,
+        )
+
+    @provide
+    def get_webhook_event_repository(
+        self,
+        session: AsyncSession,
+    ) -> IWebhookEventRepository:
+        return WebhookEventRepository(session)
+
     @provide
     def get_unit_of_work(self, session: AsyncSession) -> UnitOfWork:
         return UnitOfWork(session)
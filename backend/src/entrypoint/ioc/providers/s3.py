@@ -0,0 +1,22 @@
+from collections.abc import AsyncIterator
+
+from dishka import Provider, Scope, provide
+
+from clients.s3_client import S3Client
+from entrypoint.config import Config
+
+
+class S3Provider(Provider):
+    scope = Scope.APP
+
+    @provide
+    async def get_s3_client(self, config: Config) -> AsyncIterator[S3Client]:
+        client = S3Client(
+            access_key=config.s3.ACCESS_KEY,
+            secret_key=config.s3.SECRET_KEY,
+            endpoint_url=config.s3.ENDPOINT,
+            bucket_name=config.s3.BUCKET_NAME,
+            max_pool_connections=config.s3.MAX_POOL_CONNECTIONS,
+        )
+        yield client
+        await client.close()
@@ -1,17 +1,24 @@
 from dishka import Provider, Scope, provide
 
+from core.password_hasher import PasswordHasher
 from core.uow import UnitOfWork
 from repositories import (
+    IAnalyticsRepository,
+    ICartRepository,
     ICategoryRepository,
     IInvoiceRepository,
     IOrderRepository,
+    IProductCacheRepository,
     IProductImageRepository,
     IProductRepository,
     IPromocodeRepository,
     IS3Repository,
+    IUserCacheRepository,
     IUserRepository,
+    IWebhookEventRepository,
 )
 from services import (
+    AnalyticsService,
     CategoryService,
     OrderService,
     ProductService,
@@ -33,6 +40,7 @@ class ServiceProvider(Provider):
             category_repository: ICategoryRepository,
             image_repository: IProductImageRepository,
             s3_repository: IS3Repository,
+            product_cache: IProductCacheRepository,
     ) -> ProductService:
         return ProductService(
             uow,
@@ -40,6 +48,7 @@ class ServiceProvider(Provider):
             category_repository,
             image_repository,
             s3_repository,
+            product_cache,
         )
 
     @provide
@@ -50,13 +59,19 @@ class ServiceProvider(Provider):
             orders_repository: IOrderRepository,
             products_repository: IProductRepository,
             user_repository: IUserRepository,
+            product_cache: IProductCacheRepository,
+            cart_repository: ICartRepository,
+            webhook_event_repository: IWebhookEventRepository,
     ) -> InvoiceService:
         return InvoiceService(uow,
                               products_repository,
                               invoice_repository,
                               orders_repository,
                               user_repository,
-                              factories)
+                              factories,
+                              product_cache,
+                              cart_repository,
+                              webhook_event_repository)
 
     @provide
     def get_categories_service(
@@ -71,8 +86,10 @@ class ServiceProvider(Provider):
             self,
             uow: UnitOfWork,
             user_repository: IUserRepository,
+            password_hasher: PasswordHasher,
+            user_cache: IUserCacheRepository,
     ) -> UserService:
-        return UserService(uow, user_repository)
+        return UserService(uow, user_repository, password_hasher, user_cache)
 
     @provide
     def get_order_service(
@@ -80,8 +97,16 @@ class ServiceProvider(Provider):
             uow: UnitOfWork,
             order_repository: IOrderRepository,
             product_repository: IProductRepository,
+            product_cache: IProductCacheRepository,
+            cart_repository: ICartRepository,
     ) -> OrderService:
-        return OrderService(uow, order_repository, product_repository)
+        return OrderService(
+            uow,
+            order_repository,
+            product_repository,
+            product_cache,
+            cart_repository,
+        )
 
     @provide
     def get_promocode_service(
@@ -90,3 +115,11 @@ class ServiceProvider(Provider):
             promocode_repository: IPromocodeRepository,
     ) -> PromocodeService:
         return PromocodeService(uow, promocode_repository)
+
+    @provide
+    def get_analytics_service(
+            self,
+            uow: UnitOfWork,
+            analytics_repository: IAnalyticsRepository,
+    ) -> AnalyticsService:
+        return AnalyticsService(uow, analytics_repository)
@@ -7,9 +7,11 @@ from entrypoint.ioc.providers import (
     AuthProvider, 
     ConfigProvider, 
     DatabaseProvider,
+    PasswordHasherProvider,
     RateLimiterProvider, 
     RedisProvider,
     RepositoryProvider, 
+    S3Provider,
     ServiceProvider,
     
 )
@@ -25,4 +27,6 @@ def get_providers() -> Iterable[Provider]:
         ConfigProvider(),
         RedisProvider(),
         RateLimiterProvider(),
+        PasswordHasherProvider(),
+        S3Provider(),
     )
@@ -6,18 +6,19 @@ from dishka import Provider, make_async_container
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
+from redis.asyncio import Redis
 
-from clients import RedisClient
 from core import broker
 from entrypoint.config import Config, create_config
 from middlewares.metrics import MetricsMiddleware
+from utils.prometheus import mark_process_dead
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    config = create_config()
-    redis_client = RedisClient(config)
-    redis = redis_client.get_redis()
+    # The same pooled client the DI container hands out everywhere else.
+    container = app.state.dishka_container
+    redis = await container.get(Redis)
     await redis.ping()
     logging.info("Redis is working")
 
@@ -27,9 +28,12 @@ async def lifespan(app: FastAPI):
 
     await broker.shutdown()
 
-    await redis.aclose()
+    # Runs the app-scoped finalizers, which disconnect the Redis pool.
+    await container.close()
     logging.info("Redis disconnected")
 
+    mark_process_dead()
+
 
 def create_app() -> FastAPI:
     app = FastAPI(lifespan=lifespan)
@@ -48,6 +52,13 @@ def configure_app(app: FastAPI, root_router: APIRouter) -> None:
     app.include_router(root_router)
 
 
+def configure_logging() -> None:
+    config = create_config()
+    logging.getLogger("core.rate_limiter").setLevel(
+        config.rate_limit.LOG_LEVEL.upper(),
+    )
+
+
 def configure_middlewares(app: FastAPI) -> None:
     config = create_config()
     allow_origins = [
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from dishka import FromDishka
+
+from entrypoint.ioc.integrations.console_integration import inject
+from entrypoint.ioc.registry import get_providers
+from entrypoint.setup import create_async_container
+from schemas.product import ProductFileFormat
+from services import ProductService
+
+os.environ.setdefault("PYTHONIOENCODING", "utf-8")
+sys.stdout.reconfigure(encoding="utf-8")
+
+READ_SIZE = 64 * 1024
+
+
+@inject
+async def import_products_from_args(
+        args,
+        dishka_container,
+        product_service: FromDishka[ProductService],
+):
+    file_format = get_format(args)
+
+    async def chunks():
+        with open(args.path, "rb") as file:
+            while chunk := await asyncio.to_thread(file.read, READ_SIZE):
+                yield chunk
+
+    result = await product_service.import_products_for_console(
+        chunks(),
+        file_format,
+    )
+
+    print(f"Created: {result.created}")
+    print(f"Failed:  {result.failed}")
+    for error in result.errors:
+        print(f"  line {error.line}: {error.error}")
+    if result.failed > len(result.errors):
+        print(f"  ... and {result.failed - len(result.errors)} more")
+
+    return result
+
+
+@inject
+async def export_products_from_args(
+        args,
+        dishka_container,
+        product_service: FromDishka[ProductService],
+):
+    file_format = get_format(args)
+
+    with open(args.path, "w", encoding="utf-8", newline="") as file:
+        async for text in product_service.export_products_for_console(file_format):
+            await asyncio.to_thread(file.write, text)
+
+    print(f"Exported products to {args.path}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Bulk import or export products as CSV or NDJSON",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command, help_text in (
+        ("import", "Create products from a file"),
+        ("export", "Write all products to a file"),
+    ):
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument("path", type=str, help="CSV or NDJSON file")
+        subparser.add_argument(
+            "--format",
+            type=str,
+            choices=[fmt.value for fmt in ProductFileFormat],
+            help="File format (default: taken from the file extension)",
+        )
+
+    return parser.parse_args()
+
+
+def get_format(args) -> ProductFileFormat:
+    value = args.format or Path(args.path).suffix.lstrip(".").lower()
+    try:
+        return ProductFileFormat(value)
+    except ValueError:
+        print("Error: Unknown file format, use --format csv or --format ndjson")
+        sys.exit(1)
+
+
+async def main():
+    try:
+        args = parse_args()
+        container = create_async_container(get_providers())
+        if args.command == "import":
+            await import_products_from_args(args, dishka_container=container)
+        else:
+            await export_products_from_args(args, dishka_container=container)
+
+    except KeyboardInterrupt:
+        print("\n\nOperation cancelled by user.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
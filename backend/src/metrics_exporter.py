@@ -0,0 +1,55 @@
+import argparse
+import logging
+import sys
+import time
+
+from prometheus_client import start_http_server
+
+from utils.prometheus import (MULTIPROC_DIR, build_registry,
+                              cleanup_dead_processes, is_multiprocess)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve metrics aggregated from every API and worker process "
+            "that writes to PROMETHEUS_MULTIPROC_DIR"
+        ),
+    )
+    parser.add_argument("--host", type=str, default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument(
+        "--cleanup-interval",
+        type=float,
+        default=30,
+        help="Seconds between removals of dead processes' files, 0 disables",
+    )
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
+    if not is_multiprocess():
+        print("Error: PROMETHEUS_MULTIPROC_DIR is not set")
+        sys.exit(1)
+
+    start_http_server(args.port, addr=args.host, registry=build_registry())
+    logger.info("Serving metrics from %s on :%s", MULTIPROC_DIR, args.port)
+
+    while True:
+        if args.cleanup_interval:
+            dead = cleanup_dead_processes()
+            if dead:
+                logger.info("Removed metric files of dead processes %s", dead)
+        time.sleep(args.cleanup_interval or 3600)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
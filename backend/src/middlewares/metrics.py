@@ -1,15 +1,14 @@
 import time
-from typing import Callable
 
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from prometheus_client import (
     Counter,
     Gauge,
     Histogram,
 )
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from entrypoint.config import config
+from utils.prometheus import is_multiprocess
 
 APP_NAME = config.app.NAME
 
@@ -31,80 +30,259 @@ HTTP_EXCEPTIONS_TOTAL = Counter(
     ["path", "handler", "app_name"],
 )
 
+# The route is only known once routing has run, so in-progress requests
+# are counted per method.
 HTTP_IN_PROGRESS = Gauge(
     "http_requests_in_progress",
     "HTTP requests in progress",
-    ["path", "handler", "method", "app_name"],
+    ["method", "app_name"],
+    multiprocess_mode="livesum",
 )
 
 HTTP_REQUESTS_DURATION = Histogram(
-    "http_requests_duration_seconds",
-    "Request duration in seconds (plural name)",
+    "http_request_duration_seconds",
+    "Request duration in seconds, including streaming the response body",
     ["path", "handler", "method", "app_name"],
     buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0, 2.5, 5, 10),
 )
 
-HTTP_REQUEST_DURATION_OLD = Histogram(
-    "http_request_duration_seconds",
-    "Request duration in seconds (singular / legacy name)",
-    ["path", "handler", "method", "app_name"],
-    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0, 2.5, 5, 10),
+CACHE_HITS_TOTAL = Counter(
+    "cache_hits_total",
+    "Total number of cache hits",
+    ["cache", "app_name"],
+)
+
+CACHE_MISSES_TOTAL = Counter(
+    "cache_misses_total",
+    "Total number of cache misses",
+    ["cache", "app_name"],
+)
+
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Password hash/verify calls queued or running in the worker pool",
+    ["app_name"],
+    multiprocess_mode="livesum",
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Password hash/verify latency including time spent queued",
+    ["operation", "app_name"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5),
+)
+
+PASSWORD_HASH_REJECTED_TOTAL = Counter(
+    "password_hash_rejected_total",
+    "Password hash/verify calls rejected because the pool was saturated",
+    ["operation", "app_name"],
+)
+
+IMAGE_VARIANTS_DURATION = Histogram(
+    "image_variants_duration_seconds",
+    "Time to decode one image and render all of its variants",
+    ["app_name"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5, 10, 30),
+)
+
+REDIS_POOL_CONNECTIONS = Gauge(
+    "redis_pool_connections",
+    "Redis connections held by the pool, by state (in_use, idle)",
+    ["state", "app_name"],
+    multiprocess_mode="livesum",
+)
+
+REDIS_POOL_MAX_CONNECTIONS = Gauge(
+    "redis_pool_max_connections",
+    "Upper bound of the Redis connection pool",
+    ["app_name"],
+    multiprocess_mode="livesum",
+)
+
+REDIS_POOL_WAIT_DURATION = Histogram(
+    "redis_pool_wait_seconds",
+    "Time spent waiting for a Redis connection from the pool",
+    ["app_name"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5),
+)
+
+REDIS_POOL_EXHAUSTED_TOTAL = Counter(
+    "redis_pool_exhausted_total",
+    "Commands that failed because no pooled Redis connection freed up in time",
+    ["app_name"],
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Connections the database pool keeps open, not counting overflow",
+    ["pool", "app_name"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+    ["pool", "app_name"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Database connections open beyond the pool size",
+    ["pool", "app_name"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_WAIT_DURATION = Histogram(
+    "db_pool_wait_seconds",
+    "Time to check a connection out of the database pool, including connecting",
+    ["pool", "app_name"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5, 10, 30),
+)
+
+DB_CONNECTION_HOLD_DURATION = Histogram(
+    "db_connection_hold_seconds",
+    "Time a database connection stays checked out, from first query to release",
+    ["pool", "app_name"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5, 10, 30),
 )
 
+DB_POOL_TIMEOUTS_TOTAL = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up because the database pool stayed exhausted",
+    ["pool", "app_name"],
+)
+
+
+class MetricsMiddleware:
+    """Pure ASGI request instrumentation.
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: FastAPI):
-        super().__init__(app)
+    Series are labelled by route template (``/products/{product_id}``) rather
+    than the raw path, so their number is bounded by the number of routes.
+    Label children are bound once per route/method/status combination and
+    reused. When the request carries a W3C ``traceparent`` header its trace
+    id is attached to the duration observation as an exemplar. Exemplars
+    are kept in process memory only, and the multiprocess collector does
+    not export them, so they are skipped in multiprocess mode.
+    """
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        path = request.url.path
-        handler = path
-        method = request.method
-        labels = {
-            "path": path,
-            "handler": handler,
-            "method": method,
-            "app_name": APP_NAME,
-        }
+    UNMATCHED = "<unmatched>"
 
-        HTTP_IN_PROGRESS.labels(**labels).inc()
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._children: dict[tuple, tuple] = {}
+        self._in_progress: dict[str, Gauge] = {}
+        self._endpoint_routes: dict | None = None
+        self._exemplars = not is_multiprocess()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = HTTP_IN_PROGRESS.labels(method=method, app_name=APP_NAME)
+            self._in_progress[method] = in_progress
 
-        start = time.time()
         status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        start = time.perf_counter()
+        exception = False
         try:
-            resp = await call_next(request)
-            status_code = int(getattr(resp, "status_code", 500))
-            return resp
+            await self.app(scope, receive, send_wrapper)
         except Exception:
-            HTTP_EXCEPTIONS_TOTAL.labels(path=path, handler=handler, app_name=APP_NAME).inc()
+            exception = True
             raise
         finally:
-            duration = time.time() - start
-            status_code_str = str(status_code)
-            status_class = f"{status_code // 100}xx" if isinstance(status_code, int) else status_code_str
-
-            req_labels = {
-                "method": method,
-                "path": path,
-                "handler": handler,
-                "status": status_class,
-                "status_code": status_code_str,
-                "app_name": APP_NAME,
-            }
-            resp_labels = {
-                "status_code": status_code_str,
-                "status": status_class,
-                "path": path,
-                "handler": handler,
-                "app_name": APP_NAME,
+            duration = time.perf_counter() - start
+            in_progress.dec()
+
+            path, handler = self._route_labels(scope)
+            requests, responses, histogram = self._bind(
+                path, handler, method, status_code
+            )
+            requests.inc()
+            responses.inc()
+            histogram.observe(
+                duration,
+                exemplar=self._exemplar(scope) if self._exemplars else None,
+            )
+            if exception:
+                HTTP_EXCEPTIONS_TOTAL.labels(
+                    path=path, handler=handler, app_name=APP_NAME
+                ).inc()
+
+    def _route_labels(self, scope: Scope) -> tuple[str, str]:
+        # Routing stores the matched route in the shared scope dict. Plain
+        # Starlette routes (e.g. /openapi.json) only store the endpoint.
+        route = scope.get("route")
+        if route is None and "endpoint" in scope:
+            route = self._route_for_endpoint(scope)
+        path = getattr(route, "path", None) or self.UNMATCHED
+        handler = getattr(route, "name", None) or self.UNMATCHED
+        return path, handler
+
+    def _route_for_endpoint(self, scope: Scope):
+        if self._endpoint_routes is None:
+            app = scope.get("app")
+            routes = getattr(getattr(app, "router", None), "routes", [])
+            self._endpoint_routes = {
+                route.endpoint: route
+                for route in routes
+                if getattr(route, "endpoint", None) is not None
             }
-            inprog_labels = {"path": path, "handler": handler, "method": method, "app_name": APP_NAME}
-            hist_labels = {"path": path, "handler": handler, "method": method, "app_name": APP_NAME}
-
-            try:
-                HTTP_REQUESTS_TOTAL.labels(**req_labels).inc()
-                HTTP_RESPONSES_TOTAL.labels(**resp_labels).inc()
-                HTTP_REQUESTS_DURATION.labels(**hist_labels).observe(duration)
-                HTTP_REQUEST_DURATION_OLD.labels(**hist_labels).observe(duration)
-            finally:
-                HTTP_IN_PROGRESS.labels(**inprog_labels).dec()
+        return self._endpoint_routes.get(scope["endpoint"])
+
+    def _bind(
+        self, path: str, handler: str, method: str, status_code: int
+    ) -> tuple:
+        key = (path, handler, method, status_code)
+        children = self._children.get(key)
+        if children is None:
+            status_code_str = str(status_code)
+            status_class = f"{status_code // 100}xx"
+            children = (
+                HTTP_REQUESTS_TOTAL.labels(
+                    method=method,
+                    path=path,
+                    handler=handler,
+                    status=status_class,
+                    status_code=status_code_str,
+                    app_name=APP_NAME,
+                ),
+                HTTP_RESPONSES_TOTAL.labels(
+                    status_code=status_code_str,
+                    status=status_class,
+                    path=path,
+                    handler=handler,
+                    app_name=APP_NAME,
+                ),
+                HTTP_REQUESTS_DURATION.labels(
+                    path=path,
+                    handler=handler,
+                    method=method,
+                    app_name=APP_NAME,
+                ),
+            )
+            self._children[key] = children
+        return children
+
+    @staticmethod
+    def _exemplar(scope: Scope) -> dict[str, str] | None:
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                # version-traceid-parentid-flags
+                parts = value.decode("latin-1").split("-")
+                if len(parts) == 4 and len(parts[1]) == 32:
+                    return {"trace_id": parts[1]}
+                return None
+        return None
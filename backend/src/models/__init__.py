@@ -1,4 +1,5 @@
 from models.base import Base
+from models.analytics import ProductSalesRollup, SalesRollup
 from models.category import Category
 from models.invoices import Invoice
 from models.order import Order, OrderProduct
@@ -6,6 +7,7 @@ from models.product import Product
 from models.product_image import ProductImage
 from models.promocode import Promocode, PromocodeAction
 from models.user import RoleEnum, User
+from models.webhook_event import WebhookEvent
 
 __all__ = [
     "Base",
@@ -19,4 +21,7 @@ __all__ = [
     "Invoice",
     "Promocode",
     "PromocodeAction",
+    "SalesRollup",
+    "ProductSalesRollup",
+    "WebhookEvent",
 ]
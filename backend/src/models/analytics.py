@@ -0,0 +1,38 @@
+from datetime import date
+
+from sqlalchemy import Date, Enum, Float, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models import Base
+from schemas.order import OrderStatus
+
+
+class SalesRollup(Base):
+    """Orders created on ``day`` per status, rebuilt from ``orders``."""
+
+    __table_args__ = (
+        UniqueConstraint("day", "status", name="uq_sales_rollups_day_status"),
+    )
+
+    day: Mapped[date] = mapped_column(Date(), nullable=False)
+    status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), nullable=False)
+    orders_count: Mapped[int] = mapped_column(Integer(), nullable=False)
+    amount: Mapped[float] = mapped_column(Float(), nullable=False)
+
+
+class ProductSalesRollup(Base):
+    """Paid quantity and revenue per product on ``day``."""
+
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "product_id", name="uq_product_sales_rollups_day_product_id"
+        ),
+    )
+
+    day: Mapped[date] = mapped_column(Date(), nullable=False)
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+    )
+    category_id: Mapped[int] = mapped_column(Integer(), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer(), nullable=False)
+    revenue: Mapped[float] = mapped_column(Float(), nullable=False)
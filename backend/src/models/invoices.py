@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import ForeignKey, Numeric, String, Enum, Uuid, Text
+from sqlalchemy import ForeignKey, Numeric, String, Enum, Uuid, Text, Index, text
 
 from models import Base
 from sqlalchemy.orm import Mapped, mapped_column
@@ -9,6 +9,16 @@ from schemas.invoice import InvoiceStatus, Methods, InvoiceResponse
 
 
 class Invoice(Base):
+    __table_args__ = (
+        Index("ix_invoices_uid", "uid"),
+        Index("ix_invoices_order_id", "order_id"),
+        Index(
+            "ix_invoices_provider_uid",
+            "provider_uid",
+            postgresql_where=text("provider_uid IS NOT NULL"),
+        ),
+    )
+
     uid: Mapped[Uuid] = mapped_column(
         Uuid(as_uuid=True), primary_key=False, default=uuid.uuid4
     )
@@ -1,13 +1,25 @@
 import enum
 
-from sqlalchemy import Enum, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Enum, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models import Base
-from schemas.order import CartItem, OrderResponse, OrderStatus
+from schemas.order import (AdminOrderResponse, CartItem, OrderResponse,
+                           OrderStatus)
 
 
 class OrderProduct(Base):
+    __table_args__ = (
+        # ON CONFLICT target of OrderRepository._update_products.
+        Index(
+            "uq_order_products_order_id_product_id",
+            "order_id",
+            "product_id",
+            unique=True,
+        ),
+        Index("ix_order_products_product_id", "product_id"),
+    )
+
     order_id: Mapped[int] = mapped_column(
         ForeignKey("orders.id", ondelete="CASCADE"), primary_key=False
     )
@@ -29,6 +41,12 @@ class OrderProduct(Base):
 
 
 class Order(Base):
+    __table_args__ = (
+        # get_cart / get_purchases_user / get_all_user
+        Index("ix_orders_user_id_status_created_at", "user_id", "status", "created_at"),
+        Index("ix_orders_created_at", "created_at"),
+    )
+
     order_products: Mapped[list["OrderProduct"]] = relationship(
         "OrderProduct",
         back_populates="order",
@@ -62,6 +80,14 @@ class Order(Base):
     def __str__(self) -> str:
         return f"Order #{self.id} ({self.status})"
 
+    def product_quantities(self) -> dict[int, int]:
+        quantities: dict[int, int] = {}
+        for item in self.order_products or []:
+            quantities[item.product_id] = (
+                quantities.get(item.product_id, 0) + item.quantity
+            )
+        return quantities
+
     def to_entity(self) -> OrderResponse:
         return OrderResponse(
             id=self.id,
@@ -82,3 +108,11 @@ class Order(Base):
             delivery_zip=self.delivery_zip,
             delivery_notes=self.delivery_notes,
         )
+
+    def to_admin_entity(self) -> AdminOrderResponse:
+        return AdminOrderResponse(
+            **self.to_entity().model_dump(),
+            user_id=self.user_id,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
@@ -1,7 +1,7 @@
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, ForeignKey, Numeric, String, Integer
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, Numeric, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models import Base
@@ -12,6 +12,18 @@ if TYPE_CHECKING:
 
 
 class Product(Base):
+    __table_args__ = (
+        Index("ix_products_category_id_price", "category_id", "price"),
+        # keyset pagination by (price, id)
+        Index("ix_products_price_id", "price", "id"),
+        Index(
+            "ix_products_available_price_id",
+            "price",
+            "id",
+            postgresql_where=text("in_stock AND quantity > 0"),
+        ),
+    )
+
     name: Mapped[str] = mapped_column(
         String(255),
         nullable=False,
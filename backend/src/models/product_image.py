@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String
+from sqlalchemy import JSON, Boolean, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models import Base
@@ -10,6 +10,10 @@ if TYPE_CHECKING:
 
 
 class ProductImage(Base):
+    __table_args__ = (
+        Index("ix_product_images_product_id_order", "product_id", "order"),
+    )
+
     product_id: Mapped[int] = mapped_column(
         ForeignKey(
             "products.id",
@@ -31,11 +35,21 @@ class ProductImage(Base):
         default=False,
         nullable=False,
     )
+    # {"thumbnail": {"webp": url, "avif": url}, "medium": {...}}, filled in
+    # by the generate_image_variants task once the original is uploaded.
+    variants: Mapped[dict | None] = mapped_column(
+        JSON(),
+        nullable=True,
+    )
 
     product: Mapped["Product"] = relationship(
         "Product",
         back_populates="images",
     )
 
+    def variant_url(self, size: str, fmt: str = "webp") -> str:
+        """URL of the ``size`` variant, or the original until it exists."""
+        return (self.variants or {}).get(size, {}).get(fmt, self.url)
+
     def __str__(self) -> str:
         return f"Image #{self.id} for product {self.product_id}"
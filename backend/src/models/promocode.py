@@ -1,6 +1,6 @@
 from decimal import Decimal
 
-from sqlalchemy import String, Integer, Numeric, ForeignKey
+from sqlalchemy import String, Integer, Numeric, ForeignKey, Index
 
 from models import Base
 from sqlalchemy.orm import Mapped, mapped_column
@@ -27,6 +27,10 @@ class Promocode(Base):
 
 
 class PromocodeAction(Base):
+    __table_args__ = (
+        Index("ix_promocode_actions_user_id_promo_id", "user_id", "promo_id"),
+    )
+
     id = None
     promo_id: Mapped[int] = mapped_column(ForeignKey("promocodes.id"), primary_key=True, autoincrement=False)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=False)
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, String, UniqueConstraint, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models import Base
+
+
+class WebhookEvent(Base):
+    """Payment provider event, stored once per ``event_id`` on receipt."""
+
+    __table_args__ = (
+        UniqueConstraint(
+            "provider", "event_id", name="uq_webhook_events_provider_event_id"
+        ),
+        # WebhookEventRepository.get_pending
+        Index(
+            "ix_webhook_events_pending",
+            "provider",
+            "object_id",
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+    )
+
+    provider: Mapped[str] = mapped_column(String(32), nullable=False)
+    event_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(128), nullable=False)
+    # Provider id of the object the event is about, e.g. a checkout session.
+    object_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON(), nullable=False)
+    processed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(), nullable=True
+    )
@@ -1,6 +1,12 @@
+from repositories.analytics import AnalyticsRepository, IAnalyticsRepository
+from repositories.cart import CartRepository, ICartRepository
 from repositories.category import CategoryRepository, ICategoryRepository
 from repositories.order import IOrderRepository, OrderRepository
 from repositories.product import IProductRepository, ProductRepository
+from repositories.product_cache import (
+    IProductCacheRepository,
+    ProductCacheRepository,
+)
 from repositories.product_image import (
     IProductImageRepository,
     ProductImageRepository,
@@ -8,23 +14,38 @@ from repositories.product_image import (
 from repositories.promocode import IPromocodeRepository, PromocodeRepository
 from repositories.s3 import IS3Repository, S3Repository
 from repositories.user import IUserRepository, UserRepository
+from repositories.user_cache import IUserCacheRepository, UserCacheRepository
 from repositories.invoice import InvoiceRepository, IInvoiceRepository
+from repositories.webhook_event import (
+    IWebhookEventRepository,
+    WebhookEventRepository,
+)
 
 __all__ = [
+    "AnalyticsRepository",
+    "IAnalyticsRepository",
+    "CartRepository",
+    "ICartRepository",
     "CategoryRepository",
     "ICategoryRepository",
     "ProductRepository",
     "IProductRepository",
+    "ProductCacheRepository",
+    "IProductCacheRepository",
     "ProductImageRepository",
     "IProductImageRepository",
     "S3Repository",
     "IS3Repository",
     "UserRepository",
     "IUserRepository",
+    "UserCacheRepository",
+    "IUserCacheRepository",
     "OrderRepository",
     "IOrderRepository",
     "IPromocodeRepository",
     "PromocodeRepository",
     "InvoiceRepository",
     "IInvoiceRepository",
+    "WebhookEventRepository",
+    "IWebhookEventRepository",
 ]
@@ -0,0 +1,194 @@
+import datetime
+from typing import Protocol
+
+from sqlalchemy import Date, Select, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import (Order, OrderProduct, Product, ProductSalesRollup,
+                    SalesRollup)
+from schemas.analytics import DailySales, ProductSales
+from schemas.order import OrderStatus
+
+# Key of the advisory lock that serializes rollup rebuilds.
+ROLLUPS_LOCK_KEY = 0x524F4C4C
+
+
+class IAnalyticsRepository(Protocol):
+    async def refresh_rollups(
+            self, start: datetime.date, end: datetime.date
+    ) -> None:
+        pass
+
+    async def get_daily_sales(
+            self, start: datetime.date | None, end: datetime.date
+    ) -> list[DailySales]:
+        pass
+
+    async def get_product_sales(
+            self, start: datetime.date | None, end: datetime.date
+    ) -> list[ProductSales]:
+        pass
+
+
+class AnalyticsRepository:
+    """Sales figures backed by the daily rollup tables.
+
+    Days before today are read from ``sales_rollups`` and
+    ``product_sales_rollups``. Today is still changing, so it is aggregated
+    from ``orders`` directly, which only touches today's rows.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def refresh_rollups(
+            self, start: datetime.date, end: datetime.date
+    ) -> None:
+        """Rebuild the rollups of ``start``..``end`` from the orders."""
+        if self.session.get_bind().dialect.name == "postgresql":
+            # The scheduled job and the per-day refreshes queued on status
+            # changes can rebuild the same day at once; the second insert
+            # would then hit the unique keys of the rollups.
+            await self.session.execute(
+                select(func.pg_advisory_xact_lock(ROLLUPS_LOCK_KEY))
+            )
+        await self.session.execute(
+            delete(SalesRollup).where(SalesRollup.day.between(start, end))
+        )
+        await self.session.execute(
+            delete(ProductSalesRollup)
+            .where(ProductSalesRollup.day.between(start, end))
+        )
+        await self.session.execute(
+            insert(SalesRollup).from_select(
+                ["day", "status", "orders_count", "amount"],
+                _orders_by_day(start, end),
+            )
+        )
+        await self.session.execute(
+            insert(ProductSalesRollup).from_select(
+                ["day", "product_id", "category_id", "quantity", "revenue"],
+                _products_by_day(start, end),
+            )
+        )
+
+    async def get_daily_sales(
+            self, start: datetime.date | None, end: datetime.date
+    ) -> list[DailySales]:
+        today = datetime.date.today()
+        rows = []
+
+        stmt = (
+            select(
+                SalesRollup.day,
+                SalesRollup.status,
+                SalesRollup.orders_count,
+                SalesRollup.amount,
+            )
+            .where(SalesRollup.day <= end, SalesRollup.day < today)
+            .order_by(SalesRollup.day, SalesRollup.status)
+        )
+        if start is not None:
+            stmt = stmt.where(SalesRollup.day >= start)
+        result = await self.session.execute(stmt)
+        rows.extend(result.mappings().all())
+
+        if _covers(start, end, today):
+            result = await self.session.execute(_orders_by_day(today, today))
+            rows.extend(result.mappings().all())
+
+        return [DailySales(**row) for row in rows]
+
+    async def get_product_sales(
+            self, start: datetime.date | None, end: datetime.date
+    ) -> list[ProductSales]:
+        today = datetime.date.today()
+        totals: dict[tuple[int, int], ProductSales] = {}
+
+        stmt = (
+            select(
+                ProductSalesRollup.product_id,
+                ProductSalesRollup.category_id,
+                func.sum(ProductSalesRollup.quantity).label("quantity"),
+                func.sum(ProductSalesRollup.revenue).label("revenue"),
+            )
+            .where(
+                ProductSalesRollup.day <= end,
+                ProductSalesRollup.day < today,
+            )
+            .group_by(
+                ProductSalesRollup.product_id,
+                ProductSalesRollup.category_id,
+            )
+        )
+        if start is not None:
+            stmt = stmt.where(ProductSalesRollup.day >= start)
+        result = await self.session.execute(stmt)
+        rows = list(result.mappings().all())
+
+        if _covers(start, end, today):
+            result = await self.session.execute(_products_by_day(today, today))
+            rows.extend(result.mappings().all())
+
+        for row in rows:
+            key = (row["product_id"], row["category_id"])
+            sales = totals.setdefault(
+                key,
+                ProductSales(
+                    product_id=row["product_id"],
+                    category_id=row["category_id"],
+                    quantity=0,
+                    revenue=0.0,
+                ),
+            )
+            sales.quantity += row["quantity"]
+            sales.revenue += row["revenue"]
+
+        return sorted(totals.values(), key=lambda s: s.revenue, reverse=True)
+
+
+def _covers(
+        start: datetime.date | None, end: datetime.date, day: datetime.date
+) -> bool:
+    return (start is None or start <= day) and day <= end
+
+
+def _created_between(start: datetime.date, end: datetime.date) -> tuple:
+    # Range on created_at itself so ix_orders_created_at can be used.
+    return (
+        Order.created_at >= datetime.datetime.combine(start, datetime.time.min),
+        Order.created_at < datetime.datetime.combine(
+            end + datetime.timedelta(days=1), datetime.time.min
+        ),
+    )
+
+
+def _orders_by_day(start: datetime.date, end: datetime.date) -> Select:
+    day = func.date(Order.created_at, type_=Date)
+    return (
+        select(
+            day.label("day"),
+            Order.status.label("status"),
+            func.count(Order.id).label("orders_count"),
+            func.coalesce(func.sum(Order.amount), 0.0).label("amount"),
+        )
+        .where(*_created_between(start, end))
+        .group_by(day, Order.status)
+    )
+
+
+def _products_by_day(start: datetime.date, end: datetime.date) -> Select:
+    day = func.date(Order.created_at, type_=Date)
+    return (
+        select(
+            day.label("day"),
+            OrderProduct.product_id.label("product_id"),
+            Product.category_id.label("category_id"),
+            func.sum(OrderProduct.quantity).label("quantity"),
+            func.sum(OrderProduct.quantity * OrderProduct.price).label("revenue"),
+        )
+        .join(Order, Order.id == OrderProduct.order_id)
+        .join(Product, Product.id == OrderProduct.product_id)
+        .where(Order.status == OrderStatus.PAYED, *_created_between(start, end))
+        .group_by(day, OrderProduct.product_id, Product.category_id)
+    )
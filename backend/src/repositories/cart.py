@@ -0,0 +1,111 @@
+from typing import Protocol
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import WatchError
+
+from schemas.order import Cart, DeliveryAddress
+
+
+class ICartRepository(Protocol):
+    async def get(self, user_id: int) -> Cart | None: ...
+
+    async def save(self, user_id: int, cart: Cart) -> None: ...
+
+    async def seed(self, user_id: int, cart: Cart) -> Cart: ...
+
+    async def delete(self, user_id: int) -> None: ...
+
+    async def pop_dirty(self, count: int) -> list[int]: ...
+
+    async def mark_dirty(self, *user_ids: int) -> None: ...
+
+
+class CartRepository(ICartRepository):
+    """Carts as Redis hashes: ``order_id``, ``address`` and ``item:<id>``.
+
+    Saved carts are added to a dirty set that the write-behind task drains
+    into ``order_products``. Unlike the caches, Redis errors propagate:
+    the cart has no other up-to-date copy.
+    """
+
+    KEY = "carts:{user_id}"
+    DIRTY_KEY = "carts:dirty"
+    ITEM_PREFIX = "item:"
+
+    def __init__(self, redis: Redis, ttl: int):
+        self._redis = redis
+        self._ttl = ttl
+
+    async def get(self, user_id: int) -> Cart | None:
+        fields = await self._redis.hgetall(self.KEY.format(user_id=user_id))
+        return self._parse(fields)
+
+    async def save(self, user_id: int, cart: Cart) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            self._write(pipe, self.KEY.format(user_id=user_id), cart)
+            pipe.sadd(self.DIRTY_KEY, user_id)
+            await pipe.execute()
+
+    async def seed(self, user_id: int, cart: Cart) -> Cart:
+        """Store ``cart`` loaded from the database unless one is there.
+
+        Returns whichever cart ends up in Redis, so a concurrent edit is
+        never overwritten by the older database copy.
+        """
+        key = self.KEY.format(user_id=user_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                stored = self._parse(await pipe.hgetall(key))
+                if stored is not None:
+                    return stored
+                pipe.multi()
+                self._write(pipe, key, cart)
+                await pipe.execute()
+            except WatchError:
+                return await self.get(user_id) or cart
+        return cart
+
+    async def delete(self, user_id: int) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self.KEY.format(user_id=user_id))
+            pipe.srem(self.DIRTY_KEY, user_id)
+            await pipe.execute()
+
+    async def pop_dirty(self, count: int) -> list[int]:
+        user_ids = await self._redis.spop(self.DIRTY_KEY, count)
+        return [int(user_id) for user_id in user_ids or []]
+
+    async def mark_dirty(self, *user_ids: int) -> None:
+        if user_ids:
+            await self._redis.sadd(self.DIRTY_KEY, *user_ids)
+
+    def _write(self, pipe: Pipeline, key: str, cart: Cart) -> None:
+        mapping = {"order_id": cart.order_id}
+        if cart.address is not None:
+            mapping["address"] = cart.address.model_dump_json()
+        for product_id, quantity in cart.items.items():
+            mapping[f"{self.ITEM_PREFIX}{product_id}"] = quantity
+
+        pipe.delete(key)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, self._ttl)
+
+    def _parse(self, fields: dict[bytes, bytes]) -> Cart | None:
+        if not fields:
+            return None
+
+        fields = {key.decode(): value for key, value in fields.items()}
+        address = fields.get("address")
+        return Cart(
+            order_id=int(fields["order_id"]),
+            address=(
+                DeliveryAddress.model_validate_json(address) if address else None
+            ),
+            items={
+                int(name.removeprefix(self.ITEM_PREFIX)): int(quantity)
+                for name, quantity in fields.items()
+                if name.startswith(self.ITEM_PREFIX)
+            },
+        )
@@ -24,6 +24,8 @@ class ICategoryRepository(Protocol):
 
     async def delete(self, category_id: int): ...
 
+    async def get_existing_ids(self, category_ids: set[int]) -> set[int]: ...
+
     async def exists_by_name(
         self, name: str, exclude_id: int | None = None
     ) -> bool: ...
@@ -108,6 +110,13 @@ class CategoryRepository(ICategoryRepository):
         await self.session.delete(category)
         return category
 
+    async def get_existing_ids(self, category_ids: set[int]) -> set[int]:
+        if not category_ids:
+            return set()
+        query = select(Category.id).where(Category.id.in_(category_ids))
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
     async def exists_by_name(
         self,
         name: str,
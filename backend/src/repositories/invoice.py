@@ -1,4 +1,5 @@
-from typing import Protocol
+import datetime
+from typing import AsyncIterator, Protocol
 from uuid import UUID
 
 from sqlalchemy import select
@@ -7,7 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions import InvoiceNotFoundError
 from models.invoices import Invoice
-from schemas.invoice import InvoiceCreate, InvoiceUpdate, InvoiceResponse
+from schemas.invoice import (InvoiceCreate, InvoiceExportParams, InvoiceUpdate,
+                             InvoiceResponse)
 
 
 class IInvoiceRepository(Protocol):
@@ -27,9 +29,17 @@ class IInvoiceRepository(Protocol):
     async def get_by_provider_uid(
         self,
         provider_uid: str,
+        lock: bool = False,
     ) -> Invoice | None:
         pass
 
+    def stream_rows(
+        self,
+        params: InvoiceExportParams,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[dict]]:
+        pass
+
 
 class InvoiceRepository(IInvoiceRepository):
 
@@ -88,7 +98,60 @@ class InvoiceRepository(IInvoiceRepository):
     async def get_by_provider_uid(
         self,
         provider_uid: str,
+        lock: bool = False,
     ) -> Invoice | None:
         stmt = select(Invoice).where(Invoice.provider_uid == provider_uid)
+        if lock:
+            stmt = stmt.with_for_update()
         obj: Invoice | None = (await self.session.execute(stmt)).scalar_one_or_none()
         return obj
+
+    async def stream_rows(
+        self,
+        params: InvoiceExportParams,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield invoices by id, ``batch_size`` rows at a time."""
+        conditions = []
+        if params.status is not None:
+            conditions.append(Invoice.status == params.status)
+        if params.date_from is not None:
+            conditions.append(
+                Invoice.created_at >= datetime.datetime.combine(
+                    params.date_from, datetime.time.min
+                )
+            )
+        if params.date_to is not None:
+            conditions.append(
+                Invoice.created_at < datetime.datetime.combine(
+                    params.date_to + datetime.timedelta(days=1),
+                    datetime.time.min,
+                )
+            )
+        if params.after_id is not None:
+            conditions.append(Invoice.id > params.after_id)
+
+        stmt = (
+            select(
+                Invoice.id,
+                Invoice.uid,
+                Invoice.order_id,
+                Invoice.user_id,
+                Invoice.method,
+                Invoice.status,
+                Invoice.amount,
+                Invoice.provider_uid,
+                Invoice.created_at,
+                Invoice.updated_at,
+            )
+            .where(*conditions)
+            .order_by(Invoice.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield [
+                # (str, Enum) members would be written as "Methods.STRIPE".
+                {**row, "method": row["method"].value, "status": row["status"].value}
+                for row in partition
+            ]
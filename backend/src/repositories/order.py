@@ -1,9 +1,11 @@
 import datetime
 import time
-from typing import Protocol
+from typing import AsyncIterator, Protocol
 
 from fastapi import HTTPException
-from sqlalchemy import desc, insert, outerjoin, select, update, func, delete
+from sqlalchemy import (Select, delete, desc, func, insert, outerjoin, select,
+                        tuple_, update)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
@@ -12,8 +14,8 @@ from starlette import status
 from models import PromocodeAction, Promocode
 from models.order import Order, OrderProduct
 from models.product import Product
-from schemas.order import (CartItem, OrderCreate, OrderProductCreate,
-                           OrderUpdate, OrdersAnalytics)
+from schemas.order import (Cart, CartItem, OrderCreate, OrderExportParams,
+                           OrderFilterParams, OrderUpdate)
 from schemas.order import OrderStatus
 from utils.numbers import get_percent
 
@@ -28,16 +30,31 @@ class IOrderRepository(Protocol):
     async def get_all(self) -> list[Order]:
         pass
 
+    async def get_page(
+            self, filters: OrderFilterParams, after: dict | None = None
+    ) -> tuple[list[Order], bool]:
+        pass
+
+    async def get_summaries_page(
+            self, filters: OrderFilterParams, after: dict | None = None
+    ) -> tuple[list[dict], bool]:
+        pass
+
+    def stream_rows(
+            self, params: OrderExportParams, batch_size: int = 1000
+    ) -> AsyncIterator[list[dict]]:
+        pass
+
     async def get_all_user(self, user_id: int) -> list[Order]:
         pass
 
     async def get_purchases_user(self, user_id: int) -> list[Order]:
         pass
 
-    async def get_cart(self, user_id: int) -> Order | None:
+    async def get_cart(self, user_id: int, lock: bool = False) -> Order | None:
         pass
 
-    async def get_analytics_orders(self) -> OrdersAnalytics:
+    async def save_cart(self, user_id: int, cart: Cart) -> Order | None:
         pass
 
     async def get(self, id: int, user_id: int | None) -> Order:
@@ -70,7 +87,7 @@ class OrderRepository(IOrderRepository):
 
         await self.session.flush()
 
-        await self._update_products(obj, order_data.order_products)
+        await self._update_products(obj, _quantities(order_data.order_products))
 
         stmt = (
             select(Order)
@@ -108,7 +125,9 @@ class OrderRepository(IOrderRepository):
             await self.check_promo(order_obj, order_data)
 
         if order_data.order_products is not None:
-            await self._update_products(order_obj, order_data.order_products)
+            await self._update_products(
+                order_obj, _quantities(order_data.order_products)
+            )
 
         for name, value in order_data.model_dump(
                 exclude_none=True, exclude={"order_products"}
@@ -183,6 +202,74 @@ class OrderRepository(IOrderRepository):
         result = result.scalars().unique().all()
         return result
 
+    async def get_page(
+            self, filters: OrderFilterParams, after: dict | None = None
+    ) -> tuple[list[Order], bool]:
+        # Lines come from a separate IN query, so LIMIT counts orders.
+        stmt = (
+            self._page_query(select(Order), filters, after)
+            .options(selectinload(Order.order_products))
+        )
+        orders = list((await self.session.execute(stmt)).scalars().all())
+
+        has_more = len(orders) > filters.limit
+        return orders[: filters.limit], has_more
+
+    async def get_summaries_page(
+            self, filters: OrderFilterParams, after: dict | None = None
+    ) -> tuple[list[dict], bool]:
+        stmt = self._page_query(select(*_summary_columns()), filters, after)
+        rows = list((await self.session.execute(stmt)).mappings().all())
+
+        has_more = len(rows) > filters.limit
+        return rows[: filters.limit], has_more
+
+    @staticmethod
+    def _page_query(
+            stmt: Select, filters: OrderFilterParams, after: dict | None
+    ) -> Select:
+        """Newest first, seeking past ``after`` by (created_at, id)."""
+        conditions = []
+        if filters.status is not None:
+            conditions.append(Order.status == filters.status)
+        if filters.user_id is not None:
+            conditions.append(Order.user_id == filters.user_id)
+        conditions.extend(_created_between(filters.date_from, filters.date_to))
+        if filters.min_amount is not None:
+            conditions.append(Order.amount >= filters.min_amount)
+        if filters.max_amount is not None:
+            conditions.append(Order.amount <= filters.max_amount)
+        if after is not None:
+            conditions.append(
+                tuple_(Order.created_at, Order.id)
+                < tuple_(after["created_at"], after["id"])
+            )
+
+        stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc())
+        if conditions:
+            stmt = stmt.where(*conditions)
+        return stmt.limit(filters.limit + 1)
+
+    async def stream_rows(
+            self, params: OrderExportParams, batch_size: int = 1000
+    ) -> AsyncIterator[list[dict]]:
+        """Yield order headers by id, ``batch_size`` rows at a time."""
+        conditions = list(_created_between(params.date_from, params.date_to))
+        if params.status is not None:
+            conditions.append(Order.status == params.status)
+        if params.after_id is not None:
+            conditions.append(Order.id > params.after_id)
+
+        stmt = (
+            select(*_summary_columns())
+            .where(*conditions)
+            .order_by(Order.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
     async def get_all_user(self, user_id: int) -> list[Order]:
         stmt = (
             select(Order)
@@ -206,42 +293,34 @@ class OrderRepository(IOrderRepository):
         result = await self.session.execute(stmt)
         return result.scalars().unique().all()
 
-    async def get_cart(self, user_id: int) -> Order | None:
+    async def get_cart(self, user_id: int, lock: bool = False) -> Order | None:
         stmt = (
             select(Order)
             .where(Order.user_id == user_id, Order.status == OrderStatus.IN_CART)
             .order_by(Order.created_at.desc())
             .options(joinedload(Order.order_products))
         )
+        if lock:
+            stmt = stmt.with_for_update(of=Order)
         result = await self.session.execute(stmt)
         return result.scalars().unique().first()
 
-    async def get_analytics_orders(self) -> OrdersAnalytics:
-        today = datetime.datetime.today()
-        day_1 = datetime.datetime.combine(today - datetime.timedelta(days=1), datetime.time.min)
-        day_7 = datetime.datetime.combine(today - datetime.timedelta(days=7), datetime.time.min)
-        day_30 = datetime.datetime.combine(today - datetime.timedelta(days=30), datetime.time.min)
-
-        stmt = (
-            select(
-                func.count(Order.id).label("count_orders"),
-
-                func.count(Order.id).filter(Order.created_at >= day_1).label("count_1_days_orders"),
-                func.count(Order.id).filter(Order.created_at >= day_7).label("count_7_days_orders"),
-                func.count(Order.id).filter(Order.created_at >= day_30).label("count_30_days_orders"),
+    async def save_cart(self, user_id: int, cart: Cart) -> Order | None:
+        """Copy a Redis cart onto its order while that is still IN_CART.
 
-                func.sum(Order.amount).label("amount_for_all_orders"),
+        The order row is locked, so a checkout running at the same time
+        either waits for this copy or makes it skip the order.
+        """
+        order = await self.get_cart(user_id, lock=True)
+        if order is None or order.id != cart.order_id:
+            return None
 
-                func.sum(Order.amount).filter(Order.created_at >= day_1).label("amount_for_1_days_orders"),
-                func.sum(Order.amount).filter(Order.created_at >= day_7).label("amount_for_7_days_orders"),
-                func.sum(Order.amount).filter(Order.created_at >= day_30).label("amount_for_30_days_orders"),
-
-            )
-        )
-        result1 = await self.session.execute(stmt)
-        result1 = result1.mappings().one()
-
-        return OrdersAnalytics(**result1)
+        await self._update_products(order, cart.items)
+        if cart.address is not None:
+            for name, value in cart.address.model_dump().items():
+                setattr(order, name, value)
+            await self.session.flush()
+        return order
 
     async def delete(self, id: int) -> None:
         order = await self.get(id)
@@ -270,40 +349,113 @@ class OrderRepository(IOrderRepository):
         return result.scalars().all()
 
     async def _update_products(
-            self, order: Order, order_products: list[CartItem]
+            self, order: Order, quantities: dict[int, int]
     ) -> Order:
-        await self.clear_order_products(order.id)
-
-        if not order_products:
-            order.amount = 0.00
-            await self.session.flush()
-            await self.session.refresh(order)
-            return order
-
-        product_ids = [item.product_id for item in order_products]
-        products = await self.get_products_for_order(product_ids)
-
-        new_order_products = []
-        total_amount = 0.0
-
-        for product in products:
-            quantity = sum(item.quantity for item in order_products if item.product_id == product.id)
-            price = float(product.price)
-            total_amount += quantity * price
-            new_order_products.append(
-                OrderProduct(
-                    order_id=order.id,
-                    product_id=product.id,
-                    quantity=quantity,
-                    price=price,
+        """Make the order lines match ``quantities`` with minimal churn.
+
+        Lines of products no longer in the order are deleted, the rest are
+        upserted in one statement that leaves unchanged rows alone.
+        """
+        prices: dict[int, float] = {}
+        if quantities:
+            stmt = select(Product.id, Product.price).where(
+                Product.id.in_(quantities)
+            )
+            prices = {
+                product_id: float(price)
+                for product_id, price in (await self.session.execute(stmt)).all()
+            }
+        lines = [
+            {
+                "order_id": order.id,
+                "product_id": product_id,
+                "quantity": quantity,
+                "price": prices[product_id],
+            }
+            for product_id, quantity in quantities.items()
+            if product_id in prices
+        ]
+
+        stale = delete(OrderProduct).where(OrderProduct.order_id == order.id)
+        if lines:
+            stale = stale.where(OrderProduct.product_id.not_in(list(prices)))
+        await self.session.execute(stale)
+
+        if lines:
+            upsert = self._insert(OrderProduct).values(lines)
+            changed = (
+                (OrderProduct.quantity != upsert.excluded.quantity)
+                | (OrderProduct.price != upsert.excluded.price)
+            )
+            await self.session.execute(
+                upsert.on_conflict_do_update(
+                    index_elements=["order_id", "product_id"],
+                    set_={
+                        "quantity": upsert.excluded.quantity,
+                        "price": upsert.excluded.price,
+                        "updated_at": func.now(),
+                    },
+                    where=changed,
                 )
             )
 
-        await self.add_order_products(order.id, new_order_products)
-
-        order.amount = round(float(total_amount), 2)
-
+        order.amount = round(
+            sum(line["quantity"] * line["price"] for line in lines), 2
+        )
         await self.session.flush()
-        await self.session.refresh(order)
+        # The statements above bypass the loaded collection.
+        await self.session.refresh(order, ["order_products"])
 
         return order
+
+    def _insert(self, model):
+        if self.session.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(model)
+        return sqlite.insert(model)
+
+
+def _quantities(order_products: list[CartItem]) -> dict[int, int]:
+    quantities: dict[int, int] = {}
+    for item in order_products:
+        quantities[item.product_id] = (
+            quantities.get(item.product_id, 0) + item.quantity
+        )
+    return quantities
+
+
+def _summary_columns() -> tuple:
+    lines = select(OrderProduct).where(OrderProduct.order_id == Order.id)
+    return (
+        Order.id,
+        Order.user_id,
+        Order.status,
+        Order.amount,
+        Order.recipient_name,
+        Order.delivery_city,
+        Order.created_at,
+        Order.updated_at,
+        lines.with_only_columns(func.count())
+        .scalar_subquery().label("lines_count"),
+        lines.with_only_columns(
+            func.coalesce(func.sum(OrderProduct.quantity), 0)
+        ).scalar_subquery().label("items_count"),
+    )
+
+
+def _created_between(
+        date_from: datetime.date | None, date_to: datetime.date | None
+) -> tuple:
+    conditions = ()
+    if date_from is not None:
+        conditions += (
+            Order.created_at >= datetime.datetime.combine(
+                date_from, datetime.time.min
+            ),
+        )
+    if date_to is not None:
+        conditions += (
+            Order.created_at < datetime.datetime.combine(
+                date_to + datetime.timedelta(days=1), datetime.time.min
+            ),
+        )
+    return conditions
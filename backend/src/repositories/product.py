@@ -1,13 +1,17 @@
+from collections.abc import AsyncIterator
 from typing import Protocol
 
-from sqlalchemy import and_, select
+from sqlalchemy import (Integer, and_, column, insert, literal, select,
+                        tuple_, union_all, update, values)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from models import Category, Product, ProductImage
 from schemas.product import (ProductCreate, ProductFilterParams,
-                             ProductResponse, ProductsListResponse,
-                             ProductUpdate)
+                             ProductResponse, ProductSortField,
+                             ProductsListResponse, ProductUpdate,
+                             StockAdjustmentResult)
 
 
 class IProductRepository(Protocol):
@@ -20,6 +24,12 @@ class IProductRepository(Protocol):
         filters: ProductFilterParams,
     ) -> list[ProductsListResponse]: ...
 
+    async def get_page(
+        self,
+        filters: ProductFilterParams,
+        after: dict | None = None,
+    ) -> tuple[list[Product], bool]: ...
+
     async def update(
         self,
         product_id: int,
@@ -34,6 +44,18 @@ class IProductRepository(Protocol):
 
     async def get_products_by_ids(self, product_ids: list[int]) -> list[Product]: ...
 
+    async def get_existing_names(self, names: set[str]) -> set[str]: ...
+
+    async def bulk_create(self, products: list[ProductCreate]) -> int: ...
+
+    def stream_rows(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]: ...
+
+    async def adjust_quantities(
+        self,
+        deltas: dict[int, int],
+        clamp: bool = False,
+    ) -> StockAdjustmentResult: ...
+
 
 class ProductRepository(IProductRepository):
     def __init__(self, session: AsyncSession):
@@ -63,22 +85,7 @@ class ProductRepository(IProductRepository):
         self,
         filters: ProductFilterParams,
     ) -> list[ProductsListResponse]:
-        conditions = []
-
-        if filters.min_price is not None:
-            conditions.append(Product.price >= filters.min_price)
-        if filters.max_price is not None:
-            conditions.append(Product.price <= filters.max_price)
-        if filters.category_id is not None:
-            conditions.append(Product.category_id == filters.category_id)
-        if filters.in_stock is not None:
-            if filters.in_stock:
-                # In stock=true means in_stock=true AND quantity > 0
-                conditions.append(Product.in_stock == True)
-                conditions.append(Product.quantity > 0)
-            else:
-                # In stock=false means in_stock=false OR quantity = 0
-                conditions.append(Product.in_stock == False)
+        conditions = self._filter_conditions(filters)
 
         query = (
             select(Product)
@@ -97,6 +104,43 @@ class ProductRepository(IProductRepository):
         products = result.unique().scalars().all()
         return products
 
+    async def get_page(
+        self,
+        filters: ProductFilterParams,
+        after: dict | None = None,
+    ) -> tuple[list[Product], bool]:
+        conditions = self._filter_conditions(filters)
+
+        if filters.sort_by == ProductSortField.PRICE:
+            order_by = (Product.price, Product.id)
+            if after is not None:
+                conditions.append(
+                    tuple_(Product.price, Product.id)
+                    > tuple_(after["price"], after["id"])
+                )
+        else:
+            order_by = (Product.id,)
+            if after is not None:
+                conditions.append(Product.id > after["id"])
+
+        # Images are loaded with a separate IN query so the page stays one
+        # row per product and seeks by (price, id) without DISTINCT ON.
+        query = (
+            select(Product)
+            .options(joinedload(Product.category), selectinload(Product.images))
+            .order_by(*order_by)
+            .limit(filters.limit + 1)
+        )
+
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        result = await self.session.execute(query)
+        products = list(result.unique().scalars().all())
+
+        has_more = len(products) > filters.limit
+        return products[: filters.limit], has_more
+
     async def update(
         self,
         product_id: int,
@@ -124,6 +168,26 @@ class ProductRepository(IProductRepository):
         await self.session.delete(product)
         return 1
 
+    def _filter_conditions(self, filters: ProductFilterParams) -> list:
+        conditions = []
+
+        if filters.min_price is not None:
+            conditions.append(Product.price >= filters.min_price)
+        if filters.max_price is not None:
+            conditions.append(Product.price <= filters.max_price)
+        if filters.category_id is not None:
+            conditions.append(Product.category_id == filters.category_id)
+        if filters.in_stock is not None:
+            if filters.in_stock:
+                # In stock=true means in_stock=true AND quantity > 0
+                conditions.append(Product.in_stock == True)
+                conditions.append(Product.quantity > 0)
+            else:
+                # In stock=false means in_stock=false OR quantity = 0
+                conditions.append(Product.in_stock == False)
+
+        return conditions
+
     async def _get_product_with_relations(
         self,
         product_id: int,
@@ -152,6 +216,42 @@ class ProductRepository(IProductRepository):
         result = await self.session.execute(query)
         return result.scalar_one_or_none() is not None
 
+    async def get_existing_names(self, names: set[str]) -> set[str]:
+        if not names:
+            return set()
+        query = select(Product.name).where(Product.name.in_(names))
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def bulk_create(self, products: list[ProductCreate]) -> int:
+        """Insert ``products`` as multi-row INSERTs without loading them back."""
+        if not products:
+            return 0
+        await self.session.execute(
+            insert(Product),
+            [product.model_dump() for product in products],
+        )
+        return len(products)
+
+    async def stream_rows(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Yield all products as plain dicts, ``batch_size`` rows at a time."""
+        query = (
+            select(
+                Product.id,
+                Product.name,
+                Product.description,
+                Product.price,
+                Product.in_stock,
+                Product.quantity,
+                Product.category_id,
+            )
+            .order_by(Product.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
     async def _get_product_base(self, product_id: int) -> Product | None:
         query = select(Product).where(Product.id == product_id)
         result = await self.session.execute(query)
@@ -164,6 +264,87 @@ class ProductRepository(IProductRepository):
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def adjust_quantities(
+        self,
+        deltas: dict[int, int],
+        clamp: bool = False,
+    ) -> StockAdjustmentResult:
+        """Apply signed quantity deltas to many products in one statement.
+
+        A product is changed only if its quantity stays non-negative, so
+        concurrent deductions can't oversell. Products that did not fit are
+        reported in ``shortages``; unknown product ids are skipped. With
+        ``clamp`` they are still reported but sold out down to zero, for
+        deductions that can no longer be refused.
+        """
+        deltas = {product_id: delta for product_id, delta in deltas.items() if delta}
+        if not deltas:
+            return StockAdjustmentResult()
+
+        source = self._deltas_source(deltas)
+        new_quantity = Product.quantity + source.c.delta
+        stmt = (
+            update(Product)
+            .where(Product.id == source.c.id, new_quantity >= 0)
+            .values(quantity=new_quantity, in_stock=new_quantity > 0)
+            .returning(Product.id, Product.quantity, Product.in_stock)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+
+        adjusted = {}
+        for product_id, quantity, in_stock in result.all():
+            adjusted[product_id] = quantity
+            self._sync_loaded(product_id, quantity, in_stock)
+
+        shortages = {}
+        missed = [product_id for product_id in deltas if product_id not in adjusted]
+        if missed:
+            query = select(Product.id, Product.quantity).where(Product.id.in_(missed))
+            shortages = dict((await self.session.execute(query)).all())
+
+        if clamp and shortages:
+            await self.session.execute(
+                update(Product)
+                .where(Product.id.in_(shortages))
+                .values(quantity=0, in_stock=False)
+                .execution_options(synchronize_session=False)
+            )
+            for product_id in shortages:
+                adjusted[product_id] = 0
+                self._sync_loaded(product_id, 0, False)
+
+        return StockAdjustmentResult(adjusted=adjusted, shortages=shortages)
+
+    def _sync_loaded(self, product_id: int, quantity: int, in_stock: bool) -> None:
+        # Keep already loaded products in line with the row without
+        # another SELECT or marking them dirty.
+        product = self.session.identity_map.get(
+            self.session.identity_key(Product, product_id)
+        )
+        if product is not None:
+            set_committed_value(product, "quantity", quantity)
+            set_committed_value(product, "in_stock", in_stock)
+
+    def _deltas_source(self, deltas: dict[int, int]):
+        if self.session.get_bind().dialect.name == "postgresql":
+            return values(
+                column("id", Integer),
+                column("delta", Integer),
+                name="deltas",
+            ).data(list(deltas.items()))
+
+        # SQLite has no column aliases for a VALUES list in FROM.
+        return union_all(
+            *(
+                select(
+                    literal(product_id, Integer).label("id"),
+                    literal(delta, Integer).label("delta"),
+                )
+                for product_id, delta in deltas.items()
+            )
+        ).subquery("deltas")
+
     async def _to_product_response(self, product: Product) -> ProductResponse:
         images = getattr(product, "images", []) or []
         images_list = [
@@ -171,6 +352,9 @@ class ProductRepository(IProductRepository):
                 "url": img.url,
                 "order": getattr(img, "order", 0),
                 "is_primary": getattr(img, "is_primary", False),
+                "thumbnail_url": img.variant_url("thumbnail"),
+                "medium_url": img.variant_url("medium"),
+                "variants": img.variants,
             }
             for img in images
         ]
@@ -0,0 +1,302 @@
+import hashlib
+import json
+import logging
+from decimal import Decimal
+from typing import Protocol
+
+from pydantic import BaseModel, TypeAdapter
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+
+from middlewares.metrics import APP_NAME, CACHE_HITS_TOTAL, CACHE_MISSES_TOTAL
+from schemas.product import (ProductFilterParams, ProductResponse,
+                             ProductsListResponse, ProductsPageResponse)
+
+logger = logging.getLogger(__name__)
+
+products_list_adapter = TypeAdapter(list[ProductsListResponse])
+
+
+class IProductCacheRepository(Protocol):
+    async def get_product(self, product_id: int) -> ProductResponse | None: ...
+
+    async def product_version(self, product_id: int) -> int | None: ...
+
+    async def set_product(
+        self,
+        version: int | None,
+        product: ProductResponse,
+    ) -> None: ...
+
+    async def get_many(
+        self,
+        product_ids: list[int],
+    ) -> dict[int, ProductResponse]: ...
+
+    async def products_key(self, filters: ProductFilterParams) -> str | None: ...
+
+    async def products_page_key(
+        self,
+        filters: ProductFilterParams,
+    ) -> str | None: ...
+
+    async def get_products(
+        self,
+        key: str | None,
+    ) -> list[ProductsListResponse] | None: ...
+
+    async def set_products(
+        self,
+        key: str | None,
+        products: list[ProductsListResponse],
+    ) -> None: ...
+
+    async def get_products_page(
+        self,
+        key: str | None,
+    ) -> ProductsPageResponse | None: ...
+
+    async def set_products_page(
+        self,
+        key: str | None,
+        page: ProductsPageResponse,
+    ) -> None: ...
+
+    async def invalidate(self, *product_ids: int) -> None: ...
+
+    async def recently_invalidated(self) -> bool: ...
+
+
+class ProductCacheRepository(IProductCacheRepository):
+    DETAIL_KEY = "products:detail:{product_id}"
+    VERSION_KEY = "products:version:{product_id}"
+    LIST_KEY = "products:{kind}:{generation}:{digest}"
+    GENERATION_KEY = "products:list:generation"
+    INVALIDATED_KEY = "products:invalidated"
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl: int = 300,
+        enabled: bool = True,
+        replica_lag: int = 5,
+    ):
+        self._redis = redis
+        self._ttl = ttl
+        self._enabled = enabled
+        self._replica_lag = replica_lag
+
+    async def get_product(self, product_id: int) -> ProductResponse | None:
+        key = self.DETAIL_KEY.format(product_id=product_id)
+        payload = await self._get("product_detail", key)
+        if payload is None:
+            return None
+        return ProductResponse.model_validate_json(payload)
+
+    async def product_version(self, product_id: int) -> int | None:
+        """Version of a product's cached details.
+
+        Read it before loading the product and pass it to ``set_product``:
+        the product may change and be invalidated while it is loaded, and
+        the row read before that must not be cached.
+        """
+        if not self._enabled:
+            return None
+
+        try:
+            version = await self._redis.get(
+                self.VERSION_KEY.format(product_id=product_id)
+            )
+        except RedisError:
+            logger.warning("Failed to read product cache version", exc_info=True)
+            return None
+        return int(version or 0)
+
+    async def set_product(
+        self,
+        version: int | None,
+        product: ProductResponse,
+    ) -> None:
+        """Cache ``product`` unless it was invalidated since ``version``."""
+        if not self._enabled or version is None:
+            return
+
+        key = self.DETAIL_KEY.format(product_id=product.id)
+        version_key = self.VERSION_KEY.format(product_id=product.id)
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(version_key)
+                if int(await pipe.get(version_key) or 0) != version:
+                    return
+                pipe.multi()
+                pipe.set(key, product.model_dump_json(), ex=self._ttl)
+                await pipe.execute()
+        except WatchError:
+            # Invalidated just now.
+            pass
+        except RedisError:
+            logger.warning("Failed to write %s to cache", key, exc_info=True)
+
+    async def get_many(
+        self,
+        product_ids: list[int],
+    ) -> dict[int, ProductResponse]:
+        """Cached details of whichever of ``product_ids`` are cached."""
+        if not self._enabled or not product_ids:
+            return {}
+
+        try:
+            payloads = await self._redis.mget(
+                [self.DETAIL_KEY.format(product_id=pid) for pid in product_ids]
+            )
+        except RedisError:
+            logger.warning("Failed to read products from cache", exc_info=True)
+            payloads = [None] * len(product_ids)
+
+        products = {}
+        for product_id, payload in zip(product_ids, payloads):
+            if payload is None:
+                CACHE_MISSES_TOTAL.labels(cache="product_detail", app_name=APP_NAME).inc()
+                continue
+            CACHE_HITS_TOTAL.labels(cache="product_detail", app_name=APP_NAME).inc()
+            products[product_id] = ProductResponse.model_validate_json(payload)
+        return products
+
+    async def products_key(self, filters: ProductFilterParams) -> str | None:
+        """Key of a product listing under the current generation.
+
+        Look it up once per request and pass it to both the getter and the
+        setter: were it read again before the setter, an invalidation in
+        between would file the old rows under the new generation.
+        """
+        return await self._list_key("list", filters)
+
+    async def products_page_key(
+        self,
+        filters: ProductFilterParams,
+    ) -> str | None:
+        return await self._list_key("page", filters)
+
+    async def get_products(
+        self,
+        key: str | None,
+    ) -> list[ProductsListResponse] | None:
+        payload = await self._get("product_list", key)
+        if payload is None:
+            return None
+        return products_list_adapter.validate_json(payload)
+
+    async def set_products(
+        self,
+        key: str | None,
+        products: list[ProductsListResponse],
+    ) -> None:
+        await self._set(key, products_list_adapter.dump_json(products))
+
+    async def get_products_page(
+        self,
+        key: str | None,
+    ) -> ProductsPageResponse | None:
+        payload = await self._get("product_page", key)
+        if payload is None:
+            return None
+        return ProductsPageResponse.model_validate_json(payload)
+
+    async def set_products_page(
+        self,
+        key: str | None,
+        page: ProductsPageResponse,
+    ) -> None:
+        await self._set(key, page.model_dump_json())
+
+    async def invalidate(self, *product_ids: int) -> None:
+        """Drop cached details of the given products and every listing.
+
+        Any product change can move it in or out of an arbitrary filtered
+        listing, so listings are dropped at once by bumping the generation
+        that is part of their keys; stale entries expire on their own.
+        Details are versioned too, so a reader that loaded the product
+        before the change cannot cache it afterwards.
+        """
+        if not self._enabled:
+            return
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for product_id in set(product_ids):
+                    # Bump first: a write between the two is then refused.
+                    pipe.incr(self.VERSION_KEY.format(product_id=product_id))
+                    pipe.delete(self.DETAIL_KEY.format(product_id=product_id))
+                pipe.incr(self.GENERATION_KEY)
+                if self._replica_lag > 0:
+                    pipe.set(self.INVALIDATED_KEY, 1, ex=self._replica_lag)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Failed to invalidate product cache", exc_info=True)
+
+    async def recently_invalidated(self) -> bool:
+        """Whether a product changed within the last ``replica_lag`` seconds.
+
+        A read replica may still return the old rows then, and a cache
+        filled from them would serve those until the TTL runs out.
+        """
+        if not self._enabled or self._replica_lag <= 0:
+            return False
+
+        try:
+            return bool(await self._redis.exists(self.INVALIDATED_KEY))
+        except RedisError:
+            logger.warning("Failed to read product cache marker", exc_info=True)
+            return True
+
+    async def _list_key(self, kind: str, filters: ProductFilterParams) -> str | None:
+        if not self._enabled:
+            return None
+
+        try:
+            generation = await self._redis.get(self.GENERATION_KEY)
+        except RedisError:
+            logger.warning("Failed to read product cache generation", exc_info=True)
+            return None
+
+        return self.LIST_KEY.format(
+            kind=kind,
+            generation=int(generation or 0),
+            digest=self._filters_digest(filters),
+        )
+
+    async def _get(self, cache: str, key: str | None) -> bytes | None:
+        if not self._enabled or key is None:
+            return None
+
+        try:
+            payload = await self._redis.get(key)
+        except RedisError:
+            logger.warning("Failed to read %s from cache", key, exc_info=True)
+            payload = None
+
+        if payload is None:
+            CACHE_MISSES_TOTAL.labels(cache=cache, app_name=APP_NAME).inc()
+        else:
+            CACHE_HITS_TOTAL.labels(cache=cache, app_name=APP_NAME).inc()
+        return payload
+
+    async def _set(self, key: str | None, payload: str | bytes) -> None:
+        if not self._enabled or key is None:
+            return
+
+        try:
+            await self._redis.set(key, payload, ex=self._ttl)
+        except RedisError:
+            logger.warning("Failed to write %s to cache", key, exc_info=True)
+
+    @staticmethod
+    def _filters_digest(filters: BaseModel) -> str:
+        normalized = {}
+        for name, value in filters.model_dump().items():
+            if isinstance(value, Decimal):
+                value = format(value.normalize(), "f")
+            normalized[name] = value
+
+        raw = json.dumps(normalized, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
@@ -1,6 +1,6 @@
 from typing import Protocol
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import ProductImage
@@ -13,6 +13,10 @@ class IProductImageRepository(Protocol):
 
     async def delete_by_product_id(self, product_id: int): ...
 
+    async def get_by_id(self, image_id: int) -> ProductImage | None: ...
+
+    async def set_variants(self, image_id: int, variants: dict) -> bool: ...
+
 
 class ProductImageRepository(IProductImageRepository):
     def __init__(self, session: AsyncSession):
@@ -59,6 +63,15 @@ class ProductImageRepository(IProductImageRepository):
         self.session.add(image)
         return image
 
+    async def set_variants(self, image_id: int, variants: dict) -> bool:
+        query = (
+            update(ProductImage)
+            .where(ProductImage.id == image_id)
+            .values(variants=variants)
+        )
+        result = await self.session.execute(query)
+        return result.rowcount > 0
+
     async def delete(self, image_id: int) -> bool:
         image = await self.get_by_id(image_id)
         if not image:
@@ -1,3 +1,6 @@
+import asyncio
+import base64
+import hashlib
 import uuid
 import inspect
 from pathlib import Path
@@ -6,78 +9,247 @@ from typing import Protocol
 from fastapi import UploadFile
 
 from clients.s3_client import S3Client
+from core.exceptions import UploadTooLargeError
 from entrypoint.config import config
+from utils.images import CONTENT_TYPES
+
+
+class UploadBudget:
+    """Byte allowance shared by all uploads of one request."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used = 0
+
+    def consume(self, size: int) -> None:
+        self.used += size
+        if self.used > self.max_bytes:
+            raise UploadTooLargeError(self.max_bytes)
 
 
 class IS3Repository(Protocol):
     async def upload_image(self, file: UploadFile, product_id: int | None = None) -> str: ...
 
+    async def upload_images(
+        self,
+        images: list[UploadFile],
+        product_id: int | None = None,
+    ) -> list[str]: ...
+
+    async def download_image(self, image_url: str) -> bytes: ...
+
+    async def upload_variant(
+        self,
+        source_url: str,
+        size: str,
+        fmt: str,
+        content: bytes,
+    ) -> str: ...
+
     async def delete_image(self, url: str) -> None: ...
 
+    async def delete_images(self, image_urls: list[str]) -> int: ...
+
 
 class S3Repository(IS3Repository):
-    def __init__(self):
-        self.s3_client = S3Client(
+    def __init__(
+        self,
+        s3_client: S3Client | None = None,
+        max_concurrency: int = 4,
+        part_size: int = config.s3.MULTIPART_THRESHOLD,
+        max_request_bytes: int = config.s3.MAX_REQUEST_BYTES,
+    ):
+        self.s3_client = s3_client or S3Client(
             access_key=config.s3.ACCESS_KEY,
             secret_key=config.s3.SECRET_KEY,
             endpoint_url=config.s3.ENDPOINT,
             bucket_name=config.s3.BUCKET_NAME,
         )
+        self.max_concurrency = max_concurrency
+        self.part_size = part_size
+        self.max_request_bytes = max_request_bytes
 
     async def upload_image(
         self,
         image: UploadFile,
         product_id: int | None = None,
+        budget: UploadBudget | None = None,
     ) -> str:
+        """Stream ``image`` to S3 one part at a time.
+
+        Files smaller than ``part_size`` go up in a single PUT, larger ones
+        as a multipart upload, so at most one part is held in memory. Every
+        request carries a SHA-256 checksum that S3 verifies on arrival.
+        """
         file_extention = Path(image.filename).suffix
         folder = str(product_id) if product_id is not None else "unassigned"
         s3_key = f"products/{folder}/{uuid.uuid4()}{file_extention}"
+        budget = budget or UploadBudget(self.max_request_bytes)
 
         async with self.s3_client.get_client() as client:
-            content_reader = getattr(image, "read", None)
-            if content_reader is None:
-                raise ValueError("Uploaded file object does not support read()")
+            chunk = await self._read_chunk(image, budget)
 
-            content = content_reader()
-            if inspect.isawaitable(content):
-                content = await content
+            if len(chunk) < self.part_size:
+                await client.put_object(
+                    Bucket=self.s3_client.bucket_name,
+                    Key=s3_key,
+                    Body=chunk,
+                    ContentType=image.content_type,
+                    ChecksumSHA256=self._checksum(chunk),
+                )
+            else:
+                await self._upload_multipart(client, s3_key, image, chunk, budget)
 
-            await client.put_object(
-                Bucket=self.s3_client.bucket_name,
+        return self._url_for_key(s3_key)
+
+    async def _upload_multipart(
+        self,
+        client,
+        s3_key: str,
+        image: UploadFile,
+        chunk: bytes,
+        budget: UploadBudget,
+    ) -> None:
+        bucket = self.s3_client.bucket_name
+        upload = await client.create_multipart_upload(
+            Bucket=bucket,
+            Key=s3_key,
+            ContentType=image.content_type,
+            ChecksumAlgorithm="SHA256",
+        )
+        upload_id = upload["UploadId"]
+
+        try:
+            parts = []
+            part_number = 1
+            while chunk:
+                checksum = self._checksum(chunk)
+                response = await client.upload_part(
+                    Bucket=bucket,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk,
+                    ChecksumSHA256=checksum,
+                )
+                parts.append(
+                    {
+                        "PartNumber": part_number,
+                        "ETag": response["ETag"],
+                        "ChecksumSHA256": checksum,
+                    }
+                )
+                part_number += 1
+                chunk = await self._read_chunk(image, budget)
+
+            await client.complete_multipart_upload(
+                Bucket=bucket,
                 Key=s3_key,
-                Body=content,
-                ContentType=image.content_type,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await client.abort_multipart_upload(
+                Bucket=bucket,
+                Key=s3_key,
+                UploadId=upload_id,
             )
+            raise
+
+    async def _read_chunk(self, image: UploadFile, budget: UploadBudget) -> bytes:
+        content_reader = getattr(image, "read", None)
+        if content_reader is None:
+            raise ValueError("Uploaded file object does not support read()")
 
-        url = f"{config.s3.PUBLIC_ENDPOINT}/{config.s3.BUCKET_NAME}/{s3_key}"
+        content = content_reader(self.part_size)
+        if inspect.isawaitable(content):
+            content = await content
 
-        return url
+        budget.consume(len(content))
+        return content
+
+    @staticmethod
+    def _checksum(content: bytes) -> str:
+        return base64.b64encode(hashlib.sha256(content).digest()).decode("ascii")
 
     async def upload_images(
         self,
         images: list[UploadFile],
-        product_id: int,
+        product_id: int | None = None,
     ) -> list[str]:
-        urls = []
-        for image in images:
-            image_url = await self.upload_image(
-                image,
-                product_id,
+        """Upload images concurrently, keeping the order of ``images``.
+
+        If any upload fails the ones that succeeded are deleted again and
+        the first error is raised.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        budget = UploadBudget(self.max_request_bytes)
+
+        async def upload(image: UploadFile) -> str:
+            async with semaphore:
+                return await self.upload_image(image, product_id, budget)
+
+        results = await asyncio.gather(
+            *(upload(image) for image in images),
+            return_exceptions=True,
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await self.delete_images(
+                [result for result in results if isinstance(result, str)],
             )
-            urls.append(image_url)
+            raise errors[0]
 
-        return urls
+        return results
+
+    async def download_image(self, image_url: str) -> bytes:
+        async with self.s3_client.get_client() as client:
+            response = await client.get_object(
+                Bucket=self.s3_client.bucket_name,
+                Key=self._key_from_url(image_url),
+            )
+            async with response["Body"] as body:
+                return await body.read()
+
+    async def upload_variant(
+        self,
+        source_url: str,
+        size: str,
+        fmt: str,
+        content: bytes,
+    ) -> str:
+        """Store a derivative next to its original as ``<name>_<size>.<fmt>``."""
+        source_key = self._key_from_url(source_url)
+        s3_key = f"{Path(source_key).with_suffix('')}_{size}.{fmt}"
+
+        async with self.s3_client.get_client() as client:
+            await client.put_object(
+                Bucket=self.s3_client.bucket_name,
+                Key=s3_key,
+                Body=content,
+                ContentType=CONTENT_TYPES[fmt],
+                CacheControl="public, max-age=31536000, immutable",
+                ChecksumSHA256=self._checksum(content),
+            )
+
+        return self._url_for_key(s3_key)
+
+    def _key_from_url(self, image_url: str) -> str:
+        url_parts = image_url.split("/")
+        bucket_index = url_parts.index(self.s3_client.bucket_name)
+        return "/".join(url_parts[(bucket_index + 1) :])
+
+    @staticmethod
+    def _url_for_key(s3_key: str) -> str:
+        return f"{config.s3.PUBLIC_ENDPOINT}/{config.s3.BUCKET_NAME}/{s3_key}"
 
     async def delete_image(
         self,
         image_url: str,
     ) -> bool:
         try:
-            url_parts = image_url.split("/")
-            bucket_index = url_parts.index(self.s3_client.bucket_name)
-            s3_key = "/".join(
-                url_parts[(bucket_index + 1) :],
-            )
+            s3_key = self._key_from_url(image_url)
 
             async with self.s3_client.get_client() as client:
                 await client.delete_object(
@@ -88,8 +260,11 @@ class S3Repository(IS3Repository):
             return False
 
     async def delete_images(self, image_urls: list[str]) -> int:
-        deleted_count = 0
-        for image_url in image_urls:
-            if await self.delete_image(image_url):
-                deleted_count += 1
-        return deleted_count
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def delete(image_url: str) -> bool:
+            async with semaphore:
+                return await self.delete_image(image_url)
+
+        results = await asyncio.gather(*(delete(url) for url in image_urls))
+        return sum(1 for deleted in results if deleted)
@@ -0,0 +1,68 @@
+import logging
+from typing import Protocol
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from middlewares.metrics import APP_NAME, CACHE_HITS_TOTAL, CACHE_MISSES_TOTAL
+from schemas.user import UserResponse
+
+logger = logging.getLogger(__name__)
+
+
+class IUserCacheRepository(Protocol):
+    async def get_user(self, user_id: int) -> UserResponse | None: ...
+
+    async def set_user(self, user: UserResponse) -> None: ...
+
+    async def invalidate(self, user_id: int) -> None: ...
+
+
+class UserCacheRepository(IUserCacheRepository):
+    """Principals of authenticated users, so auth skips the users table."""
+
+    KEY = "users:principal:{user_id}"
+
+    def __init__(self, redis: Redis, ttl: int = 60, enabled: bool = True):
+        self._redis = redis
+        self._ttl = ttl
+        self._enabled = enabled
+
+    async def get_user(self, user_id: int) -> UserResponse | None:
+        if not self._enabled:
+            return None
+
+        try:
+            payload = await self._redis.get(self.KEY.format(user_id=user_id))
+        except RedisError:
+            logger.warning("Failed to read user %s from cache", user_id, exc_info=True)
+            payload = None
+
+        if payload is None:
+            CACHE_MISSES_TOTAL.labels(cache="user_principal", app_name=APP_NAME).inc()
+            return None
+
+        CACHE_HITS_TOTAL.labels(cache="user_principal", app_name=APP_NAME).inc()
+        return UserResponse.model_validate_json(payload)
+
+    async def set_user(self, user: UserResponse) -> None:
+        if not self._enabled:
+            return
+
+        try:
+            await self._redis.set(
+                self.KEY.format(user_id=user.id),
+                user.model_dump_json(),
+                ex=self._ttl,
+            )
+        except RedisError:
+            logger.warning("Failed to write user %s to cache", user.id, exc_info=True)
+
+    async def invalidate(self, user_id: int) -> None:
+        if not self._enabled:
+            return
+
+        try:
+            await self._redis.delete(self.KEY.format(user_id=user_id))
+        except RedisError:
+            logger.warning("Failed to invalidate user %s in cache", user_id, exc_info=True)
@@ -0,0 +1,119 @@
+import datetime
+from typing import Protocol
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import WebhookEvent
+from schemas.webhook import WebhookEventCreate
+
+
+class IWebhookEventRepository(Protocol):
+    async def add(self, event: WebhookEventCreate) -> bool: ...
+
+    async def get_pending(
+        self, provider: str, object_id: str
+    ) -> list[WebhookEvent]: ...
+
+    async def get_stale_object_ids(
+        self, provider: str, older_than: datetime.timedelta, limit: int
+    ) -> list[str]: ...
+
+    async def expire_pending(
+        self, provider: str, object_id: str, older_than: datetime.timedelta
+    ) -> int: ...
+
+    async def mark_processed(self, event_ids: list[int]) -> None: ...
+
+
+class WebhookEventRepository(IWebhookEventRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, event: WebhookEventCreate) -> bool:
+        """Store ``event`` unless it was received before.
+
+        Returns False for a redelivery, so the caller does not act on it
+        twice even when the same event arrives concurrently.
+        """
+        stmt = (
+            self._insert(WebhookEvent)
+            .values(**event.model_dump())
+            .on_conflict_do_nothing(index_elements=["provider", "event_id"])
+            .returning(WebhookEvent.id)
+        )
+        return (await self.session.execute(stmt)).scalar() is not None
+
+    async def get_pending(
+        self, provider: str, object_id: str
+    ) -> list[WebhookEvent]:
+        """Unprocessed events of one object, oldest first, locked."""
+        stmt = (
+            select(WebhookEvent)
+            .where(
+                WebhookEvent.provider == provider,
+                WebhookEvent.object_id == object_id,
+                WebhookEvent.processed_at.is_(None),
+            )
+            .order_by(WebhookEvent.occurred_at, WebhookEvent.id)
+            .with_for_update()
+        )
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def get_stale_object_ids(
+        self, provider: str, older_than: datetime.timedelta, limit: int
+    ) -> list[str]:
+        """Objects whose events are still pending ``older_than`` after receipt."""
+        stmt = (
+            select(WebhookEvent.object_id)
+            .where(
+                WebhookEvent.provider == provider,
+                WebhookEvent.processed_at.is_(None),
+                WebhookEvent.created_at < self._received_before(older_than),
+            )
+            .group_by(WebhookEvent.object_id)
+            .order_by(func.min(WebhookEvent.id))
+            .limit(limit)
+        )
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def expire_pending(
+        self, provider: str, object_id: str, older_than: datetime.timedelta
+    ) -> int:
+        """Give up on events of ``object_id`` pending for over ``older_than``.
+
+        They are marked processed without being applied. Returns how many
+        there were.
+        """
+        result = await self.session.execute(
+            update(WebhookEvent)
+            .where(
+                WebhookEvent.provider == provider,
+                WebhookEvent.object_id == object_id,
+                WebhookEvent.processed_at.is_(None),
+                WebhookEvent.created_at < self._received_before(older_than),
+            )
+            .values(processed_at=func.now())
+        )
+        return result.rowcount
+
+    async def mark_processed(self, event_ids: list[int]) -> None:
+        if not event_ids:
+            return
+        await self.session.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.id.in_(event_ids))
+            .values(processed_at=func.now())
+        )
+
+    def _received_before(self, age: datetime.timedelta):
+        # ``created_at`` is set by the database clock; compare on that one.
+        if self.session.get_bind().dialect.name == "postgresql":
+            return func.now() - age
+        return func.datetime("now", f"{-age.total_seconds():+.0f} seconds")
+
+    def _insert(self, model):
+        if self.session.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(model)
+        return sqlite.insert(model)
@@ -1,21 +1,19 @@
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
 from fastapi import APIRouter, Request
 from fastapi.openapi.models import Response
-from starlette.responses import PlainTextResponse
-
-from core.rate_limiter import RateLimiter, Strategy, rate_limit
 from prometheus_client import (
     Counter,
     Histogram,
     Gauge,
-    generate_latest,
-    CONTENT_TYPE_LATEST,
     CollectorRegistry,
     GCCollector,
     process_collector,
     PLATFORM_COLLECTOR,
-    REGISTRY,
 )
+from starlette.responses import PlainTextResponse
+
+from core.rate_limiter import RateLimiter, Strategy, rate_limit
+from utils.prometheus import render_metrics
 
 
 router = APIRouter(
@@ -35,6 +33,10 @@ async def pong(
 
 
 @router.get("/metrics")
-async def metrics():
-    data = generate_latest(REGISTRY)
-    return PlainTextResponse(content=data, media_type=CONTENT_TYPE_LATEST)
+async def metrics(request: Request):
+    # With several processes this aggregates all of them, whichever worker
+    # answers. Exemplars are only part of the OpenMetrics format, which
+    # Prometheus asks for when exemplar storage is enabled, and only exist
+    # in single-process mode: the multiprocess files do not store them.
+    data, content_type = render_metrics(request.headers.get("accept"))
+    return PlainTextResponse(content=data, media_type=content_type)
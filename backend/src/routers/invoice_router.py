@@ -1,9 +1,15 @@
+import datetime
+
 from dishka.integrations.fastapi import FromDishka, DishkaRoute
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 
-from schemas.invoice import InvoiceCreateRequest, InvoiceResponse, InvoiceUpdateRequest
+from schemas.invoice import (InvoiceCreateRequest, InvoiceExportParams,
+                             InvoiceResponse, InvoiceStatus, InvoiceUpdateRequest)
+from schemas.product import ProductFileFormat
 from schemas.user import UserResponse
 from services.invoice import InvoiceService
+from utils.records import MEDIA_TYPES
 
 router = APIRouter(
     prefix="/invoices",
@@ -26,6 +32,33 @@ async def patch_invoices(invoice_data: InvoiceUpdateRequest,
     return await service.update_invoice(invoice_data, current_user)
 
 
+@router.get("/export")
+async def export_invoices(service: FromDishka[InvoiceService],
+                          current_user: FromDishka[UserResponse],
+                          file_format: ProductFileFormat = Query(
+                              ProductFileFormat.CSV, alias="format"
+                          ),
+                          invoice_status: InvoiceStatus | None = Query(
+                              None, alias="status"
+                          ),
+                          date_from: datetime.date | None = Query(None),
+                          date_to: datetime.date | None = Query(None),
+                          after_id: int | None = Query(None, ge=0)):
+    params = InvoiceExportParams(
+        status=invoice_status,
+        date_from=date_from,
+        date_to=date_to,
+        after_id=after_id,
+    )
+    return StreamingResponse(
+        service.export_invoices(current_user, params, file_format),
+        media_type=MEDIA_TYPES[file_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="invoices.{file_format}"',
+        },
+    )
+
+
 @router.get("/{method}/{uid}", response_model=InvoiceResponse)
 async def get_invoice(method: str,
                       uid: str,
@@ -1,10 +1,19 @@
+import datetime
+
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter
-
-from schemas.order import OrderCreateRequest, OrderUpdateRequest, OrderResponse
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from schemas.analytics import SalesReport
+from schemas.order import (OrderCreateRequest, OrderExportParams,
+                           OrderFilterParams, OrderResponse,
+                           OrdersPageResponse, OrderStatus, OrderUpdateRequest)
+from schemas.product import ProductFileFormat
 from schemas.user import UserResponse
+from services.analytics import AnalyticsService
 from services.order import OrderService
+from utils.records import MEDIA_TYPES
 
 router = APIRouter(prefix="/orders", tags=["Orders"], route_class=DishkaRoute)
 
@@ -39,17 +48,79 @@ async def delete_order(
 @router.get("/analytics")
 async def get_orders_analytics(
         current_user: FromDishka[UserResponse],
-        service: FromDishka[OrderService],
+        service: FromDishka[AnalyticsService],
 ):
     return await service.get_analytics(current_user)
 
 
-@router.get("/all")
+@router.get("/analytics/sales", response_model=SalesReport)
+async def get_sales_report(
+        current_user: FromDishka[UserResponse],
+        service: FromDishka[AnalyticsService],
+        date_from: datetime.date = Query(...),
+        date_to: datetime.date = Query(...),
+):
+    return await service.get_sales_report(current_user, date_from, date_to)
+
+
+@router.get("/all", response_model=OrdersPageResponse)
 async def get_all_orders(
         service: FromDishka[OrderService],
         current_user: FromDishka[UserResponse],
+        cursor: str | None = Query(None, max_length=512),
+        limit: int = Query(50, ge=1, le=200),
+        order_status: OrderStatus | None = Query(None, alias="status"),
+        user_id: int | None = Query(None, gt=0),
+        date_from: datetime.date | None = Query(None),
+        date_to: datetime.date | None = Query(None),
+        min_amount: float | None = Query(None, ge=0),
+        max_amount: float | None = Query(None, ge=0),
+        summary: bool = Query(False),
+):
+    filters = OrderFilterParams(
+        cursor=cursor,
+        limit=limit,
+        status=order_status,
+        user_id=user_id,
+        date_from=date_from,
+        date_to=date_to,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        summary=summary,
+    )
+
+    try:
+        return await service.get_all_orders(current_user, filters)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/export")
+async def export_orders(
+        service: FromDishka[OrderService],
+        current_user: FromDishka[UserResponse],
+        file_format: ProductFileFormat = Query(ProductFileFormat.CSV, alias="format"),
+        order_status: OrderStatus | None = Query(None, alias="status"),
+        date_from: datetime.date | None = Query(None),
+        date_to: datetime.date | None = Query(None),
+        after_id: int | None = Query(None, ge=0),
 ):
-    return await service.get_all_orders(current_user)
+    params = OrderExportParams(
+        status=order_status,
+        date_from=date_from,
+        date_to=date_to,
+        after_id=after_id,
+    )
+    return StreamingResponse(
+        service.export_orders(current_user, params, file_format),
+        media_type=MEDIA_TYPES[file_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="orders.{file_format}"',
+        },
+    )
 
 
 @router.get("/cart")
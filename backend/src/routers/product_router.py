@@ -1,15 +1,21 @@
 from decimal import Decimal
+from pathlib import Path
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
 from fastapi import (APIRouter, File, Form, HTTPException, Query, UploadFile,
                      status)
+from fastapi.responses import StreamingResponse
 
-from core.exceptions import CategoryNotFoundError, ProductNotFoundError
-from schemas.product import (CreateProductRequest, ProductFilterParams,
-                             ProductResponse, ProductsListResponse,
+from core.exceptions import (CategoryNotFoundError, ProductNotFoundError,
+                             UploadTooLargeError)
+from schemas.product import (CreateProductRequest, ProductFileFormat,
+                             ProductFilterParams, ProductImportResult,
+                             ProductResponse, ProductSortField,
+                             ProductsListResponse, ProductsPageResponse,
                              UpdateProductRequest)
 from schemas.user import UserResponse
 from services import ProductService
+from utils.records import MEDIA_TYPES
 
 router = APIRouter(
     prefix="/products",
@@ -17,6 +23,83 @@ router = APIRouter(
     route_class=DishkaRoute,
 )
 
+IMPORT_READ_SIZE = 64 * 1024
+
+
+@router.get("/scroll", response_model=ProductsPageResponse)
+async def get_products_page(
+    service: FromDishka[ProductService],
+    cursor: str | None = Query(None, max_length=512),
+    limit: int = Query(20, ge=1, le=100),
+    sort_by: ProductSortField = Query(ProductSortField.ID),
+    min_price: Decimal | None = Query(None, ge=0),
+    max_price: Decimal | None = Query(None, ge=0),
+    category_id: int | None = Query(None, gt=0),
+    in_stock: bool | None = Query(None),
+):
+    filters = ProductFilterParams(
+        cursor=cursor,
+        limit=limit,
+        sort_by=sort_by,
+        min_price=min_price,
+        max_price=max_price,
+        category_id=category_id,
+        in_stock=in_stock,
+    )
+
+    try:
+        return await service.get_products_page(filters)
+    except (CategoryNotFoundError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/export")
+async def export_products(
+    service: FromDishka[ProductService],
+    current_user: FromDishka[UserResponse],
+    file_format: ProductFileFormat = Query(ProductFileFormat.CSV, alias="format"),
+):
+    return StreamingResponse(
+        service.export_products(current_user, file_format),
+        media_type=MEDIA_TYPES[file_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="products.{file_format}"',
+        },
+    )
+
+
+@router.post("/import", response_model=ProductImportResult)
+async def import_products(
+    service: FromDishka[ProductService],
+    current_user: FromDishka[UserResponse],
+    file: UploadFile = File(...),
+    file_format: ProductFileFormat | None = Query(None, alias="format"),
+):
+    if file_format is None:
+        suffix = Path(file.filename or "").suffix.lstrip(".").lower()
+        try:
+            file_format = ProductFileFormat(suffix)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Pass format=csv or format=ndjson",
+            )
+
+    async def chunks():
+        while chunk := await file.read(IMPORT_READ_SIZE):
+            yield chunk
+
+    try:
+        return await service.import_products(current_user, chunks(), file_format)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
 
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
@@ -67,6 +150,11 @@ async def create_product(
     try:
         request = CreateProductRequest.model_validate_json(product_data)
         return await service.create_product(current_user, request, images)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
     except (CategoryNotFoundError, ValueError) as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -90,6 +178,11 @@ async def update_product(
             request,
             images,
         )
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
     except (ProductNotFoundError, CategoryNotFoundError, ValueError) as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,6 +1,7 @@
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
 from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 
+from core.exceptions import PasswordHasherBusyError
 from core.rate_limiter import RateLimiter, Strategy, rate_limit
 from entrypoint.config import create_config
 from schemas.user import (
@@ -26,6 +27,14 @@ ACCESS_COOKIE_NAME = "access_token"
 REFRESH_COOKIE_NAME = "refresh_token"
 
 
+def _password_hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Service is busy, try again later",
+        headers={"Retry-After": "1"},
+    )
+
+
 def _set_auth_cookies(response: Response, token_pair: TokenPair) -> None:
     response.set_cookie(
         key=ACCESS_COOKIE_NAME,
@@ -62,6 +71,8 @@ async def register(
 ):
     try:
         return await service.register_user(user_data)
+    except PasswordHasherBusyError as e:
+        raise _password_hasher_busy() from e
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -124,8 +135,9 @@ async def resend_otp(
         )
 
 
-@rate_limit(strategy=Strategy.IP, policy="5/m;20/h;50/d")
 @router.post("/login", response_model=AccessToken)
+# Per client IP: users sharing an address behind NAT share these limits.
+@rate_limit(strategy=Strategy.IP, policy="5/m;20/h;50/d")
 async def login(
     request: Request,
     user_data: UserLogin,
@@ -134,6 +146,8 @@ async def login(
 ):
     try:
         return await service.login_user(user_data)
+    except PasswordHasherBusyError as e:
+        raise _password_hasher_busy() from e
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -202,6 +216,8 @@ async def update_profile(
             user_data,
             current_user,
         )
+    except PasswordHasherBusyError as e:
+        raise _password_hasher_busy() from e
     except LookupError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -258,6 +274,8 @@ async def update_user_by_id(
             user_data,
             current_user,
         )
+    except PasswordHasherBusyError as e:
+        raise _password_hasher_busy() from e
     except LookupError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -17,4 +17,4 @@ async def stripe_webhook(
     stripe_signature: str | None = Header(None, alias="Stripe-Signature"),
 ):
     payload = await request.body()
-    return await service.process_stripe_webhook(payload, stripe_signature)
+    return await service.receive_stripe_webhook(payload, stripe_signature)
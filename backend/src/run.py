@@ -7,6 +7,7 @@ from fastapi import FastAPI
 from entrypoint.ioc.registry import get_providers
 from entrypoint.setup import (
     configure_app,
+    configure_logging,
     configure_middlewares,
     create_app,
     create_async_container,
@@ -17,6 +18,7 @@ from routers.root_router import root_router
 def make_app(*di_providers: Provider) -> FastAPI:
     app: FastAPI = create_app()
     logging.basicConfig(level=logging.DEBUG)
+    configure_logging()
     configure_middlewares(app=app)
     configure_app(app=app, root_router=root_router)
 
@@ -0,0 +1,33 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+from schemas.order import OrderStatus
+
+
+class DailySales(BaseModel):
+    day: date
+    status: OrderStatus
+    orders_count: int
+    amount: float
+
+
+class ProductSales(BaseModel):
+    product_id: int
+    category_id: int
+    quantity: int
+    revenue: float
+
+
+class CategorySales(BaseModel):
+    category_id: int
+    quantity: int
+    revenue: float
+
+
+class SalesReport(BaseModel):
+    date_from: date
+    date_to: date
+    days: list[DailySales]
+    categories: list[CategorySales]
+    products: list[ProductSales]
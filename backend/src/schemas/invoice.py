@@ -1,6 +1,6 @@
 from enum import Enum
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel
 
@@ -57,3 +57,11 @@ class InvoiceUpdate(BaseModel):
     amount: float | None = None
     method: Methods | None = None
     status: InvoiceStatus | None = None
+
+
+class InvoiceExportParams(BaseModel):
+    status: InvoiceStatus | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+    # Resume an interrupted export after the last id received.
+    after_id: int | None = None
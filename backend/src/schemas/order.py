@@ -1,3 +1,4 @@
+import datetime
 import enum
 
 from pydantic import BaseModel, Field
@@ -25,6 +26,14 @@ class DeliveryAddress(BaseModel):
     delivery_notes: str | None = Field(None, max_length=1000)
 
 
+class Cart(BaseModel):
+    """Cart of a user as kept in Redis, backed by its IN_CART order."""
+
+    order_id: int
+    items: dict[int, int] = Field(default_factory=dict)
+    address: DeliveryAddress | None = None
+
+
 class OrderCreateRequest(BaseModel):
     order_products: list[CartItem]
     delivery_address: DeliveryAddress | None = None
@@ -76,6 +85,54 @@ class OrderResponse(BaseModel):
     delivery_notes: str | None = None
 
 
+class AdminOrderResponse(OrderResponse):
+    user_id: int
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
+class OrderSummaryResponse(BaseModel):
+    """Order header with line totals, without the lines themselves."""
+
+    id: int
+    user_id: int
+    status: OrderStatus
+    amount: float
+    recipient_name: str | None = None
+    delivery_city: str | None = None
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+    lines_count: int
+    items_count: int
+
+
+class OrderFilterParams(BaseModel):
+    cursor: str | None = Field(None, max_length=512)
+    limit: int = Field(50, ge=1, le=200)
+    status: OrderStatus | None = Field(None)
+    user_id: int | None = Field(None, gt=0)
+    date_from: datetime.date | None = Field(None)
+    date_to: datetime.date | None = Field(None)
+    min_amount: float | None = Field(None, ge=0)
+    max_amount: float | None = Field(None, ge=0)
+    summary: bool = Field(False)
+
+
+class OrdersPageResponse(BaseModel):
+    items: list[AdminOrderResponse | OrderSummaryResponse] = Field(
+        default_factory=list
+    )
+    next_cursor: str | None = Field(None)
+
+
+class OrderExportParams(BaseModel):
+    status: OrderStatus | None = Field(None)
+    date_from: datetime.date | None = Field(None)
+    date_to: datetime.date | None = Field(None)
+    # Resume an interrupted export after the last id received.
+    after_id: int | None = Field(None, ge=0)
+
+
 class OrderProductCreate(BaseModel):
     user_id: int
     order_product: CartItem
@@ -1,3 +1,4 @@
+import enum
 from decimal import Decimal
 
 from pydantic import BaseModel, Field
@@ -24,6 +25,11 @@ class ProductUpdate(BaseModel):
     category_id: int | None = Field(None)
 
 
+class ProductSortField(enum.StrEnum):
+    ID = "id"
+    PRICE = "price"
+
+
 class ProductFilterParams(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(20, ge=1, le=100)
@@ -31,6 +37,32 @@ class ProductFilterParams(BaseModel):
     max_price: Decimal | None = Field(None, ge=0)
     category_id: int | None = Field(None, gt=0)
     in_stock: bool | None = Field(None)
+    cursor: str | None = Field(None, max_length=512)
+    sort_by: ProductSortField = Field(ProductSortField.ID)
+
+
+class StockAdjustmentResult(BaseModel):
+    # product_id -> quantity after the adjustment
+    adjusted: dict[int, int] = Field(default_factory=dict)
+    # product_id -> quantity available when the adjustment did not fit
+    shortages: dict[int, int] = Field(default_factory=dict)
+
+
+class ProductFileFormat(enum.StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ProductImportRowError(BaseModel):
+    line: int = Field(...)
+    error: str = Field(...)
+
+
+class ProductImportResult(BaseModel):
+    created: int = Field(0)
+    failed: int = Field(0)
+    # Only the first errors are listed, ``failed`` has the full count.
+    errors: list[ProductImportRowError] = Field(default_factory=list)
 
 
 class CreateProductRequest(BaseModel):
@@ -74,4 +106,10 @@ class ProductsListResponse(BaseModel):
     category_id: int = Field(...)
 
     main_image_url: str | None = Field(None)
+    main_image_variants: dict[str, dict[str, str]] | None = Field(None)
     category_name: str = Field(...)
+
+
+class ProductsPageResponse(BaseModel):
+    items: list[ProductsListResponse] = Field(default_factory=list)
+    next_cursor: str | None = Field(None)
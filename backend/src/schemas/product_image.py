@@ -9,7 +9,10 @@ class ProductImageBase(BaseModel):
 
 
 class ProductImageResponse(ProductImageBase):
-    pass
+    # Both fall back to ``url`` until the variants have been generated.
+    thumbnail_url: str | None = Field(None)
+    medium_url: str | None = Field(None)
+    variants: dict[str, dict[str, str]] | None = Field(None)
 
 
 class ProductImageCreate(ProductImageBase):
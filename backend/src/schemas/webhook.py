@@ -0,0 +1,12 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class WebhookEventCreate(BaseModel):
+    provider: str
+    event_id: str
+    event_type: str
+    object_id: str
+    occurred_at: datetime.datetime
+    payload: dict
@@ -1,4 +1,5 @@
 __all__ = [
+    "AnalyticsService",
     "ProductService",
     "CategoryService",
     "UserService",
@@ -7,6 +8,7 @@ __all__ = [
     "PromocodeService",
 ]
 
+from services.analytics import AnalyticsService
 from services.category import CategoryService
 from services.invoice import InvoiceService
 from services.order import OrderService
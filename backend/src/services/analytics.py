@@ -0,0 +1,91 @@
+import datetime
+
+from fastapi import HTTPException
+from starlette import status
+
+from core.db_routing import read_replica
+from core.permissions import require_roles
+from core.uow import UnitOfWork
+from models import RoleEnum
+from repositories.analytics import IAnalyticsRepository
+from schemas.analytics import CategorySales, DailySales, SalesReport
+from schemas.order import OrdersAnalytics
+from schemas.user import UserResponse
+
+ANALYTICS_PERIODS = (1, 7, 30)
+
+
+class AnalyticsService:
+    def __init__(
+            self,
+            uow: UnitOfWork,
+            analytics_repository: IAnalyticsRepository,
+    ):
+        self.uow = uow
+        self.analytics = analytics_repository
+
+    @require_roles([RoleEnum.ADMIN])
+    @read_replica
+    async def get_analytics(self, user: UserResponse) -> OrdersAnalytics:
+        today = datetime.date.today()
+        async with self.uow:
+            daily = await self.analytics.get_daily_sales(None, today)
+
+        return summarize_orders(daily, today)
+
+    @require_roles([RoleEnum.ADMIN])
+    @read_replica
+    async def get_sales_report(
+            self,
+            user: UserResponse,
+            date_from: datetime.date,
+            date_to: datetime.date,
+    ) -> SalesReport:
+        if date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="date_from must not be after date_to",
+            )
+
+        async with self.uow:
+            days = await self.analytics.get_daily_sales(date_from, date_to)
+            products = await self.analytics.get_product_sales(date_from, date_to)
+
+        categories: dict[int, CategorySales] = {}
+        for sales in products:
+            category = categories.setdefault(
+                sales.category_id,
+                CategorySales(category_id=sales.category_id, quantity=0, revenue=0.0),
+            )
+            category.quantity += sales.quantity
+            category.revenue += sales.revenue
+
+        return SalesReport(
+            date_from=date_from,
+            date_to=date_to,
+            days=days,
+            categories=sorted(
+                categories.values(), key=lambda c: c.revenue, reverse=True
+            ),
+            products=products,
+        )
+
+
+def summarize_orders(
+        daily: list[DailySales], today: datetime.date
+) -> OrdersAnalytics:
+    """Dashboard totals: all time and the last 1/7/30 days incl. today."""
+    totals = {"count_orders": 0, "amount_for_all_orders": 0.0}
+    for days in ANALYTICS_PERIODS:
+        totals[f"count_{days}_days_orders"] = 0
+        totals[f"amount_for_{days}_days_orders"] = 0.0
+
+    for row in daily:
+        totals["count_orders"] += row.orders_count
+        totals["amount_for_all_orders"] += row.amount
+        for days in ANALYTICS_PERIODS:
+            if row.day >= today - datetime.timedelta(days=days):
+                totals[f"count_{days}_days_orders"] += row.orders_count
+                totals[f"amount_for_{days}_days_orders"] += row.amount
+
+    return OrdersAnalytics(**totals)
@@ -1,3 +1,4 @@
+from core.db_routing import read_replica
 from core.exceptions import (CategoryHasProductsError,
                              CategoryNameNotUniqueError, CategoryNotFoundError)
 from core.permissions import require_roles
@@ -18,6 +19,7 @@ class CategoryService:
         self.uow = uow
         self.categories = category_repository
 
+    @read_replica
     async def get_category(self, category_id: int) -> CategoryResponse:
         category = await self.categories.get_by_id(category_id)
         if not category:
@@ -32,7 +34,7 @@ class CategoryService:
                     (img for img in imgs if img.is_primary),
                     imgs[0],
                 )
-                main_image = primary.url
+                main_image = primary.variant_url("thumbnail")
 
             products_list.append(
                 {
@@ -51,6 +53,7 @@ class CategoryService:
         }
         return CategoryResponse.model_validate(category_dict)
 
+    @read_replica
     async def get_categories(
         self, offset: int = 0, limit: int = 20, in_stock: bool | None = None
     ) -> list[CategoriesListResponse]:
@@ -1,6 +1,10 @@
+import logging
 import uuid
 import stripe
 
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from functools import partial
 from typing import Dict, Callable
 from uuid import UUID
 from starlette import status
@@ -13,7 +17,6 @@ from fastapi import HTTPException
 from models import RoleEnum
 from models.invoices import Invoice
 from models.order import OrderStatus
-from entrypoint.ioc.providers.payment import IPaymentProvider
 from repositories import (
     IInvoiceRepository,
     IOrderRepository,
@@ -22,21 +25,45 @@ from repositories import (
     IOrderRepository, 
     IUserRepository, 
     IProductRepository,
+    IProductCacheRepository,
+    ICartRepository,
+    IWebhookEventRepository,
 )
 from schemas.invoice import (
     InvoiceCreateRequest,
     InvoiceCreate,
+    InvoiceExportParams,
     Methods,
     InvoiceStatus,
     InvoiceUpdate,
     InvoiceResponse, InvoiceUpdateRequest,
 )
 from schemas.order import OrderUpdate
-from schemas.product import ProductUpdate
+from schemas.product import ProductFileFormat
 from schemas.user import UserResponse
+from schemas.webhook import WebhookEventCreate
 from starlette import status
 from entrypoint.config import config as app_config
+from tasks.analytics import queue_rollup_refresh
 from tasks.notify import send_notify_user_to_email, send_notify_admins
+from tasks.webhooks import process_stripe_events
+from utils.records import write_records
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = [
+    "id",
+    "uid",
+    "order_id",
+    "user_id",
+    "method",
+    "status",
+    "amount",
+    "provider_uid",
+    "created_at",
+    "updated_at",
+]
 
 
 class InvoiceService:
@@ -48,6 +75,9 @@ class InvoiceService:
             orders_repository: IOrderRepository,
             users_repository: IUserRepository,
             provider_factories: Dict[Methods, Callable],
+            product_cache: IProductCacheRepository,
+            cart_repository: ICartRepository,
+            webhook_event_repository: IWebhookEventRepository,
     ):
         self.uow = uow
         self.invoices = invoices_repository
@@ -55,6 +85,9 @@ class InvoiceService:
         self.products = products_repository
         self.users = users_repository
         self.provider_factories = provider_factories
+        self.product_cache = product_cache
+        self.carts = cart_repository
+        self.webhook_events = webhook_event_repository
 
         # self.provider: IPaymentProvider = None
 
@@ -78,18 +111,25 @@ class InvoiceService:
             if not order or not order.order_products:
                 return
 
-            for order_product in order.order_products:
-                product = await self.products.get_by_id(order_product.product_id)
-                if product:
-                    new_quantity = product.quantity - order_product.quantity
-                    new_in_stock = new_quantity > 0
-                    await self.products.update(
-                        order_product.product_id,
-                        ProductUpdate(
-                            quantity=new_quantity,
-                            in_stock=new_in_stock,
-                        ),
-                    )
+            quantities = order.product_quantities()
+            # The payment is already taken: sell out what is left rather
+            # than refuse it, and leave the missing units to the admins.
+            result = await self.products.adjust_quantities(
+                {product_id: -quantity for product_id, quantity in quantities.items()},
+                clamp=True,
+            )
+            if result.shortages:
+                logger.warning(
+                    "Order %s oversold, product -> missing units: %s",
+                    order_id,
+                    {
+                        product_id: quantities[product_id] - available
+                        for product_id, available in result.shortages.items()
+                    },
+                )
+            self.uow.after_commit(
+                partial(self.product_cache.invalidate, *quantities)
+            )
 
     async def _restore_product_quantities(self, order_id: int) -> None:
         async with self.uow:
@@ -98,18 +138,11 @@ class InvoiceService:
             if not order or not order.order_products:
                 return
 
-            for order_product in order.order_products:
-                product = await self.products.get_by_id(order_product.product_id)
-                if product:
-                    new_quantity = product.quantity + order_product.quantity
-                    new_in_stock = new_quantity > 0
-                    await self.products.update(
-                        order_product.product_id,
-                        ProductUpdate(
-                            quantity=new_quantity,
-                            in_stock=new_in_stock,
-                        ),
-                    )
+            quantities = order.product_quantities()
+            await self.products.adjust_quantities(quantities)
+            self.uow.after_commit(
+                partial(self.product_cache.invalidate, *quantities)
+            )
 
     @require_roles([RoleEnum.USER])
     async def create_invoice(
@@ -123,7 +156,21 @@ class InvoiceService:
 
         name: str = f"Покупка заказа #{invoice_data.order_id}"
 
+        # The cart is edited in Redis; bring its order up to date first.
+        cart = await self.carts.get(current_user.id)
+        if cart is not None and cart.order_id != invoice_data.order_id:
+            cart = None
+
         async with self.uow:
+            if (
+                cart is not None
+                and await self.orders.save_cart(current_user.id, cart) is None
+            ):
+                # Its order was checked out or deleted meanwhile; a stale
+                # cart would keep offering the order for payment.
+                await self.carts.delete(current_user.id)
+                cart = None
+
             order = await self.orders.get(
                 id=invoice_data.order_id, user_id=current_user.id
             )
@@ -160,6 +207,9 @@ class InvoiceService:
                     status=OrderStatus.WAITING_PAY,
                 )
             )
+        if cart is not None:
+            await self.carts.delete(current_user.id)
+        await queue_rollup_refresh(order.created_at.date())
         return self._to_invoice_response(invoice)
 
     @require_roles([RoleEnum.ADMIN])
@@ -172,8 +222,28 @@ class InvoiceService:
                 **invoice_data.model_dump()
             )
             invoice = await self.invoices.update(invoice_data_update)
+            order = await self.orders.get(id=invoice.order_id)
+        await queue_rollup_refresh(order.created_at.date())
         return invoice
 
+    @require_roles([RoleEnum.ADMIN])
+    def export_invoices(
+            self,
+            current_user: UserResponse,
+            params: InvoiceExportParams,
+            file_format: ProductFileFormat,
+    ) -> AsyncIterator[str]:
+        """Stream matching invoices as CSV or NDJSON, ordered by id.
+
+        Resumable with ``after_id`` the same way as the order export.
+        """
+        return write_records(
+            self.invoices.stream_rows(params, EXPORT_BATCH_SIZE),
+            file_format,
+            EXPORT_FIELDS,
+            header=params.after_id is None,
+        )
+
     @require_roles([RoleEnum.USER])
     async def process_invoice(
             self, uid: str, method: str, current_user: UserResponse
@@ -219,9 +289,18 @@ class InvoiceService:
                         id=order.id, user_id=order.user_id, status=OrderStatus.PAYED
                     )
                 )
+        if is_payed:
+            await queue_rollup_refresh(order.created_at.date())
         return self._to_invoice_response(invoice_entity)
 
-    async def process_stripe_webhook(self, payload: bytes, signature: str | None):
+    async def receive_stripe_webhook(
+            self, payload: bytes, signature: str | None
+    ) -> dict:
+        """Verify and store a Stripe event, leaving the work to a worker.
+
+        Stripe redelivers events and may send the same one concurrently;
+        only the request that stores it first queues processing.
+        """
         if not app_config.stripe.WEBHOOK_SECRET:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -240,53 +319,29 @@ class InvoiceService:
                 detail="Invalid Stripe signature",
             )
 
-        event_type = event.get("type")
-        data = event.get("data", {}).get("object", {})
-
-        if event_type != "checkout.session.completed":
+        event = event.to_dict()
+        if event.get("type") != "checkout.session.completed":
             return {"ok": True}
 
+        data = event.get("data", {}).get("object", {})
         session_id = data.get("id")
-        payment_status = data.get("payment_status")
-
         if not session_id:
             return {"ok": True}
 
         async with self.uow:
-            invoice = await self.invoices.get_by_provider_uid(session_id)
-            if not invoice:
-                return {"ok": True}
-
-            if payment_status == "paid" and invoice.status != InvoiceStatus.payed:
-                await self.invoices.update(
-                    InvoiceUpdate(uid=UUID(invoice.uid), status=InvoiceStatus.payed)
-                )
-
-                order = await self.orders.get(
-                    id=invoice.order_id,
-                    user_id=invoice.user_id,
-                )
-
-                user = await self.users.get(invoice.user_id)
-                if user:
-                    await send_notify_user_to_email.kiq(
-                        user.email,
-                        order.to_entity(),
-                    )
-                await send_notify_admins.kiq(invoice)
-
-                await self.orders.update(
-                    OrderUpdate(
-                        id=order.id,
-                        user_id=order.user_id,
-                        status=OrderStatus.PAYED,
-                    )
-                )
-            elif payment_status != "paid" and invoice.status == InvoiceStatus.created:
-                await self.invoices.update(
-                    InvoiceUpdate(
-                        uid=UUID(invoice.uid), status=InvoiceStatus.processing
-                    )
+            stored = await self.webhook_events.add(
+                WebhookEventCreate(
+                    provider=Methods.STRIPE.value,
+                    event_id=event["id"],
+                    event_type=event["type"],
+                    object_id=session_id,
+                    occurred_at=datetime.fromtimestamp(
+                        event["created"], UTC
+                    ).replace(tzinfo=None),
+                    payload={"payment_status": data.get("payment_status")},
                 )
+            )
 
+        if stored:
+            await process_stripe_events.kiq(session_id)
         return {"ok": True}
@@ -1,20 +1,55 @@
-from core import broker
+import datetime
+import logging
+from collections.abc import AsyncIterator
+from functools import partial
+
+from core.db_routing import read_replica
 from core.exceptions import (OrderNotFoundError,
                              ProductInsufficientStockError)
 from core.permissions import require_roles
 from core.uow import UnitOfWork
 from models import RoleEnum
-from models.order import OrderProduct
+from models.order import Order, OrderProduct
+from repositories.cart import ICartRepository
 from repositories.order import IOrderRepository
 from repositories.product import IProductRepository
+from repositories.product_cache import IProductCacheRepository
 from schemas.order import (
+    Cart,
+    CartItem,
+    DeliveryAddress,
     OrderCreate,
     OrderCreateRequest,
+    OrderExportParams,
+    OrderFilterParams,
     OrderUpdate,
+    OrderResponse,
+    OrdersPageResponse,
+    OrderStatus,
+    OrderSummaryResponse,
     OrderUpdateRequest,
 )
-from schemas.product import ProductUpdate
+from schemas.product import ProductFileFormat, ProductResponse
 from schemas.user import UserResponse
+from tasks.analytics import queue_rollup_refresh
+from utils.cursor import decode_cursor, encode_cursor
+from utils.records import write_records
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = [
+    "id",
+    "user_id",
+    "status",
+    "amount",
+    "recipient_name",
+    "delivery_city",
+    "created_at",
+    "updated_at",
+    "lines_count",
+    "items_count",
+]
 
 
 class OrderService:
@@ -23,10 +58,14 @@ class OrderService:
             uow: UnitOfWork,
             order_repository: IOrderRepository,
             product_repository: IProductRepository,
+            product_cache: IProductCacheRepository,
+            cart_repository: ICartRepository,
     ):
         self.uow = uow
         self.orders = order_repository
         self.products = product_repository
+        self.product_cache = product_cache
+        self.carts = cart_repository
 
     async def _validate_and_prepare_order_products(
             self,
@@ -78,21 +117,28 @@ class OrderService:
             if not order:
                 raise OrderNotFoundError(order_id)
 
-            if not order.order_products:
+            quantities = order.product_quantities()
+            if not quantities:
                 return
 
-            for order_product in order.order_products:
-                product = await self.products.get_by_id(order_product.product_id)
-                if product:
-                    new_quantity = product.quantity - order_product.quantity
-                    new_in_stock = new_quantity > 0
-                    await self.products.update(
-                        order_product.product_id,
-                        ProductUpdate(
-                            quantity=new_quantity,
-                            in_stock=new_in_stock,
-                        ),
-                    )
+            # The payment is already taken: sell out what is left rather
+            # than refuse it, and leave the missing units to the admins.
+            result = await self.products.adjust_quantities(
+                {product_id: -quantity for product_id, quantity in quantities.items()},
+                clamp=True,
+            )
+            if result.shortages:
+                logger.warning(
+                    "Order %s oversold, product -> missing units: %s",
+                    order_id,
+                    {
+                        product_id: quantities[product_id] - available
+                        for product_id, available in result.shortages.items()
+                    },
+                )
+            self.uow.after_commit(
+                partial(self.product_cache.invalidate, *quantities)
+            )
 
     async def restore_product_quantities(self, order_id: int) -> None:
         """
@@ -104,21 +150,14 @@ class OrderService:
             if not order:
                 raise OrderNotFoundError(order_id)
 
-            if not order.order_products:
+            quantities = order.product_quantities()
+            if not quantities:
                 return
 
-            for order_product in order.order_products:
-                product = await self.products.get_by_id(order_product.product_id)
-                if product:
-                    new_quantity = product.quantity + order_product.quantity
-                    new_in_stock = new_quantity > 0
-                    await self.products.update(
-                        order_product.product_id,
-                        ProductUpdate(
-                            quantity=new_quantity,
-                            in_stock=new_in_stock,
-                        ),
-                    )
+            await self.products.adjust_quantities(quantities)
+            self.uow.after_commit(
+                partial(self.product_cache.invalidate, *quantities)
+            )
 
     # @require_roles([RoleEnum.USER])
     async def create_order(self, user: UserResponse, data: OrderCreateRequest):
@@ -161,38 +200,107 @@ class OrderService:
             return order
 
     # @require_roles([RoleEnum.USER])
-    async def get_cart(self, user: UserResponse):
-        async with self.uow:
-            order = await self.orders.get_cart(user.id)
-            if order:
-                return order
-
-            order = await self.orders.add(
-                OrderCreate(user_id=user.id, order_products=[])
-            )
-            return order
+    async def get_cart(self, user: UserResponse) -> OrderResponse:
+        cart = await self._load_cart(user.id)
+        products = await self._product_snapshot(list(cart.items))
+        return self._cart_response(cart, products)
 
     @require_roles([RoleEnum.USER])
-    async def update_cart(self, user: UserResponse, data: OrderCreateRequest):
+    async def update_cart(
+            self, user: UserResponse, data: OrderCreateRequest
+    ) -> OrderResponse:
+        """Edit the cart in Redis only; the order row follows later."""
+        items: dict[int, int] = {}
+        for item in data.order_products:
+            if item.quantity <= 0:
+                raise ValueError("Quantity must be greater than zero")
+            items[item.product_id] = items.get(item.product_id, 0) + item.quantity
+
+        cart = await self._load_cart(user.id)
+        products = await self._product_snapshot(list(items))
+        # Unknown products are dropped, as the order repository does.
+        cart.items = {
+            product_id: quantity
+            for product_id, quantity in items.items()
+            if product_id in products
+        }
+        if data.delivery_address:
+            cart.address = data.delivery_address
+        await self.carts.save(user.id, cart)
+
+        return self._cart_response(cart, products)
+
+    async def _load_cart(self, user_id: int) -> Cart:
+        cart = await self.carts.get(user_id)
+        if cart is not None:
+            return cart
+
         async with self.uow:
-            order = await self.orders.get_cart(user.id)
-            if order:
-                update_dict = {
-                    "id": order.id,
-                    "user_id": user.id,
-                    "order_products": data.order_products,
-                }
-                if data.delivery_address:
-                    update_dict.update(data.delivery_address.model_dump())
-                return await self.orders.update(OrderUpdate(**update_dict))
-
-            return await self.orders.add(
-                OrderCreate(
-                    user_id=user.id,
-                    order_products=data.order_products,
-                    **(data.delivery_address.model_dump() if data.delivery_address else {}),
+            order = await self.orders.get_cart(user_id)
+            if not order:
+                order = await self.orders.add(
+                    OrderCreate(user_id=user_id, order_products=[])
                 )
+
+        address = None
+        if order.recipient_name:
+            address = DeliveryAddress(
+                recipient_name=order.recipient_name,
+                recipient_phone=order.recipient_phone,
+                delivery_address=order.delivery_address,
+                delivery_city=order.delivery_city,
+                delivery_zip=order.delivery_zip,
+                delivery_notes=order.delivery_notes,
             )
+        return await self.carts.seed(
+            user_id,
+            Cart(
+                order_id=order.id,
+                items=order.product_quantities(),
+                address=address,
+            ),
+        )
+
+    async def _product_snapshot(
+            self, product_ids: list[int]
+    ) -> dict[int, ProductResponse]:
+        products = await self.product_cache.get_many(product_ids)
+        for product_id in set(product_ids) - products.keys():
+            version = await self.product_cache.product_version(product_id)
+            product = await self.products.get_by_id(product_id)
+            if product is not None:
+                await self.product_cache.set_product(version, product)
+                products[product_id] = product
+        return products
+
+    async def _drop_cart_of(self, order: Order) -> None:
+        """Drop the user's Redis cart if it still edits deleted ``order``."""
+        cart = await self.carts.get(order.user_id)
+        if cart is not None and cart.order_id == order.id:
+            await self.carts.delete(order.user_id)
+
+    @staticmethod
+    def _cart_response(
+            cart: Cart, products: dict[int, ProductResponse]
+    ) -> OrderResponse:
+        order_products = [
+            CartItem(
+                product_id=product_id,
+                quantity=quantity,
+                price=float(products[product_id].price),
+            )
+            for product_id, quantity in cart.items.items()
+            if product_id in products
+        ]
+        return OrderResponse(
+            id=cart.order_id,
+            order_products=order_products,
+            amount=round(
+                sum(item.quantity * item.price for item in order_products), 2
+            ),
+            status=OrderStatus.IN_CART,
+            **(cart.address.model_dump() if cart.address else {}),
+        )
 
     @require_roles([RoleEnum.ADMIN])
     async def delete_order(self, id: int, user: UserResponse):
@@ -203,6 +311,8 @@ class OrderService:
         async with self.uow:
             await self.restore_product_quantities(id)
             await self.orders.delete(id)
+        await self._drop_cart_of(order)
+        await queue_rollup_refresh(order.created_at.date())
 
     @require_roles([RoleEnum.ADMIN])
     async def cancel_order(self, id: int, user: UserResponse):
@@ -214,17 +324,62 @@ class OrderService:
         async with self.uow:
             await self.restore_product_quantities(id)
             await self.orders.delete(id)
+        await self._drop_cart_of(order)
+        await queue_rollup_refresh(order.created_at.date())
 
     @require_roles([RoleEnum.ADMIN])
-    async def get_all_orders(self, user: UserResponse):
+    @read_replica
+    async def get_all_orders(
+            self, user: UserResponse, filters: OrderFilterParams
+    ) -> OrdersPageResponse:
+        after = None
+        if filters.cursor:
+            after = self._parse_page_cursor(filters.cursor)
+
         async with self.uow:
-            orders = await self.orders.get_all()
-        return orders
+            if filters.summary:
+                rows, has_more = await self.orders.get_summaries_page(
+                    filters, after
+                )
+                items = [OrderSummaryResponse(**row) for row in rows]
+            else:
+                orders, has_more = await self.orders.get_page(filters, after)
+                items = [order.to_admin_entity() for order in orders]
+
+        next_cursor = None
+        if has_more and items:
+            next_cursor = encode_cursor(
+                {"created_at": items[-1].created_at.isoformat(), "id": items[-1].id}
+            )
+        return OrdersPageResponse(items=items, next_cursor=next_cursor)
 
-    @broker.task("orders-analytics")
     @require_roles([RoleEnum.ADMIN])
-    async def get_analytics(self, user: UserResponse):
-        async with self.uow:
-            orders_analytics = await self.orders.get_analytics_orders()
+    def export_orders(
+            self,
+            user: UserResponse,
+            params: OrderExportParams,
+            file_format: ProductFileFormat,
+    ) -> AsyncIterator[str]:
+        """Stream matching orders as CSV or NDJSON, ordered by id.
+
+        An interrupted download is resumed by passing the last id received
+        as ``after_id``; the CSV header is only written on a fresh export
+        so the output can be appended to what was already saved.
+        """
+        return write_records(
+            self.orders.stream_rows(params, EXPORT_BATCH_SIZE),
+            file_format,
+            EXPORT_FIELDS,
+            header=params.after_id is None,
+        )
 
-        return orders_analytics
+    @staticmethod
+    def _parse_page_cursor(cursor: str) -> dict:
+        values = decode_cursor(cursor)
+        try:
+            return {
+                "created_at": datetime.datetime.fromisoformat(values["created_at"]),
+                "id": int(values["id"]),
+            }
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError("Invalid cursor") from err
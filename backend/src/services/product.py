@@ -1,17 +1,46 @@
+import logging
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import AbstractContextManager, nullcontext
+from decimal import Decimal, InvalidOperation
+
 from fastapi import HTTPException, UploadFile, status
+from pydantic import ValidationError
 
 from core.exceptions import (CategoryNotFoundError, ProductNameNotUniqueError,
                              ProductNotFoundError)
+from core.db_routing import read_primary, read_replica
 from core.permissions import require_roles
 from core.uow import UnitOfWork
-from models import RoleEnum
-from repositories import (ICategoryRepository, IProductImageRepository,
-                          IProductRepository, IS3Repository)
+from models import ProductImage, RoleEnum
+from repositories import (ICategoryRepository, IProductCacheRepository,
+                          IProductImageRepository, IProductRepository,
+                          IS3Repository)
 from schemas.product import (CreateProductRequest, ProductCreate,
-                             ProductFilterParams, ProductResponse,
-                             ProductsListResponse, ProductUpdate,
-                             UpdateProductRequest)
+                             ProductFileFormat, ProductFilterParams,
+                             ProductImportResult, ProductImportRowError,
+                             ProductResponse, ProductSortField,
+                             ProductsListResponse, ProductsPageResponse,
+                             ProductUpdate, UpdateProductRequest)
 from schemas.user import UserResponse
+from tasks.images import generate_image_variants
+from utils.cursor import decode_cursor, encode_cursor
+from utils.records import (RecordFormatError, read_csv, read_ndjson,
+                           write_records)
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_ERRORS = 1000
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = [
+    "id",
+    "name",
+    "description",
+    "price",
+    "in_stock",
+    "quantity",
+    "category_id",
+]
 
 
 class ProductService:
@@ -22,29 +51,81 @@ class ProductService:
         category_repository: ICategoryRepository,
         image_repository: IProductImageRepository,
         s3_repository: IS3Repository,
+        product_cache: IProductCacheRepository,
     ):
         self.uow = uow
         self.products = product_repository
         self.categories = category_repository
         self.images = image_repository
         self.s3 = s3_repository
+        self.cache = product_cache
 
+    @read_replica
     async def get_product(self, product_id: int) -> ProductResponse:
-        product = await self.products.get_by_id(product_id)
+        cached = await self.cache.get_product(product_id)
+        if cached is not None:
+            return cached
+
+        version = await self.cache.product_version(product_id)
+        with await self._cache_fill_reads():
+            product = await self.products.get_by_id(product_id)
         if not product:
             raise ProductNotFoundError(product_id)
+
+        await self.cache.set_product(version, product)
         return product
 
+    @read_replica
     async def get_products(
         self, filters: ProductFilterParams
     ) -> list[ProductsListResponse]:
+        cache_key = await self.cache.products_key(filters)
+        cached = await self.cache.get_products(cache_key)
+        if cached is not None:
+            return cached
+
         if filters.category_id:
             category = await self.categories.get_by_id(filters.category_id)
             if not category:
                 raise CategoryNotFoundError(filters.category_id)
 
-        products = await self.products.get_filtered(filters)
-        return [self._to_products_list_item(product) for product in products]
+        with await self._cache_fill_reads():
+            products = await self.products.get_filtered(filters)
+        result = [self._to_products_list_item(product) for product in products]
+
+        await self.cache.set_products(cache_key, result)
+        return result
+
+    @read_replica
+    async def get_products_page(
+        self, filters: ProductFilterParams
+    ) -> ProductsPageResponse:
+        cache_key = await self.cache.products_page_key(filters)
+        cached = await self.cache.get_products_page(cache_key)
+        if cached is not None:
+            return cached
+
+        if filters.category_id:
+            category = await self.categories.get_by_id(filters.category_id)
+            if not category:
+                raise CategoryNotFoundError(filters.category_id)
+
+        after = None
+        if filters.cursor:
+            after = self._parse_page_cursor(filters.cursor, filters.sort_by)
+
+        with await self._cache_fill_reads():
+            products, has_more = await self.products.get_page(filters, after)
+        items = [self._to_products_list_item(product) for product in products]
+
+        next_cursor = None
+        if has_more and items:
+            next_cursor = self._make_page_cursor(items[-1], filters.sort_by)
+
+        page = ProductsPageResponse(items=items, next_cursor=next_cursor)
+
+        await self.cache.set_products_page(cache_key, page)
+        return page
 
     @require_roles([RoleEnum.ADMIN, RoleEnum.EMPLOYEE])
     async def create_product(
@@ -62,23 +143,21 @@ class ProductService:
         await self._validate_category_exists(request.category_id)
         await self._validate_product_name_unique(request.name)
 
-        async with self.uow:
-            product_data = ProductCreate(**request.model_dump())
-            product = await self.products.create(product_data)
-
-            if images:
-                for i, image_file in enumerate(images):
-                    image_url = await self.s3.upload_image(
-                        image_file,
-                        product.id,
-                    )
-                    await self.images.create_for_product(
-                        product_id=product.id,
-                        url=image_url,
-                        order=i,
-                        is_primary=(i == 0),
-                    )
+        # Uploads run before the transaction so it isn't held open on S3;
+        # the product id isn't known yet, so images go to "unassigned".
+        image_urls = await self.s3.upload_images(images) if images else []
+
+        try:
+            async with self.uow:
+                product_data = ProductCreate(**request.model_dump())
+                product = await self.products.create(product_data)
+                created_images = await self._add_images(product.id, image_urls)
+        except Exception:
+            await self.s3.delete_images(image_urls)
+            raise
 
+        await self.cache.invalidate(product.id)
+        await self._schedule_variants(created_images)
         return product
 
     @require_roles([RoleEnum.ADMIN, RoleEnum.EMPLOYEE])
@@ -102,24 +181,21 @@ class ProductService:
                 request.name, exclude_id=product_id
             )
 
-        async with self.uow:
-            update_data = ProductUpdate(**request.model_dump())
-            product = await self.products.update(product_id, update_data)
-
-            images_to_create = new_images
-            if images_to_create:
-                for i, image_file in enumerate(images_to_create):
-                    image_url = await self.s3.upload_image(
-                        image_file,
-                        product_id,
-                    )
-                    await self.images.create_for_product(
-                        product_id=product_id,
-                        url=image_url,
-                        order=i,
-                        is_primary=(i == 0),
-                    )
+        image_urls = (
+            await self.s3.upload_images(new_images, product_id) if new_images else []
+        )
 
+        try:
+            async with self.uow:
+                update_data = ProductUpdate(**request.model_dump())
+                product = await self.products.update(product_id, update_data)
+                created_images = await self._add_images(product_id, image_urls)
+        except Exception:
+            await self.s3.delete_images(image_urls)
+            raise
+
+        await self.cache.invalidate(product_id)
+        await self._schedule_variants(created_images)
         return product
 
     @require_roles([RoleEnum.ADMIN, RoleEnum.EMPLOYEE])
@@ -133,6 +209,162 @@ class ProductService:
             if not deleted:
                 raise ProductNotFoundError(product_id)
 
+        await self.cache.invalidate(product_id)
+
+    @require_roles([RoleEnum.ADMIN, RoleEnum.EMPLOYEE])
+    async def import_products(
+        self,
+        user: UserResponse,
+        chunks: AsyncIterable[bytes],
+        file_format: ProductFileFormat,
+    ) -> ProductImportResult:
+        return await self.import_products_for_console(chunks, file_format)
+
+    async def import_products_for_console(
+        self,
+        chunks: AsyncIterable[bytes],
+        file_format: ProductFileFormat,
+    ) -> ProductImportResult:
+        """Create products from a CSV or NDJSON stream.
+
+        Rows are validated and inserted in chunks, one transaction per
+        chunk; rows that fail are reported by line and skipped.
+        """
+        reader = read_csv if file_format == ProductFileFormat.CSV else read_ndjson
+        result = ProductImportResult()
+        seen_names: set[str] = set()
+        batch: list[tuple[int, ProductCreate]] = []
+
+        try:
+            async for line, raw in reader(chunks):
+                try:
+                    if isinstance(raw, str):
+                        product = ProductCreate.model_validate_json(raw)
+                    else:
+                        product = ProductCreate.model_validate(raw)
+                except ValidationError as e:
+                    self._add_import_error(result, line, self._format_errors(e))
+                    continue
+
+                batch.append((line, product))
+                if len(batch) >= IMPORT_CHUNK_SIZE:
+                    await self._import_chunk(batch, seen_names, result)
+                    batch = []
+        except RecordFormatError as e:
+            self._add_import_error(result, e.line, str(e))
+
+        if batch:
+            await self._import_chunk(batch, seen_names, result)
+
+        result.errors.sort(key=lambda error: error.line)
+        if result.created:
+            await self.cache.invalidate()
+        return result
+
+    @require_roles([RoleEnum.ADMIN, RoleEnum.EMPLOYEE])
+    def export_products(
+        self,
+        user: UserResponse,
+        file_format: ProductFileFormat,
+    ) -> AsyncIterator[str]:
+        return self.export_products_for_console(file_format)
+
+    def export_products_for_console(
+        self,
+        file_format: ProductFileFormat,
+    ) -> AsyncIterator[str]:
+        """Yield the whole catalogue as CSV or NDJSON text, batch by batch."""
+        return write_records(
+            self.products.stream_rows(EXPORT_BATCH_SIZE),
+            file_format,
+            EXPORT_FIELDS,
+        )
+
+    async def _import_chunk(
+        self,
+        batch: list[tuple[int, ProductCreate]],
+        seen_names: set[str],
+        result: ProductImportResult,
+    ) -> None:
+        category_ids = await self.categories.get_existing_ids(
+            {product.category_id for _, product in batch}
+        )
+        taken_names = await self.products.get_existing_names(
+            {product.name for _, product in batch}
+        )
+
+        valid = []
+        for line, product in batch:
+            if product.category_id not in category_ids:
+                error = CategoryNotFoundError(product.category_id)
+            elif product.name in taken_names or product.name in seen_names:
+                error = ProductNameNotUniqueError(product.name)
+            else:
+                seen_names.add(product.name)
+                valid.append(product)
+                continue
+            self._add_import_error(result, line, str(error))
+
+        if valid:
+            async with self.uow:
+                result.created += await self.products.bulk_create(valid)
+
+    @staticmethod
+    def _add_import_error(
+        result: ProductImportResult, line: int, error: str
+    ) -> None:
+        result.failed += 1
+        if len(result.errors) < IMPORT_MAX_ERRORS:
+            result.errors.append(ProductImportRowError(line=line, error=error))
+
+    @staticmethod
+    def _format_errors(error: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(map(str, item['loc'])) or 'row'}: {item['msg']}"
+            for item in error.errors()
+        )
+
+    async def _add_images(
+        self, product_id: int, image_urls: list[str]
+    ) -> list[ProductImage]:
+        images = [
+            await self.images.create_for_product(
+                product_id=product_id,
+                url=image_url,
+                order=i,
+                is_primary=(i == 0),
+            )
+            for i, image_url in enumerate(image_urls)
+        ]
+        if images:
+            # Ids are needed by the variants task, which runs after commit.
+            await self.uow.session.flush()
+        return images
+
+    async def _schedule_variants(self, images: list[ProductImage]) -> None:
+        # Originals stay usable without variants, so a broker outage must
+        # not fail a product save that has already been committed.
+        for image in images:
+            try:
+                await generate_image_variants.kiq(image.id)
+            except Exception:
+                logger.warning(
+                    "Failed to schedule variants for image %s",
+                    image.id,
+                    exc_info=True,
+                )
+
+    async def _cache_fill_reads(self) -> AbstractContextManager:
+        """Where to read rows that are about to be cached.
+
+        Right after a product change the replica may still return the old
+        rows, which the cache would then serve until its TTL; read those
+        from the primary instead.
+        """
+        if await self.cache.recently_invalidated():
+            return read_primary()
+        return nullcontext()
+
     async def _validate_category_exists(self, category_id: int) -> None:
         category = await self.categories.get_by_id(category_id)
         if not category:
@@ -145,6 +377,34 @@ class ProductService:
         if exists:
             raise ProductNameNotUniqueError(name)
 
+    def _make_page_cursor(
+        self,
+        last: ProductsListResponse,
+        sort_by: ProductSortField,
+    ) -> str:
+        values = {"sort": sort_by.value, "id": last.id}
+        if sort_by == ProductSortField.PRICE:
+            values["price"] = str(last.price)
+        return encode_cursor(values)
+
+    def _parse_page_cursor(
+        self,
+        cursor: str,
+        sort_by: ProductSortField,
+    ) -> dict:
+        values = decode_cursor(cursor)
+        if values.get("sort") != sort_by.value:
+            raise ValueError("Cursor does not match requested sorting")
+
+        try:
+            after = {"id": int(values["id"])}
+            if sort_by == ProductSortField.PRICE:
+                after["price"] = Decimal(values["price"])
+        except (KeyError, TypeError, ValueError, InvalidOperation) as err:
+            raise ValueError("Invalid cursor") from err
+
+        return after
+
     def _to_products_list_item(self, product) -> ProductsListResponse:
         # Repository may return ORM Product instances for list queries.
         if isinstance(product, ProductsListResponse):
@@ -155,7 +415,9 @@ class ProductService:
             (img for img in images if getattr(img, "is_primary", False)),
             images[0] if images else None,
         )
-        main_image_url = getattr(primary_image, "url", None) if primary_image else None
+        main_image_url = (
+            primary_image.variant_url("thumbnail") if primary_image else None
+        )
 
         category = getattr(product, "category", None)
         category_name = getattr(category, "name", "")
@@ -169,5 +431,6 @@ class ProductService:
             quantity=product.quantity,
             category_id=product.category_id,
             main_image_url=main_image_url,
+            main_image_variants=getattr(primary_image, "variants", None),
             category_name=category_name,
         )
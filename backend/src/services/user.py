@@ -2,10 +2,11 @@ import logging
 import re
 
 from core.exceptions import InvoiceNotFoundError
+from core.password_hasher import PasswordHasher
 from core.permissions import require_roles
 from core.uow import UnitOfWork
 from models import RoleEnum
-from repositories import IUserRepository
+from repositories import IUserCacheRepository, IUserRepository
 from schemas.user import (
     AccessToken, 
     OTPCode, 
@@ -20,9 +21,7 @@ from schemas.user import (
 from utils.jwt_utils import (
     create_access_token, 
     create_refresh_token,
-    decode_jwt, 
-    hash_password, 
-    validate_password,
+    decode_jwt,
 )
 from utils.otp_utils import (
     generate_otp_code, 
@@ -37,9 +36,13 @@ class UserService:
         self,
         uow: UnitOfWork,
         user_repository: IUserRepository,
+        password_hasher: PasswordHasher,
+        user_cache: IUserCacheRepository,
     ):
         self.uow = uow
         self.user_repository = user_repository
+        self.password_hasher = password_hasher
+        self.user_cache = user_cache
 
     async def register_user(self, user_data: UserCreate) -> UserResponse:
         self._validate_password(user_data.password, RoleEnum.USER)
@@ -50,8 +53,9 @@ class UserService:
         if existing_user is not None:
             raise ValueError("Email already exists")
 
+        hashed_password = await self.password_hasher.hash(user_data.password)
+
         async with self.uow:
-            hashed_password = hash_password(user_data.password)
             user_create_data = UserCreate(
                 email=user_data.email,
                 username=user_data.username,
@@ -109,7 +113,7 @@ class UserService:
     async def login_user(self, user_data: UserLogin) -> AccessToken:
         user = await self.user_repository.get_user_by_email(user_data.email)
 
-        if not user or not validate_password(
+        if not user or not await self.password_hasher.verify(
             user_data.password,
             user.password,
         ):
@@ -143,7 +147,9 @@ class UserService:
     ) -> UserResponse:
         update_data = user_update.model_dump(exclude_unset=True)
         if "password" in update_data and update_data["password"]:
-            update_data["password"] = hash_password(update_data["password"])
+            update_data["password"] = await self.password_hasher.hash(
+                update_data["password"],
+            )
 
         updated = await self.user_repository.update(
             user_id,
@@ -152,6 +158,8 @@ class UserService:
         if not updated:
             raise LookupError("User not found")
 
+        await self.user_cache.invalidate(user_id)
+
         return UserResponse(
             id=updated.id,
             email=updated.email,
@@ -255,9 +263,9 @@ class UserService:
         if existing_user is not None:
             raise ValueError("User with this email already exists")
 
-        async with self.uow:
-            user_data.password = hash_password(user_data.password)
+        user_data.password = await self.password_hasher.hash(user_data.password)
 
+        async with self.uow:
             user = await self.user_repository.create(user_data)
         return UserResponse(
             id=user.id,
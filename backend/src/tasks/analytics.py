@@ -0,0 +1,70 @@
+import datetime
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import broker
+from core.database import session_factory
+from core.uow import UnitOfWork
+from entrypoint.config import config
+from repositories import AnalyticsRepository
+
+logger = logging.getLogger(__name__)
+
+
+@broker.task(
+    task_name="refresh_sales_rollups",
+    schedule=[{"cron": config.analytics.REFRESH_CRON}],
+)
+async def refresh_sales_rollups(days: int | None = None) -> None:
+    """Rebuild the sales rollups of today and the ``days`` before it."""
+    days = config.analytics.REFRESH_DAYS if days is None else days
+    end = datetime.date.today()
+    start = end - datetime.timedelta(days=days)
+
+    async with session_factory() as session:
+        async with UnitOfWork(session):
+            await AnalyticsRepository(session).refresh_rollups(start, end)
+
+    logger.info("Refreshed sales rollups for %s..%s", start, end)
+
+
+@broker.task(task_name="refresh_sales_rollup_days")
+async def refresh_sales_rollup_days(days: list[str]) -> None:
+    """Rebuild the sales rollups of the given ISO dates."""
+    async with session_factory() as session:
+        async with UnitOfWork(session):
+            await rebuild_rollup_days(
+                session, {datetime.date.fromisoformat(day) for day in days}
+            )
+
+    logger.info("Refreshed sales rollups for %s", ", ".join(sorted(days)))
+
+
+async def rebuild_rollup_days(
+        session: AsyncSession, days: set[datetime.date]
+) -> None:
+    analytics = AnalyticsRepository(session)
+    for day in sorted(days):
+        await analytics.refresh_rollups(day, day)
+
+
+async def queue_rollup_refresh(*days: datetime.date) -> None:
+    """Rebuild the rollups of the days orders whose status changed were
+    created on.
+
+    Call once the change is committed. Rollups group orders by creation
+    day, and a cart can be checked out, or an order cancelled, long after
+    the scheduled job stopped rebuilding that day. Today is aggregated
+    live and left to the schedule.
+    """
+    today = datetime.date.today()
+    past = sorted({day.isoformat() for day in days if day < today})
+    if not past:
+        return
+    try:
+        await refresh_sales_rollup_days.kiq(past)
+    except Exception:
+        logger.warning(
+            "Failed to queue sales rollups refresh for %s", past, exc_info=True
+        )
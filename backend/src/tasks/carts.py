@@ -0,0 +1,49 @@
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from core import broker
+from core.database import session_factory
+from core.uow import UnitOfWork
+from entrypoint.config import config
+from repositories import CartRepository, OrderRepository
+from tasks.shared import worker_redis
+
+logger = logging.getLogger(__name__)
+
+
+@broker.task(
+    task_name="persist_carts",
+    schedule=[{"cron": config.cart.PERSIST_CRON}],
+)
+async def persist_carts() -> int:
+    """Write-behind: copy carts edited since the last run to their orders."""
+    carts = CartRepository(worker_redis(), ttl=config.cart.TTL)
+    user_ids = await carts.pop_dirty(config.cart.PERSIST_BATCH)
+    if not user_ids:
+        return 0
+
+    saved = 0
+    async with session_factory() as session:
+        uow = UnitOfWork(session)
+        for user_id in user_ids:
+            # Read after popping: an edit made meanwhile marks it dirty again.
+            cart = await carts.get(user_id)
+            if cart is None:
+                continue
+            try:
+                async with uow:
+                    order = await OrderRepository(session).save_cart(user_id, cart)
+            except SQLAlchemyError:
+                logger.exception("Failed to persist cart of user %s", user_id)
+                await carts.mark_dirty(user_id)
+                continue
+            if order is None:
+                # Its order was checked out or deleted; the next read
+                # starts a cart from the current IN_CART order.
+                await carts.delete(user_id)
+            else:
+                saved += 1
+
+    logger.info("Persisted %s of %s dirty carts", saved, len(user_ids))
+    return saved
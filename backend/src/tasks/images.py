@@ -0,0 +1,91 @@
+import asyncio
+import logging
+
+from taskiq import TaskiqEvents, TaskiqState
+
+from clients.s3_client import S3Client
+from core import broker
+from core.database import session_factory
+from core.image_processor import ImageProcessor
+from core.uow import UnitOfWork
+from entrypoint.config import config
+from repositories import (ProductCacheRepository, ProductImageRepository,
+                          S3Repository)
+from tasks.shared import worker_redis
+
+logger = logging.getLogger(__name__)
+
+
+@broker.on_event(TaskiqEvents.WORKER_STARTUP)
+async def open_clients(state: TaskiqState) -> None:
+    # Process pool and clients live for the whole worker process and are
+    # shared by every task it runs. The API only imports this module to
+    # enqueue the task, so they are not built on import.
+    state.image_processor = ImageProcessor(
+        sizes=config.images.VARIANT_SIZES,
+        formats=config.images.VARIANT_FORMATS,
+        quality=config.images.QUALITY,
+        workers=config.images.WORKERS,
+    )
+    state.s3_client = S3Client(
+        access_key=config.s3.ACCESS_KEY,
+        secret_key=config.s3.SECRET_KEY,
+        endpoint_url=config.s3.ENDPOINT,
+        bucket_name=config.s3.BUCKET_NAME,
+        max_pool_connections=config.s3.MAX_POOL_CONNECTIONS,
+    )
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def close_clients(state: TaskiqState) -> None:
+    await state.s3_client.close()
+    state.image_processor.shutdown()
+
+
+@broker.task(task_name="generate_image_variants")
+async def generate_image_variants(image_id: int) -> dict | None:
+    async with session_factory() as session:
+        image = await ProductImageRepository(session).get_by_id(image_id)
+    if image is None:
+        logger.warning("Image %s is gone, skipping variants", image_id)
+        return None
+
+    state = broker.state
+    s3 = S3Repository(
+        s3_client=state.s3_client,
+        max_concurrency=config.s3.UPLOAD_CONCURRENCY,
+    )
+    original = await s3.download_image(image.url)
+    rendered = await state.image_processor.render(original)
+
+    uploads = [
+        (size, fmt, s3.upload_variant(image.url, size, fmt, content))
+        for size, encoded in rendered.items()
+        for fmt, content in encoded.items()
+    ]
+    urls = await asyncio.gather(*(upload for _, _, upload in uploads))
+
+    variants: dict[str, dict[str, str]] = {}
+    for (size, fmt, _), url in zip(uploads, urls):
+        variants.setdefault(size, {})[fmt] = url
+
+    async with session_factory() as session:
+        async with UnitOfWork(session):
+            updated = await ProductImageRepository(session).set_variants(
+                image_id, variants
+            )
+    if not updated:
+        # The image was deleted while we were rendering.
+        await s3.delete_images(list(urls))
+        return None
+
+    product_cache = ProductCacheRepository(
+        worker_redis(),
+        ttl=config.cache.PRODUCTS_TTL,
+        enabled=config.cache.ENABLED,
+        replica_lag=config.cache.PRODUCTS_REPLICA_LAG,
+    )
+    await product_cache.invalidate(image.product_id)
+
+    logger.info("Generated %s variants for image %s", len(urls), image_id)
+    return variants
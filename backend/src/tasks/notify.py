@@ -6,7 +6,7 @@ from core import broker
 from entrypoint.config import config
 from schemas.invoice import InvoiceResponse
 from schemas.order import OrderResponse
-from entrypoint.ioc.providers.smtp_provider import SmtpProvider
+from clients.smtp_client import SmtpProvider
 
 bot = aiogram.Bot(config.bot.TOKEN, parse_mode=None)
 logger = logging.getLogger(__name__)
@@ -0,0 +1,23 @@
+from redis.asyncio import Redis
+from taskiq import TaskiqEvents, TaskiqState
+
+from clients import RedisClient
+from core import broker
+from entrypoint.config import config
+
+
+@broker.on_event(TaskiqEvents.WORKER_STARTUP)
+async def open_redis(state: TaskiqState) -> None:
+    # One Redis pool per worker process, shared by every task module. Not
+    # built on import: the API imports task modules to enqueue them and
+    # has a pool of its own.
+    state.redis_client = RedisClient(config)
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def close_redis(state: TaskiqState) -> None:
+    await state.redis_client.close()
+
+
+def worker_redis() -> Redis:
+    return broker.state.redis_client.get_redis()
@@ -0,0 +1,125 @@
+import datetime
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import broker
+from core.database import session_factory
+from core.uow import UnitOfWork
+from entrypoint.config import config
+from repositories import (InvoiceRepository, OrderRepository, UserRepository,
+                          WebhookEventRepository)
+from schemas.invoice import InvoiceResponse, InvoiceStatus, InvoiceUpdate, Methods
+from schemas.order import OrderResponse, OrderStatus, OrderUpdate
+from tasks.analytics import queue_rollup_refresh
+from tasks.notify import send_notify_admins, send_notify_user_to_email
+
+logger = logging.getLogger(__name__)
+
+STRIPE = Methods.STRIPE.value
+
+
+@broker.task(task_name="process_stripe_events")
+async def process_stripe_events(session_id: str) -> int:
+    """Apply the stored events of one Stripe checkout session."""
+    async with session_factory() as session:
+        async with UnitOfWork(session):
+            processed, paid = await apply_stripe_events(session, session_id)
+
+    # Only once the payment is committed.
+    for invoice, order, email, _ in paid:
+        if email:
+            await send_notify_user_to_email.kiq(email, order)
+        await send_notify_admins.kiq(invoice)
+    await queue_rollup_refresh(*(created_on for *_, created_on in paid))
+    return processed
+
+
+@broker.task(
+    task_name="retry_stripe_events",
+    schedule=[{"cron": config.stripe.EVENTS_RETRY_CRON}],
+)
+async def retry_stripe_events() -> int:
+    """Queue sessions whose events were stored but never applied.
+
+    Covers a lost message or a failed run; applying is idempotent, so a
+    session queued twice is harmless.
+    """
+    async with session_factory() as session:
+        session_ids = await WebhookEventRepository(session).get_stale_object_ids(
+            STRIPE,
+            datetime.timedelta(seconds=config.stripe.EVENTS_RETRY_AFTER),
+            config.stripe.EVENTS_RETRY_BATCH,
+        )
+
+    for session_id in session_ids:
+        await process_stripe_events.kiq(session_id)
+    if session_ids:
+        logger.warning("Requeued Stripe events of %s sessions", len(session_ids))
+    return len(session_ids)
+
+
+async def apply_stripe_events(
+        session: AsyncSession, session_id: str
+) -> tuple[
+    int,
+    list[tuple[InvoiceResponse, OrderResponse, str | None, datetime.date]],
+]:
+    """Apply pending events of ``session_id`` oldest first.
+
+    The invoice row stays locked until commit, so workers handling the
+    same invoice take turns and never apply its events out of order.
+    Returns the number of events applied, or given up on, and the invoices
+    that got paid with the day their order was created on.
+    """
+    invoices = InvoiceRepository(session)
+    orders = OrderRepository(session)
+    events = WebhookEventRepository(session)
+
+    invoice = await invoices.get_by_provider_uid(session_id, lock=True)
+    if invoice is None:
+        # Stripe can report a checkout before the invoice holding its id is
+        # committed; leave the events to the retries until they are too old
+        # to belong to a checkout of ours.
+        expired = await events.expire_pending(
+            STRIPE,
+            session_id,
+            datetime.timedelta(seconds=config.stripe.EVENTS_GIVE_UP_AFTER),
+        )
+        if expired:
+            logger.warning(
+                "Dropped %s Stripe events of unknown session %s",
+                expired,
+                session_id,
+            )
+        return expired, []
+
+    pending = await events.get_pending(STRIPE, session_id)
+    paid = []
+    for event in pending:
+        payment_status = event.payload.get("payment_status")
+        if payment_status == "paid" and invoice.status != InvoiceStatus.payed:
+            invoice = await invoices.update(
+                InvoiceUpdate(uid=invoice.uid, status=InvoiceStatus.payed)
+            )
+            order = await orders.update(
+                OrderUpdate(
+                    id=invoice.order_id,
+                    user_id=invoice.user_id,
+                    status=OrderStatus.PAYED,
+                )
+            )
+            user = await UserRepository(session).get(invoice.user_id)
+            paid.append((
+                invoice.to_entity(),
+                order.to_entity(),
+                user.email if user else None,
+                order.created_at.date(),
+            ))
+        elif payment_status != "paid" and invoice.status == InvoiceStatus.created:
+            invoice = await invoices.update(
+                InvoiceUpdate(uid=invoice.uid, status=InvoiceStatus.processing)
+            )
+
+    await events.mark_processed([event.id for event in pending])
+    return len(pending), paid
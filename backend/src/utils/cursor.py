@@ -0,0 +1,21 @@
+import base64
+import json
+
+
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(cursor + padding)
+        values = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as err:
+        raise ValueError("Invalid cursor") from err
+
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+
+    return values
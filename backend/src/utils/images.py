@@ -0,0 +1,59 @@
+from io import BytesIO
+
+from PIL import Image, ImageOps, features
+
+CONTENT_TYPES = {
+    "webp": "image/webp",
+    "avif": "image/avif",
+    "jpeg": "image/jpeg",
+}
+
+
+def supported_formats(formats: list[str]) -> list[str]:
+    """Drop formats this Pillow build cannot encode (AVIF needs libavif)."""
+    return [fmt for fmt in formats if fmt == "jpeg" or features.check(fmt)]
+
+
+def render_variants(
+    content: bytes,
+    sizes: dict[str, int],
+    formats: list[str],
+    quality: int = 80,
+) -> dict[str, dict[str, bytes]]:
+    """Resize ``content`` to every size and encode it in every format.
+
+    Sizes are the longest edge in pixels; images are never upscaled.
+    Returns ``{size_name: {format: encoded_bytes}}``. This is CPU bound and
+    meant to run in a worker process.
+    """
+    with Image.open(BytesIO(content)) as source:
+        # JPEG can decode straight at a reduced scale, which is much cheaper
+        # than decoding full size and shrinking afterwards.
+        largest = max(sizes.values())
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if _has_alpha(image) else "RGB")
+
+    variants = {}
+    for name, edge in sorted(sizes.items(), key=lambda item: -item[1]):
+        resized = image.copy()
+        resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        variants[name] = {
+            fmt: _encode(resized, fmt, quality) for fmt in formats
+        }
+    return variants
+
+
+def _encode(image: Image.Image, fmt: str, quality: int) -> bytes:
+    if fmt == "jpeg" and image.mode == "RGBA":
+        image = image.convert("RGB")
+
+    buffer = BytesIO()
+    image.save(buffer, format=fmt.upper(), quality=quality)
+    return buffer.getvalue()
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
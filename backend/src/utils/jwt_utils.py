@@ -1,14 +1,68 @@
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 
 import bcrypt
 import jwt
+from cryptography.hazmat.primitives.asymmetric.rsa import (RSAPrivateKey,
+                                                           RSAPublicKey)
+from cryptography.hazmat.primitives.serialization import (load_pem_private_key,
+                                                          load_pem_public_key)
 
 from entrypoint.config import config
 
+# Parsed once: PyJWT would otherwise re-read the PEM on every call.
+PRIVATE_KEY: RSAPrivateKey = load_pem_private_key(
+    config.auth_jwt.PRIVATE_KEY.read_bytes(),
+    password=None,
+)
+PUBLIC_KEY: RSAPublicKey = load_pem_public_key(
+    config.auth_jwt.PUBLIC_KEY.read_bytes(),
+)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of tokens already verified against ``PUBLIC_KEY``.
+
+    Entries are dropped once their ``exp`` has passed, so a cached token
+    never outlives what a full verification would allow.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._claims: OrderedDict[str, dict] = OrderedDict()
+
+    def get(self, token: str) -> dict | None:
+        claims = self._claims.get(token)
+        if claims is None:
+            return None
+
+        if claims.get("exp", 0) <= time.time():
+            del self._claims[token]
+            return None
+
+        self._claims.move_to_end(token)
+        return claims
+
+    def set(self, token: str, claims: dict) -> None:
+        if self._maxsize <= 0 or "exp" not in claims:
+            return
+
+        self._claims[token] = claims
+        self._claims.move_to_end(token)
+        if len(self._claims) > self._maxsize:
+            self._claims.popitem(last=False)
+
+    def clear(self) -> None:
+        self._claims.clear()
+
+
+verified_tokens = VerifiedTokenCache(config.auth_jwt.VERIFIED_TOKENS_CACHE_SIZE)
+
 
 def encode_jwt(
     payload: dict,
-    private_key: str = config.auth_jwt.PRIVATE_KEY.read_text(),
+    private_key: str | RSAPrivateKey = PRIVATE_KEY,
     algorithm: str = config.auth_jwt.ALGORITM,
     expire_timedelta: timedelta | None = None,
     expire_minutes: int = None,
@@ -39,14 +93,28 @@ def encode_jwt(
 
 def decode_jwt(
     token: str | bytes,
-    public_key: str = config.auth_jwt.PUBLIC_KEY.read_text(),
+    public_key: str | RSAPublicKey = PUBLIC_KEY,
     algorithm: str = config.auth_jwt.ALGORITM,
 ):
+    # Only tokens checked against the application key are cached.
+    cacheable = (
+        public_key is PUBLIC_KEY
+        and algorithm == config.auth_jwt.ALGORITM
+        and isinstance(token, str)
+    )
+    if cacheable:
+        claims = verified_tokens.get(token)
+        if claims is not None:
+            return dict(claims)
+
     decoded = jwt.decode(
         token,
         public_key,
         algorithms=[algorithm],
     )
+
+    if cacheable:
+        verified_tokens.set(token, dict(decoded))
     return decoded
 
 
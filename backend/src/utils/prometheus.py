@@ -0,0 +1,71 @@
+import os
+import re
+from pathlib import Path
+
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+from prometheus_client.exposition import choose_encoder
+
+# prometheus_client switches to mmap-backed values when this is set before
+# it is first imported, so it has to come from the process environment.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+_PID_SUFFIX = re.compile(r"_(\d+)\.db$")
+
+
+def is_multiprocess() -> bool:
+    return bool(MULTIPROC_DIR)
+
+
+def build_registry(path: str | None = None) -> CollectorRegistry:
+    """Registry to expose: this process alone, or every process' files."""
+    path = path or MULTIPROC_DIR
+    if not path:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=path)
+    return registry
+
+
+def render_metrics(accept: str | None) -> tuple[bytes, str]:
+    """Encode all metrics as text or OpenMetrics, whichever ``accept`` asks for."""
+    encoder, content_type = choose_encoder(accept)
+    return encoder(build_registry()), content_type
+
+
+def mark_process_dead(pid: int | None = None) -> None:
+    """Drop the live gauges of a process that is shutting down."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(pid or os.getpid(), MULTIPROC_DIR)
+
+
+def cleanup_dead_processes(path: str | None = None) -> list[int]:
+    """Delete the metric files of processes that no longer exist.
+
+    Without this every restarted worker leaves its files behind and they
+    are aggregated forever. Totals drop by the dead process' share, which
+    Prometheus treats like any other counter reset. Only valid when the
+    caller shares a PID namespace with the processes writing the files.
+    """
+    directory = Path(path or MULTIPROC_DIR)
+    files_by_pid: dict[int, list[Path]] = {}
+    for file in directory.glob("*.db"):
+        match = _PID_SUFFIX.search(file.name)
+        if match:
+            files_by_pid.setdefault(int(match.group(1)), []).append(file)
+
+    dead = [pid for pid in files_by_pid if not _is_alive(pid)]
+    for pid in dead:
+        for file in files_by_pid[pid]:
+            file.unlink(missing_ok=True)
+    return dead
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
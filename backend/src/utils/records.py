@@ -0,0 +1,117 @@
+import codecs
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+
+
+class RecordFormatError(ValueError):
+    def __init__(self, line: int, message: str):
+        self.line = line
+        super().__init__(message)
+
+
+async def read_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a stream of UTF-8 byte chunks into lines without the newline."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def read_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Yield ``(line_number, raw_json)`` for every non-blank line.
+
+    Lines are not parsed here so a malformed one can be reported against
+    its line number by whoever validates it.
+    """
+    line_number = 0
+    async for line in read_lines(chunks):
+        line_number += 1
+        if line.strip():
+            yield line_number, line
+
+
+async def read_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, dict]]:
+    """Yield ``(line_number, row)`` for every CSV record after the header.
+
+    Quoted fields may span lines; a record is complete once it holds an
+    even number of quote characters. Empty cells are dropped so schema
+    defaults apply.
+    """
+    header = None
+    record: list[str] = []
+    start = line_number = 0
+    async for line in read_lines(chunks):
+        line_number += 1
+        if not record:
+            start = line_number
+        record.append(line)
+        text = "\n".join(record)
+        if text.count('"') % 2:
+            continue
+        record = []
+
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        yield start, {
+            name: value for name, value in zip(header, values) if value != ""
+        }
+
+    if record:
+        raise RecordFormatError(start, "Unterminated quoted field")
+
+
+def write_csv(
+    rows: Iterable[dict],
+    fields: list[str],
+    header: bool = False,
+) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def write_ndjson(rows: Iterable[dict]) -> str:
+    return "".join(
+        json.dumps(row, default=str, ensure_ascii=False) + "\n" for row in rows
+    )
+
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+async def write_records(
+    batches: AsyncIterable[list[dict]],
+    file_format: str,
+    fields: list[str],
+    header: bool = True,
+) -> AsyncIterator[str]:
+    """Render row batches as CSV or NDJSON text, one chunk per batch."""
+    empty = True
+    async for rows in batches:
+        if file_format == "csv":
+            yield write_csv(rows, fields, header=header and empty)
+        else:
+            yield write_ndjson(rows)
+        empty = False
+
+    if empty and header and file_format == "csv":
+        yield write_csv([], fields, header=True)
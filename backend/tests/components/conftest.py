@@ -1,16 +1,22 @@
 
+import datetime
 import pytest
 from decimal import Decimal
+from fakeredis import FakeAsyncRedis
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import RoleEnum
+from models import Base, Order, OrderProduct, RoleEnum
 
-from repositories import OrderRepository, PromocodeRepository
+from repositories import CartRepository, OrderRepository, PromocodeRepository
 from repositories.invoice import InvoiceRepository
 from repositories.user import UserRepository
 from repositories.category import CategoryRepository
 from repositories.product import ProductRepository
-from schemas.user import UserCreate, UserUpdate, UserCreateConsole
+from repositories.product_cache import ProductCacheRepository
+from repositories.user_cache import UserCacheRepository
+from schemas.order import OrderStatus
+from schemas.user import UserCreate, UserUpdate, UserCreateConsole, UserResponse
 from schemas.category import CategoryCreate, CategoryUpdate
 from schemas.product import ProductCreate, ProductUpdate, ProductResponse
 from services.order import OrderService
@@ -23,6 +29,10 @@ async def session(async_session_maker):
         yield session
 
         await session.rollback()
+        # Services commit through the unit of work; start every test empty.
+        for table in reversed(Base.metadata.sorted_tables):
+            await session.execute(delete(table))
+        await session.commit()
 
 
 @pytest.fixture
@@ -55,6 +65,30 @@ async def invoice_repository(session: AsyncSession) -> InvoiceRepository:
     return InvoiceRepository(session=session)
 
 
+@pytest.fixture
+async def redis():
+    client = FakeAsyncRedis()
+    yield client
+
+    await client.flushall()
+    await client.aclose()
+
+
+@pytest.fixture
+async def product_cache(redis) -> ProductCacheRepository:
+    return ProductCacheRepository(redis, ttl=60)
+
+
+@pytest.fixture
+async def cart_repository(redis) -> CartRepository:
+    return CartRepository(redis, ttl=60)
+
+
+@pytest.fixture
+async def user_cache(redis) -> UserCacheRepository:
+    return UserCacheRepository(redis, ttl=60)
+
+
 @pytest.fixture
 async def test_category1():
     return CategoryCreate(name="Category 1")
@@ -120,7 +154,7 @@ def product_update_data():
 @pytest.fixture
 async def created_user(user_repository: UserRepository) -> UserCreate:
     user_data = UserCreate(
-        email=f"test_{id} @test.com",
+        email="testuser@test.com",
         username="testuser",
         password="hashed_password",
         role=RoleEnum.USER,
@@ -177,7 +211,55 @@ async def order_service(
     session: AsyncSession,
     order_repository: OrderRepository,
     product_repository: ProductRepository,
+    product_cache: ProductCacheRepository,
+    cart_repository: CartRepository,
 ) -> OrderService:
     """Create OrderService for testing business logic."""
     uow = UnitOfWork(session)
-    return OrderService(uow, order_repository, product_repository)
+    return OrderService(
+        uow, order_repository, product_repository, product_cache, cart_repository
+    )
+
+
+@pytest.fixture
+def admin_user() -> UserResponse:
+    return UserResponse(
+        id=1, email="admin@test.com", username="admin", role=RoleEnum.ADMIN,
+    )
+
+
+@pytest.fixture
+async def placed_orders(
+    session: AsyncSession,
+    user_repository: UserRepository,
+    created_user,
+    created_product,
+) -> list[Order]:
+    """Five orders one day apart, oldest first; the 1st, 3rd and 5th are
+    paid by a second user, the rest are carts of ``created_user``.
+    """
+    buyer = await user_repository.create(UserCreate(
+        email="buyer@test.com",
+        username="buyer",
+        password="hashed_password",
+        role=RoleEnum.USER,
+    ))
+    start = datetime.datetime(2026, 1, 1, 12)
+    orders = []
+    for number in range(1, 6):
+        paid = number % 2 == 1
+        order = Order(
+            user_id=buyer.id if paid else created_user.id,
+            status=OrderStatus.PAYED if paid else OrderStatus.IN_CART,
+            amount=number * 10.0,
+            created_at=start + datetime.timedelta(days=number),
+            order_products=[
+                OrderProduct(
+                    product_id=created_product.id, quantity=number, price=10.0,
+                ),
+            ],
+        )
+        session.add(order)
+        orders.append(order)
+    await session.commit()
+    return orders
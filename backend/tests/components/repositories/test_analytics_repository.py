@@ -0,0 +1,126 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import delete, select
+
+from models import Order, OrderProduct, ProductSalesRollup, SalesRollup
+from repositories.analytics import AnalyticsRepository
+from schemas.order import OrderStatus
+from schemas.product import ProductCreate
+from services.analytics import summarize_orders
+
+TODAY = datetime.date.today()
+THREE_DAYS_AGO = TODAY - datetime.timedelta(days=3)
+
+
+def at_noon(day: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(day, datetime.time(12))
+
+
+@pytest.fixture
+async def orders(session, created_user, product_repository, test_category_for_products):
+    rose = await product_repository.create(ProductCreate(
+        name="Rose", price=Decimal("10"), in_stock=True,
+        quantity=10, category_id=test_category_for_products.id,
+    ))
+    orders = [
+        Order(
+            user_id=created_user.id, status=status,
+            amount=quantity * 10.0, created_at=at_noon(day),
+            order_products=[
+                OrderProduct(product_id=rose.id, quantity=quantity, price=10.0),
+            ],
+        )
+        for status, day, quantity in (
+            (OrderStatus.PAYED, THREE_DAYS_AGO, 2),
+            (OrderStatus.IN_CART, THREE_DAYS_AGO, 1),
+            (OrderStatus.PAYED, TODAY, 1),
+        )
+    ]
+    session.add_all(orders)
+    await session.commit()
+    return orders
+
+
+@pytest.fixture
+def analytics_repository(session) -> AnalyticsRepository:
+    return AnalyticsRepository(session)
+
+
+class TestAnalyticsRepository:
+    async def test_refresh_rolls_orders_up_per_day_and_status(
+        self, session, analytics_repository, orders
+    ):
+        # Act
+        await analytics_repository.refresh_rollups(THREE_DAYS_AGO, TODAY)
+
+        # Assert
+        rollups = (await session.execute(
+            select(SalesRollup.day, SalesRollup.status,
+                   SalesRollup.orders_count, SalesRollup.amount)
+            .order_by(SalesRollup.day, SalesRollup.status)
+        )).all()
+        assert rollups == [
+            (THREE_DAYS_AGO, OrderStatus.IN_CART, 1, 10.0),
+            (THREE_DAYS_AGO, OrderStatus.PAYED, 1, 20.0),
+            (TODAY, OrderStatus.PAYED, 1, 10.0),
+        ]
+        products = (await session.execute(
+            select(ProductSalesRollup.day, ProductSalesRollup.quantity)
+            .order_by(ProductSalesRollup.day)
+        )).all()
+        assert products == [(THREE_DAYS_AGO, 2), (TODAY, 1)]
+
+    async def test_refresh_drops_rows_of_deleted_orders(
+        self, session, analytics_repository, orders
+    ):
+        # Arrange
+        await analytics_repository.refresh_rollups(THREE_DAYS_AGO, TODAY)
+        await session.execute(delete(Order).where(Order.id == orders[1].id))
+
+        # Act
+        await analytics_repository.refresh_rollups(THREE_DAYS_AGO, THREE_DAYS_AGO)
+
+        # Assert
+        statuses = await session.scalars(select(SalesRollup.status))
+        assert OrderStatus.IN_CART not in statuses.all()
+
+    async def test_past_days_come_from_rollups_and_today_from_orders(
+        self, session, analytics_repository, orders
+    ):
+        # Arrange
+        await analytics_repository.refresh_rollups(THREE_DAYS_AGO, THREE_DAYS_AGO)
+        # Not rolled up yet: past days stay as they were, today is live.
+        await session.execute(delete(Order).where(Order.id == orders[1].id))
+
+        # Act
+        daily = await analytics_repository.get_daily_sales(None, TODAY)
+        products = await analytics_repository.get_product_sales(
+            THREE_DAYS_AGO, TODAY,
+        )
+
+        # Assert
+        assert [(row.day, row.orders_count) for row in daily] == [
+            (THREE_DAYS_AGO, 1),
+            (THREE_DAYS_AGO, 1),
+            (TODAY, 1),
+        ]
+        assert [(p.quantity, p.revenue) for p in products] == [(3, 30.0)]
+
+
+async def test_summary_counts_orders_per_period(analytics_repository, orders):
+    # Arrange
+    await analytics_repository.refresh_rollups(THREE_DAYS_AGO, TODAY)
+
+    # Act
+    analytics = summarize_orders(
+        await analytics_repository.get_daily_sales(None, TODAY), TODAY,
+    )
+
+    # Assert
+    assert analytics.count_orders == 3
+    assert analytics.count_1_days_orders == 1
+    assert analytics.count_7_days_orders == 3
+    assert analytics.amount_for_all_orders == 40.0
+    assert analytics.amount_for_1_days_orders == 10.0
@@ -0,0 +1,73 @@
+from schemas.order import Cart, DeliveryAddress
+
+
+def make_cart(items: dict[int, int] | None = None, order_id: int = 1) -> Cart:
+    return Cart(order_id=order_id, items=items or {})
+
+
+class TestCartRepository:
+    async def test_get_missing_cart(self, cart_repository):
+        # Act
+        result = await cart_repository.get(1)
+
+        # Assert
+        assert result is None
+
+    async def test_save_then_get_cart(self, cart_repository):
+        # Arrange
+        cart = make_cart({3: 2, 5: 1}, order_id=7)
+        cart.address = DeliveryAddress(
+            recipient_name="Анна",
+            recipient_phone="+79991112233",
+            delivery_address="ул. Цветочная, 1",
+            delivery_city="Казань",
+        )
+
+        # Act
+        await cart_repository.save(1, cart)
+
+        # Assert
+        assert await cart_repository.get(1) == cart
+        assert await cart_repository.pop_dirty(10) == [1]
+
+    async def test_save_replaces_removed_items(self, cart_repository):
+        # Arrange
+        await cart_repository.save(1, make_cart({3: 2, 5: 1}))
+
+        # Act
+        await cart_repository.save(1, make_cart({5: 4}))
+
+        # Assert
+        assert (await cart_repository.get(1)).items == {5: 4}
+
+    async def test_seed_keeps_cart_already_in_redis(self, cart_repository):
+        # Arrange
+        edited = make_cart({3: 5})
+        await cart_repository.save(1, edited)
+
+        # Act
+        result = await cart_repository.seed(1, make_cart({3: 1}))
+
+        # Assert
+        assert result == edited
+        assert await cart_repository.get(1) == edited
+
+    async def test_seed_is_not_marked_dirty(self, cart_repository):
+        # Act
+        await cart_repository.seed(1, make_cart({3: 1}))
+
+        # Assert
+        assert await cart_repository.get(1) is not None
+        assert await cart_repository.pop_dirty(10) == []
+
+    async def test_delete_drops_cart_and_dirty_mark(self, cart_repository):
+        # Arrange
+        await cart_repository.save(1, make_cart())
+        await cart_repository.save(2, make_cart(order_id=2))
+
+        # Act
+        await cart_repository.delete(1)
+
+        # Assert
+        assert await cart_repository.get(1) is None
+        assert await cart_repository.pop_dirty(10) == [2]
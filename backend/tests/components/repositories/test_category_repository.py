@@ -31,6 +31,20 @@ class TestCategoryRepository:
         # Assert
         assert exists is True
 
+    async def test_get_existing_ids_returns_only_known(
+        self,
+        category_repository,
+        test_category1,
+    ):
+        # Arrange
+        created = await category_repository.create(test_category1)
+
+        # Act
+        existing = await category_repository.get_existing_ids({created.id, 99999})
+
+        # Assert
+        assert existing == {created.id}
+
     async def test_get_category_by_id_existing(
         self, category_repository, test_category1
     ):
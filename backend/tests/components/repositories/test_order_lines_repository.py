@@ -0,0 +1,99 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from core.uow import UnitOfWork
+from models import OrderProduct
+from schemas.order import CartItem, OrderCreate, OrderUpdate
+from schemas.product import ProductCreate
+
+
+def line(product_id: int, quantity: int) -> CartItem:
+    return CartItem(product_id=product_id, quantity=quantity, price=0)
+
+
+@pytest.fixture
+async def flowers(session, product_repository, test_category_for_products):
+    """Three products priced 10, 5 and 2, returned as their ids."""
+    product_ids = []
+    for price in (10, 5, 2):
+        product = await product_repository.create(ProductCreate(
+            name=f"Flower {price}", price=Decimal(price), in_stock=True,
+            quantity=100, category_id=test_category_for_products.id,
+        ))
+        product_ids.append(product.id)
+    await session.commit()
+    return product_ids
+
+
+async def line_rows(session) -> dict[int, tuple[int, int]]:
+    rows = await session.execute(
+        select(OrderProduct.product_id, OrderProduct.id, OrderProduct.quantity)
+    )
+    return {product_id: (id, quantity) for product_id, id, quantity in rows}
+
+
+class TestOrderLines:
+    async def test_duplicate_lines_are_aggregated(
+        self, session, order_repository, created_user, flowers
+    ):
+        # Arrange
+        first, second, _ = flowers
+
+        # Act
+        async with UnitOfWork(session):
+            order = await order_repository.add(OrderCreate(
+                user_id=created_user.id,
+                order_products=[line(first, 1), line(second, 2), line(first, 2)],
+            ))
+
+        # Assert
+        assert order.product_quantities() == {first: 3, second: 2}
+        assert order.amount == 40.0
+
+    async def test_update_keeps_unchanged_rows_and_drops_removed(
+        self, session, order_repository, created_user, flowers
+    ):
+        # Arrange
+        first, second, third = flowers
+        async with UnitOfWork(session):
+            order = await order_repository.add(OrderCreate(
+                user_id=created_user.id,
+                order_products=[line(first, 1), line(second, 2)],
+            ))
+        before = await line_rows(session)
+
+        # Act
+        async with UnitOfWork(session):
+            order = await order_repository.update(OrderUpdate(
+                id=order.id, user_id=created_user.id,
+                order_products=[line(first, 4), line(third, 1)],
+            ))
+
+        # Assert
+        after = await line_rows(session)
+        assert set(after) == {first, third}
+        assert after[first] == (before[first][0], 4)
+        assert order.product_quantities() == {first: 4, third: 1}
+        assert order.amount == 42.0
+
+    async def test_empty_update_clears_the_order(
+        self, session, order_repository, created_user, flowers
+    ):
+        # Arrange
+        async with UnitOfWork(session):
+            order = await order_repository.add(OrderCreate(
+                user_id=created_user.id, order_products=[line(flowers[0], 1)],
+            ))
+
+        # Act
+        async with UnitOfWork(session):
+            order = await order_repository.update(OrderUpdate(
+                id=order.id, user_id=created_user.id, order_products=[],
+            ))
+
+        # Assert
+        assert await line_rows(session) == {}
+        assert order.order_products == []
+        assert order.amount == 0
@@ -5,7 +5,7 @@ from fastapi import HTTPException
 
 from models import User
 from models.order import OrderStatus
-from schemas.order import CartItem, OrderCreate, OrderUpdate, OrdersAnalytics
+from schemas.order import CartItem, OrderCreate, OrderUpdate
 from schemas.product import ProductFilterParams
 
 
@@ -196,24 +196,3 @@ async def test_delete_order(
         await order_repository.get(order.id, created_user.id)
 
         assert exp.value == f"Order {order.id} not found"
-
-
-@pytest.mark.asyncio
-async def test_orders_analytics(
-        session, created_user, created_product, product_repository, order_repository
-):
-    # Create 3 orders with quantity=1 each (product has quantity=10)
-    for i in range(3):
-        order = await test_add_order_one(
-            session, created_user, created_product, order_repository
-        )
-
-    order_analytics: OrdersAnalytics = await order_repository.get_analytics_orders()
-
-    print(order_analytics)
-
-    assert order_analytics.count_orders == 3
-    assert order_analytics.count_1_days_orders == 3
-    assert order_analytics.count_7_days_orders == 3
-    assert order_analytics.count_30_days_orders == 3
-    assert order_analytics.amount_for_all_orders > 0
@@ -0,0 +1,175 @@
+from decimal import Decimal
+
+from repositories.product_cache import ProductCacheRepository
+from schemas.category import CategoryOneProductResponse
+from schemas.product import (
+    ProductFilterParams,
+    ProductResponse,
+    ProductsListResponse,
+    ProductsPageResponse,
+)
+
+
+def make_product(product_id: int = 1) -> ProductResponse:
+    return ProductResponse(
+        id=product_id,
+        name=f"Product {product_id}",
+        description="Test",
+        price=Decimal("10.50"),
+        in_stock=True,
+        quantity=3,
+        category_id=1,
+        images=[],
+        category=CategoryOneProductResponse(id=1, name="Flowers"),
+    )
+
+
+def make_list_item(product_id: int = 1) -> ProductsListResponse:
+    return ProductsListResponse(
+        id=product_id,
+        name=f"Product {product_id}",
+        price=Decimal("10.50"),
+        in_stock=True,
+        quantity=3,
+        category_id=1,
+        category_name="Flowers",
+    )
+
+
+class TestProductCacheRepository:
+    async def test_get_product_miss(self, product_cache):
+        assert await product_cache.get_product(1) is None
+
+    async def test_set_and_get_product(self, product_cache):
+        # Arrange
+        product = make_product()
+
+        # Act
+        await product_cache.set_product(
+            await product_cache.product_version(product.id), product,
+        )
+        result = await product_cache.get_product(product.id)
+
+        # Assert
+        assert result == product
+
+    async def test_set_and_get_products_normalizes_filters(self, product_cache):
+        # Arrange
+        items = [make_list_item(1), make_list_item(2)]
+        await product_cache.set_products(
+            await product_cache.products_key(
+                ProductFilterParams(min_price=Decimal("10")),
+            ),
+            items,
+        )
+
+        # Act
+        result = await product_cache.get_products(
+            await product_cache.products_key(
+                ProductFilterParams(min_price=Decimal("10.00")),
+            ),
+        )
+        other = await product_cache.get_products(
+            await product_cache.products_key(
+                ProductFilterParams(min_price=Decimal("11")),
+            ),
+        )
+
+        # Assert
+        assert result == items
+        assert other is None
+
+    async def test_set_and_get_products_page(self, product_cache):
+        # Arrange
+        filters = ProductFilterParams(limit=1)
+        page = ProductsPageResponse(items=[make_list_item()], next_cursor="abc")
+
+        key = await product_cache.products_page_key(filters)
+
+        # Act
+        await product_cache.set_products_page(key, page)
+        result = await product_cache.get_products_page(key)
+
+        # Assert
+        assert result == page
+
+    async def test_invalidate_drops_detail_and_listings(self, product_cache):
+        # Arrange
+        filters = ProductFilterParams()
+        await product_cache.set_product(0, make_product(1))
+        await product_cache.set_product(0, make_product(2))
+        await product_cache.set_products(
+            await product_cache.products_key(filters), [make_list_item(1)],
+        )
+
+        # Act
+        await product_cache.invalidate(1)
+
+        # Assert
+        assert await product_cache.get_product(1) is None
+        assert await product_cache.get_product(2) is not None
+        key = await product_cache.products_key(filters)
+        assert await product_cache.get_products(key) is None
+
+    async def test_detail_fill_racing_an_invalidation_is_not_stored(
+        self, product_cache
+    ):
+        # Arrange: a miss read the version and the row, then the product
+        # changed and was invalidated.
+        product = make_product(1)
+        version = await product_cache.product_version(product.id)
+        await product_cache.invalidate(product.id)
+
+        # Act
+        await product_cache.set_product(version, product)
+
+        # Assert
+        assert await product_cache.get_product(product.id) is None
+
+    async def test_fill_racing_an_invalidation_is_not_served(self, product_cache):
+        # Arrange: a miss looked up the key, then a product changed.
+        filters = ProductFilterParams()
+        key = await product_cache.products_key(filters)
+        await product_cache.invalidate(1)
+
+        # Act: the rows read before the change are stored afterwards.
+        await product_cache.set_products(key, [make_list_item(1)])
+
+        # Assert
+        key = await product_cache.products_key(filters)
+        assert await product_cache.get_products(key) is None
+
+    async def test_invalidate_marks_the_replica_lag_window(self, redis):
+        # Arrange
+        cache = ProductCacheRepository(redis, replica_lag=5)
+        before = await cache.recently_invalidated()
+
+        # Act
+        await cache.invalidate(1)
+
+        # Assert
+        assert before is False
+        assert await cache.recently_invalidated() is True
+        assert 0 < await redis.ttl(ProductCacheRepository.INVALIDATED_KEY) <= 5
+
+    async def test_no_replica_lag_window_when_disabled(self, redis):
+        # Arrange
+        cache = ProductCacheRepository(redis, replica_lag=0)
+
+        # Act
+        await cache.invalidate(1)
+
+        # Assert
+        assert await cache.recently_invalidated() is False
+
+    async def test_disabled_cache_never_stores(self, redis):
+        # Arrange
+        cache = ProductCacheRepository(redis, enabled=False)
+        product = make_product()
+
+        # Act
+        await cache.set_product(0, product)
+
+        # Assert
+        assert await cache.get_product(product.id) is None
+        assert await redis.keys("*") == []
@@ -88,3 +88,21 @@ async def test_delete_by_product_id_returns_rowcount(session, created_product):
     count = await repo.delete_by_product_id(created_product.id)
     # should delete two records
     assert count >= 2
+
+
+@pytest.mark.asyncio
+async def test_set_variants_and_variant_url(session, created_product):
+    repo = ProductImageRepository(session=session)
+
+    created = await repo.create_for_product(created_product.id, url="orig.jpg", order=0)
+    await session.flush()
+    assert created.variant_url("thumbnail") == "orig.jpg"
+
+    variants = {"thumbnail": {"webp": "orig_thumbnail.webp"}}
+    assert await repo.set_variants(created.id, variants) is True
+    await session.refresh(created)
+
+    assert created.variants == variants
+    assert created.variant_url("thumbnail") == "orig_thumbnail.webp"
+    assert created.variant_url("medium") == "orig.jpg"
+    assert await repo.set_variants(99999, variants) is False
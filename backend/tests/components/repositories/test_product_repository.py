@@ -5,6 +5,7 @@ import pytest
 from schemas.product import (
     ProductUpdate,
     ProductFilterParams,
+    ProductSortField,
 )
 from schemas.category import CategoryCreate
 from models import Product
@@ -187,6 +188,61 @@ class TestProductRepository:
         result = await product_repository.get_filtered(filters)
         assert len(result) == expected_count
 
+    async def test_get_page_by_id_walks_all_products(
+        self,
+        product_repository,
+        test_product1,
+        test_product2,
+        test_product3,
+    ):
+        # Arrange
+        await product_repository.create(test_product1)
+        await product_repository.create(test_product2)
+        await product_repository.create(test_product3)
+
+        # Act
+        first, first_has_more = await product_repository.get_page(
+            ProductFilterParams(limit=2),
+        )
+        second, second_has_more = await product_repository.get_page(
+            ProductFilterParams(limit=2),
+            after={"id": first[-1].id},
+        )
+
+        # Assert
+        assert len(first) == 2
+        assert first_has_more is True
+        assert len(second) == 1
+        assert second_has_more is False
+        ids = [product.id for product in first + second]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == 3
+
+    async def test_get_page_by_price_seeks_after_cursor(
+        self,
+        product_repository,
+        test_product1,
+        test_product2,
+        test_product3,
+    ):
+        # Arrange
+        await product_repository.create(test_product1)  # 29.99
+        await product_repository.create(test_product2)  # 19.99
+        await product_repository.create(test_product3)  # 39.99
+        filters = ProductFilterParams(limit=1, sort_by=ProductSortField.PRICE)
+
+        # Act
+        first, _ = await product_repository.get_page(filters)
+        second, has_more = await product_repository.get_page(
+            filters,
+            after={"price": first[0].price, "id": first[0].id},
+        )
+
+        # Assert
+        assert first[0].price == Decimal("19.99")
+        assert second[0].price == Decimal("29.99")
+        assert has_more is True
+
     async def test_update_product_success(
         self,
         product_repository,
@@ -284,6 +340,87 @@ class TestProductRepository:
         # Assert
         assert result == 0
 
+    async def test_adjust_quantities_applies_all_deltas(
+        self,
+        product_repository,
+        test_product1,
+        test_product2,
+    ):
+        # Arrange
+        product1 = await product_repository.create(test_product1)  # 10
+        product2 = await product_repository.create(test_product2)  # 5
+
+        # Act
+        result = await product_repository.adjust_quantities(
+            {product1.id: -3, product2.id: -5},
+        )
+
+        # Assert
+        assert result.adjusted == {product1.id: 7, product2.id: 0}
+        assert result.shortages == {}
+        updated = await product_repository.get_by_id(product2.id)
+        assert updated.quantity == 0
+        assert updated.in_stock is False
+
+    async def test_adjust_quantities_reports_shortages(
+        self,
+        product_repository,
+        test_product1,
+        test_product2,
+    ):
+        # Arrange
+        product1 = await product_repository.create(test_product1)  # 10
+        product2 = await product_repository.create(test_product2)  # 5
+
+        # Act
+        result = await product_repository.adjust_quantities(
+            {product1.id: -1, product2.id: -6, 999: -1},
+        )
+
+        # Assert
+        assert result.adjusted == {product1.id: 9}
+        assert result.shortages == {product2.id: 5}
+        unchanged = await product_repository.get_by_id(product2.id)
+        assert unchanged.quantity == 5
+
+    async def test_adjust_quantities_clamps_shortages(
+        self,
+        product_repository,
+        test_product1,
+        test_product2,
+    ):
+        # Arrange
+        product1 = await product_repository.create(test_product1)  # 10
+        product2 = await product_repository.create(test_product2)  # 5
+
+        # Act
+        result = await product_repository.adjust_quantities(
+            {product1.id: -1, product2.id: -6}, clamp=True,
+        )
+
+        # Assert
+        assert result.adjusted == {product1.id: 9, product2.id: 0}
+        assert result.shortages == {product2.id: 5}
+        sold_out = await product_repository.get_by_id(product2.id)
+        assert sold_out.quantity == 0
+        assert sold_out.in_stock is False
+
+    async def test_adjust_quantities_restores_stock(
+        self,
+        product_repository,
+        test_product3,
+    ):
+        # Arrange
+        product = await product_repository.create(test_product3)  # 0
+
+        # Act
+        result = await product_repository.adjust_quantities({product.id: 2})
+
+        # Assert
+        assert result.adjusted == {product.id: 2}
+        restored = await product_repository.get_by_id(product.id)
+        assert restored.in_stock is True
+
     async def test_exists_by_name_existing_product(
         self,
         product_repository,
@@ -340,6 +477,43 @@ class TestProductRepository:
             is True
         )
 
+    async def test_bulk_create_and_get_existing_names(
+        self,
+        product_repository,
+        test_product1,
+        test_product2,
+    ):
+        # Act
+        created = await product_repository.bulk_create([test_product1, test_product2])
+        existing = await product_repository.get_existing_names(
+            {test_product1.name, "Missing Product"}
+        )
+
+        # Assert
+        assert created == 2
+        assert existing == {test_product1.name}
+
+    async def test_stream_rows_yields_batches_in_id_order(
+        self,
+        product_repository,
+        test_product1,
+        test_product2,
+    ):
+        # Arrange
+        first = await product_repository.create(test_product1)
+        second = await product_repository.create(test_product2)
+
+        # Act
+        batches = [batch async for batch in product_repository.stream_rows(1)]
+
+        # Assert
+        assert [[row["id"] for row in batch] for batch in batches] == [
+            [first.id],
+            [second.id],
+        ]
+        assert batches[0][0]["name"] == test_product1.name
+        assert batches[0][0]["price"] == test_product1.price
+
     async def test_repository_returns_correct_types(
         self,
         product_repository,
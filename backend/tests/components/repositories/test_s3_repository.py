@@ -1,7 +1,10 @@
+import asyncio
 from types import SimpleNamespace
 
 import pytest
 
+from clients.s3_client import S3Client
+from core.exceptions import UploadTooLargeError
 from repositories.s3 import S3Repository
 from entrypoint.config import config
 
@@ -39,9 +42,13 @@ class DummyUploadFile:
         self.filename = filename
         self._content = content
         self.content_type = content_type
+        self._offset = 0
 
-    async def read(self):
-        return self._content
+    async def read(self, size: int = -1):
+        end = len(self._content) if size < 0 else self._offset + size
+        chunk = self._content[self._offset:end]
+        self._offset += len(chunk)
+        return chunk
 
 
 @pytest.mark.asyncio
@@ -148,3 +155,162 @@ async def test_delete_images_counts_deleted_items():
     repo.delete_image = fake_delete
     deleted_count = await repo.delete_images(urls)
     assert deleted_count == 1
+
+
+class SlowClient(DummyClient):
+    def __init__(self, fail_key_suffix: str | None = None):
+        super().__init__()
+        self.fail_key_suffix = fail_key_suffix
+        self.active = 0
+        self.max_active = 0
+        self.deleted = []
+
+    async def put_object(self, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if self.fail_key_suffix and kwargs["Key"].endswith(self.fail_key_suffix):
+            raise RuntimeError("upload failed")
+
+    async def delete_object(self, **kwargs):
+        self.deleted.append(kwargs["Key"])
+
+
+@pytest.mark.asyncio
+async def test_upload_images_runs_concurrently_up_to_limit():
+    repo = S3Repository(max_concurrency=2)
+    client = SlowClient()
+    repo.s3_client = SimpleNamespace(
+        bucket_name="bucket", get_client=lambda: DummyClientCtx(client)
+    )
+    config.s3.BUCKET_NAME = "bucket"
+
+    images = [DummyUploadFile(f"{i}.png", b"x") for i in range(5)]
+
+    urls = await repo.upload_images(images, product_id=3)
+
+    assert len(urls) == 5
+    assert client.max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_upload_images_deletes_uploaded_on_failure():
+    repo = S3Repository(max_concurrency=4)
+    client = SlowClient(fail_key_suffix=".gif")
+    repo.s3_client = SimpleNamespace(
+        bucket_name="bucket", get_client=lambda: DummyClientCtx(client)
+    )
+    config.s3.BUCKET_NAME = "bucket"
+
+    images = [
+        DummyUploadFile("a.png", b"a"),
+        DummyUploadFile("b.gif", b"b"),
+        DummyUploadFile("c.png", b"c"),
+    ]
+
+    with pytest.raises(RuntimeError):
+        await repo.upload_images(images, product_id=3)
+
+    assert len(client.deleted) == 2
+    assert all(key.endswith(".png") for key in client.deleted)
+
+
+@pytest.mark.asyncio
+async def test_s3_client_reuses_one_client_until_closed():
+    s3_client = S3Client(
+        access_key="key",
+        secret_key="secret",
+        endpoint_url="http://localhost:9000",
+        bucket_name="bucket",
+    )
+
+    async with s3_client.get_client() as first:
+        pass
+    async with s3_client.get_client() as second:
+        pass
+    await s3_client.close()
+
+    assert first is second
+
+
+class MultipartClient(DummyClient):
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.completed = None
+        self.aborted = False
+
+    async def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "upload-1"}
+
+    async def upload_part(self, **kwargs):
+        self.parts.append(kwargs)
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    async def complete_multipart_upload(self, **kwargs):
+        self.completed = kwargs
+
+    async def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+
+@pytest.mark.asyncio
+async def test_upload_image_above_part_size_uses_multipart():
+    repo = S3Repository(part_size=4)
+    client = MultipartClient()
+    repo.s3_client = SimpleNamespace(
+        bucket_name="bucket", get_client=lambda: DummyClientCtx(client)
+    )
+
+    await repo.upload_image(DummyUploadFile("big.png", b"0123456789"), product_id=1)
+
+    assert client._last_put is None
+    assert [part["Body"] for part in client.parts] == [b"0123", b"4567", b"89"]
+    assert all(part["ChecksumSHA256"] for part in client.parts)
+    assert client.completed["MultipartUpload"]["Parts"][2]["ETag"] == "etag-3"
+
+
+@pytest.mark.asyncio
+async def test_upload_images_enforces_request_budget():
+    repo = S3Repository(part_size=4, max_request_bytes=16, max_concurrency=1)
+    client = MultipartClient()
+    repo.s3_client = SimpleNamespace(
+        bucket_name="bucket", get_client=lambda: DummyClientCtx(client)
+    )
+    images = [
+        DummyUploadFile("a.png", b"0123456789"),
+        DummyUploadFile("b.png", b"0123456789"),
+    ]
+
+    with pytest.raises(UploadTooLargeError):
+        await repo.upload_images(images, product_id=1)
+
+    # The second file crosses the budget mid-upload; the first is removed.
+    assert client.aborted is True
+    assert client._last_delete is not None
+
+
+@pytest.mark.asyncio
+async def test_upload_variant_stores_next_to_original():
+    # Arrange
+    repo = S3Repository()
+    dummy_client = DummyClient()
+    repo.s3_client = SimpleNamespace(
+        bucket_name="test-bucket", get_client=lambda: DummyClientCtx(dummy_client)
+    )
+    config.s3.PUBLIC_ENDPOINT = "http://public.example"
+    config.s3.BUCKET_NAME = "test-bucket"
+
+    # Act
+    url = await repo.upload_variant(
+        "http://public.example/test-bucket/products/42/abc.jpg",
+        "thumbnail",
+        "webp",
+        b"WEBPDATA",
+    )
+
+    # Assert
+    assert url == "http://public.example/test-bucket/products/42/abc_thumbnail.webp"
+    assert dummy_client._last_put["Key"] == "products/42/abc_thumbnail.webp"
+    assert dummy_client._last_put["ContentType"] == "image/webp"
@@ -0,0 +1,57 @@
+from models import RoleEnum
+from repositories.user_cache import UserCacheRepository
+from schemas.user import UserResponse
+
+
+def make_user(user_id: int = 1) -> UserResponse:
+    return UserResponse(
+        id=user_id,
+        email=f"user{user_id}@test.com",
+        username=f"user{user_id}",
+        role=RoleEnum.ADMIN,
+    )
+
+
+class TestUserCacheRepository:
+    async def test_get_user_miss(self, user_cache):
+        # Act
+        result = await user_cache.get_user(1)
+
+        # Assert
+        assert result is None
+
+    async def test_set_then_get_user(self, user_cache):
+        # Arrange
+        user = make_user()
+        await user_cache.set_user(user)
+
+        # Act
+        result = await user_cache.get_user(user.id)
+
+        # Assert
+        assert result == user
+        assert result.role == RoleEnum.ADMIN
+
+    async def test_invalidate_drops_user(self, user_cache):
+        # Arrange
+        await user_cache.set_user(make_user(1))
+        await user_cache.set_user(make_user(2))
+
+        # Act
+        await user_cache.invalidate(1)
+
+        # Assert
+        assert await user_cache.get_user(1) is None
+        assert await user_cache.get_user(2) is not None
+
+    async def test_disabled_cache_is_noop(self, redis):
+        # Arrange
+        cache = UserCacheRepository(redis, enabled=False)
+        await cache.set_user(make_user())
+
+        # Act
+        result = await cache.get_user(1)
+
+        # Assert
+        assert result is None
+        assert await redis.keys("*") == []
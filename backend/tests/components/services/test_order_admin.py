@@ -0,0 +1,63 @@
+import pytest
+
+from schemas.order import OrderFilterParams, OrderStatus
+
+
+class TestAdminOrders:
+    async def test_cursor_walks_all_orders_newest_first(
+        self, order_service, admin_user, placed_orders
+    ):
+        # Arrange
+        filters = OrderFilterParams(limit=2)
+        seen = []
+
+        # Act
+        while True:
+            page = await order_service.get_all_orders(admin_user, filters)
+            seen.extend(order.id for order in page.items)
+            if page.next_cursor is None:
+                break
+            filters = filters.model_copy(update={"cursor": page.next_cursor})
+
+        # Assert
+        assert seen == [order.id for order in reversed(placed_orders)]
+
+    async def test_filters_are_combined(
+        self, order_service, admin_user, placed_orders
+    ):
+        # Arrange
+        third = placed_orders[2]
+        filters = OrderFilterParams(
+            status=OrderStatus.PAYED,
+            user_id=third.user_id,
+            date_from=placed_orders[1].created_at.date(),
+            max_amount=40,
+        )
+
+        # Act
+        page = await order_service.get_all_orders(admin_user, filters)
+
+        # Assert
+        assert [order.id for order in page.items] == [third.id]
+        assert page.items[0].order_products[0].quantity == 3
+
+    async def test_summary_has_line_totals_only(
+        self, order_service, admin_user, placed_orders
+    ):
+        # Act
+        page = await order_service.get_all_orders(
+            admin_user, OrderFilterParams(limit=1, summary=True),
+        )
+
+        # Assert
+        [order] = page.items
+        assert order.id == placed_orders[-1].id
+        assert (order.lines_count, order.items_count) == (1, 5)
+        assert not hasattr(order, "order_products")
+        assert page.next_cursor is not None
+
+    async def test_invalid_cursor_is_rejected(self, order_service, admin_user):
+        with pytest.raises(ValueError):
+            await order_service.get_all_orders(
+                admin_user, OrderFilterParams(cursor="not-a-cursor"),
+            )
@@ -0,0 +1,161 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, func, select, update
+
+from core.uow import UnitOfWork
+from models import Order, OrderProduct
+from schemas.order import CartItem, OrderCreateRequest, OrderStatus
+from schemas.product import ProductCreate
+from schemas.user import UserResponse
+
+
+@pytest.fixture
+def buyer(created_user) -> UserResponse:
+    return UserResponse(
+        id=created_user.id,
+        email=created_user.email,
+        username=created_user.username,
+        role=created_user.role,
+    )
+
+
+@pytest.fixture
+async def rose(session, product_repository, test_category_for_products):
+    product = await product_repository.create(ProductCreate(
+        name="Rose", price=Decimal("10"), in_stock=True,
+        quantity=10, category_id=test_category_for_products.id,
+    ))
+    await session.commit()
+    return product
+
+
+async def count_lines(session) -> int:
+    return await session.scalar(select(func.count(OrderProduct.id)))
+
+
+def cart_request(product_id: int, quantity: int) -> OrderCreateRequest:
+    return OrderCreateRequest(
+        order_products=[
+            CartItem(product_id=product_id, quantity=quantity, price=0),
+        ],
+    )
+
+
+class TestCartWriteBehind:
+    async def test_cart_edits_stay_in_redis(
+        self, session, order_service, cart_repository, buyer, rose
+    ):
+        # Act
+        cart = await order_service.update_cart(buyer, cart_request(rose.id, 3))
+
+        # Assert
+        assert cart.amount == 30.0
+        assert cart.order_products == [
+            CartItem(product_id=rose.id, quantity=3, price=10.0),
+        ]
+        assert await count_lines(session) == 0
+        assert (await cart_repository.get(buyer.id)).items == {rose.id: 3}
+
+    async def test_dirty_cart_is_copied_to_its_order(
+        self, session, order_service, order_repository, cart_repository,
+        buyer, rose,
+    ):
+        # Arrange
+        await order_service.update_cart(buyer, cart_request(rose.id, 3))
+        [user_id] = await cart_repository.pop_dirty(10)
+
+        # Act
+        async with UnitOfWork(session):
+            order = await order_repository.save_cart(
+                user_id, await cart_repository.get(user_id),
+            )
+
+        # Assert
+        assert order.amount == 30.0
+        assert order.product_quantities() == {rose.id: 3}
+        assert (await order_service.get_cart(buyer)).id == order.id
+
+    async def test_checked_out_order_is_left_alone(
+        self, session, order_service, order_repository, cart_repository,
+        buyer, rose,
+    ):
+        # Arrange
+        await order_service.update_cart(buyer, cart_request(rose.id, 3))
+        async with UnitOfWork(session):
+            await session.execute(
+                update(Order).values(status=OrderStatus.WAITING_PAY)
+            )
+
+        # Act
+        async with UnitOfWork(session):
+            order = await order_repository.save_cart(
+                buyer.id, await cart_repository.get(buyer.id),
+            )
+
+        # Assert
+        assert order is None
+        assert await count_lines(session) == 0
+
+
+class TestStaleCart:
+    async def test_cart_of_checked_out_order_is_dropped_when_persisted(
+        self, session, order_service, order_repository, cart_repository,
+        buyer, rose,
+    ):
+        # Arrange
+        await order_service.update_cart(buyer, cart_request(rose.id, 3))
+        async with UnitOfWork(session):
+            await session.execute(
+                update(Order).values(status=OrderStatus.WAITING_PAY)
+            )
+
+        # Act: what the write-behind task does with a cart it cannot save.
+        async with UnitOfWork(session):
+            order = await order_repository.save_cart(
+                buyer.id, await cart_repository.get(buyer.id),
+            )
+        if order is None:
+            await cart_repository.delete(buyer.id)
+        cart = await order_service.update_cart(buyer, cart_request(rose.id, 1))
+
+        # Assert
+        assert cart.order_products == [
+            CartItem(product_id=rose.id, quantity=1, price=10.0),
+        ]
+        assert cart.id == await session.scalar(
+            select(Order.id).where(Order.status == OrderStatus.IN_CART)
+        )
+
+    async def test_deleting_the_order_drops_its_cart(
+        self, session, order_service, cart_repository, admin_user, buyer, rose
+    ):
+        # Arrange
+        cart = await order_service.update_cart(buyer, cart_request(rose.id, 3))
+
+        # Act
+        await order_service.delete_order(cart.id, admin_user)
+
+        # Assert
+        assert await cart_repository.get(buyer.id) is None
+
+    async def test_reads_do_not_query_the_database(
+        self, session, order_service, buyer, rose
+    ):
+        # Arrange
+        await order_service.update_cart(buyer, cart_request(rose.id, 3))
+        engine = session.bind.sync_engine
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        # Act
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            await order_service.get_cart(buyer)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        # Assert
+        assert statements == []
@@ -0,0 +1,52 @@
+import json
+
+from schemas.order import OrderExportParams, OrderStatus
+from schemas.product import ProductFileFormat
+
+
+async def read_export(chunks) -> str:
+    return "".join([chunk async for chunk in chunks])
+
+
+class TestOrdersExport:
+    async def test_ndjson_export_filters_by_date_range(
+        self, order_service, admin_user, placed_orders
+    ):
+        # Arrange
+        params = OrderExportParams(
+            date_from=placed_orders[1].created_at.date(),
+            date_to=placed_orders[3].created_at.date(),
+        )
+
+        # Act
+        text = await read_export(order_service.export_orders(
+            admin_user, params, ProductFileFormat.NDJSON,
+        ))
+
+        # Assert
+        rows = [json.loads(line) for line in text.splitlines()]
+        assert [row["id"] for row in rows] == [
+            order.id for order in placed_orders[1:4]
+        ]
+        assert rows[1]["status"] == OrderStatus.PAYED
+        assert rows[1]["items_count"] == 3
+
+    async def test_resumed_csv_export_continues_without_header(
+        self, order_service, admin_user, placed_orders
+    ):
+        # Act
+        first = await read_export(order_service.export_orders(
+            admin_user, OrderExportParams(), ProductFileFormat.CSV,
+        ))
+        resumed = await read_export(order_service.export_orders(
+            admin_user,
+            OrderExportParams(after_id=placed_orders[2].id),
+            ProductFileFormat.CSV,
+        ))
+
+        # Assert
+        assert first.splitlines()[0].startswith("id,user_id,status")
+        assert len(first.splitlines()) == 6
+        assert [line.split(",")[0] for line in resumed.splitlines()] == [
+            str(order.id) for order in placed_orders[3:]
+        ]
@@ -52,6 +52,41 @@ class TestOrderServiceBusinessLogic:
         assert updated_product.quantity == 7  # 10 - 3
         assert updated_product.in_stock is True
 
+    async def test_deduct_after_payment_sells_out_oversold_products(
+        self,
+        session,
+        created_user,
+        order_service,
+        product_repository,
+        order_repository,
+        test_category_for_products,
+    ):
+        """OrderService should not refuse a paid order on a shortage."""
+        # Arrange
+        created_product = await product_repository.create(ProductCreate(
+            name="Scarce Product",
+            price=Decimal("50.00"),
+            in_stock=True,
+            quantity=5,
+            category_id=test_category_for_products.id,
+        ))
+        order = await order_repository.add(OrderCreate(
+            user_id=created_user.id,
+            order_products=[
+                CartItem(product_id=created_product.id, quantity=3, price=50.00)
+            ],
+        ))
+        # Sold elsewhere while this order was being paid.
+        await product_repository.adjust_quantities({created_product.id: -4})
+
+        # Act
+        await order_service.deduct_product_quantities(order.id)
+
+        # Assert
+        updated_product = await product_repository.get_by_id(created_product.id)
+        assert updated_product.quantity == 0
+        assert updated_product.in_stock is False
+
     async def test_restore_product_quantities_on_cancel(
         self,
         session,
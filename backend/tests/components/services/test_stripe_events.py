@@ -0,0 +1,177 @@
+import datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from entrypoint.config import config
+from models import Invoice, Order, SalesRollup, WebhookEvent
+from repositories import AnalyticsRepository
+from repositories import WebhookEventRepository
+from schemas.invoice import InvoiceStatus, Methods
+from schemas.order import OrderStatus
+from schemas.webhook import WebhookEventCreate
+from tasks import analytics
+from tasks.webhooks import STRIPE, apply_stripe_events
+
+START = datetime.datetime(2026, 1, 1, 12)
+
+
+def make_event(event_id: str, object_id: str, payment_status: str, minute: int):
+    return WebhookEventCreate(
+        provider=STRIPE,
+        event_id=event_id,
+        event_type="checkout.session.completed",
+        object_id=object_id,
+        occurred_at=START + datetime.timedelta(minutes=minute),
+        payload={"payment_status": payment_status},
+    )
+
+
+@pytest.fixture
+async def stripe_invoice(session, created_user) -> Invoice:
+    """An invoice awaiting payment through Stripe session ``cs_1``."""
+    order = Order(
+        user_id=created_user.id, status=OrderStatus.WAITING_PAY, amount=30.0,
+    )
+    session.add(order)
+    await session.flush()
+    invoice = Invoice(
+        name=f"Order {order.id}", order_id=order.id, user_id=created_user.id,
+        amount=30, method=Methods.STRIPE, status=InvoiceStatus.created,
+        provider_uid="cs_1",
+    )
+    session.add(invoice)
+    await session.commit()
+    return invoice
+
+
+@pytest.fixture
+def events(session) -> WebhookEventRepository:
+    return WebhookEventRepository(session)
+
+
+async def test_redelivered_event_is_stored_once(events):
+    assert await events.add(make_event("evt_1", "cs_1", "paid", 1)) is True
+    assert await events.add(make_event("evt_1", "cs_1", "paid", 1)) is False
+
+
+async def test_pending_events_are_applied_once(
+    session, events, created_user, stripe_invoice
+):
+    # Arrange: delivered out of order.
+    await events.add(make_event("evt_2", "cs_1", "paid", 2))
+    await events.add(make_event("evt_1", "cs_1", "unpaid", 1))
+
+    # Act
+    processed, paid = await apply_stripe_events(session, "cs_1")
+    again = await apply_stripe_events(session, "cs_1")
+
+    # Assert
+    assert processed == 2
+    [(invoice, order, email, _)] = paid
+    assert invoice.status == InvoiceStatus.payed
+    assert order.status == OrderStatus.PAYED
+    assert email == created_user.email
+    assert again == (0, [])
+
+
+async def test_events_of_unknown_sessions_stay_pending(
+    session, events, stripe_invoice
+):
+    # Arrange: the invoice may not be committed yet.
+    await events.add(make_event("evt_1", "cs_other", "paid", 1))
+
+    # Act
+    processed, paid = await apply_stripe_events(session, "cs_other")
+
+    # Assert
+    assert (processed, paid) == (0, [])
+    assert await session.scalar(select(WebhookEvent.processed_at)) is None
+
+
+async def test_events_of_unknown_sessions_are_given_up_on(
+    session, events, stripe_invoice
+):
+    # Arrange
+    await events.add(make_event("evt_1", "cs_other", "paid", 1))
+    await session.execute(
+        update(WebhookEvent).values(
+            created_at=datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+            - datetime.timedelta(seconds=config.stripe.EVENTS_GIVE_UP_AFTER + 60)
+        )
+    )
+
+    # Act
+    processed, paid = await apply_stripe_events(session, "cs_other")
+
+    # Assert
+    assert (processed, paid) == (1, [])
+    assert await session.scalar(select(WebhookEvent.processed_at)) is not None
+    invoice = await session.scalar(select(Invoice))
+    assert invoice.status == InvoiceStatus.created
+
+
+async def test_stale_pending_events_are_found(session, events, stripe_invoice):
+    # Arrange
+    await events.add(make_event("evt_1", "cs_1", "paid", 1))
+    await events.add(make_event("evt_2", "cs_2", "paid", 1))
+    await apply_stripe_events(session, "cs_1")
+
+    # Act
+    stale = await events.get_stale_object_ids(
+        STRIPE, datetime.timedelta(minutes=-1), 10,
+    )
+
+    # Assert
+    assert stale == ["cs_2"]
+
+
+async def test_paying_an_old_order_rebuilds_its_rollups(
+    session, events, stripe_invoice, monkeypatch
+):
+    # Arrange: created before the days the scheduled refresh rebuilds.
+    day = datetime.date.today() - datetime.timedelta(
+        days=config.analytics.REFRESH_DAYS + 2
+    )
+    order = await session.get(Order, stripe_invoice.order_id)
+    order.created_at = datetime.datetime.combine(day, datetime.time(12))
+    await session.commit()
+    await AnalyticsRepository(session).refresh_rollups(day, day)
+    await events.add(make_event("evt_1", "cs_1", "paid", 1))
+    queued = []
+
+    async def kiq(days):
+        queued.extend(days)
+        await analytics.rebuild_rollup_days(
+            session, {datetime.date.fromisoformat(day) for day in days}
+        )
+
+    monkeypatch.setattr(analytics.refresh_sales_rollup_days, "kiq", kiq)
+
+    # Act
+    processed, paid = await apply_stripe_events(session, "cs_1")
+    await session.commit()
+    await analytics.queue_rollup_refresh(*(created_on for *_, created_on in paid))
+
+    # Assert
+    assert queued == [day.isoformat()]
+    rollups = (await session.execute(
+        select(SalesRollup.day, SalesRollup.status, SalesRollup.orders_count)
+    )).all()
+    assert rollups == [(day, OrderStatus.PAYED, 1)]
+
+
+async def test_changes_to_todays_orders_are_not_queued(monkeypatch):
+    # Arrange
+    queued = []
+
+    async def kiq(days):
+        queued.extend(days)
+
+    monkeypatch.setattr(analytics.refresh_sales_rollup_days, "kiq", kiq)
+
+    # Act
+    await analytics.queue_rollup_refresh(datetime.date.today())
+
+    # Assert: today is aggregated live.
+    assert queued == []
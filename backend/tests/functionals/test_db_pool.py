@@ -0,0 +1,90 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.database import build_engine, connect_args
+from core.db_pool import InstrumentedAsyncQueuePool
+from entrypoint.config import config
+from middlewares.metrics import APP_NAME
+
+
+def pool_sample(name: str, pool: str) -> float:
+    return REGISTRY.get_sample_value(
+        name, {"pool": pool, "app_name": APP_NAME},
+    ) or 0.0
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name="pool-test",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+
+    await engine.dispose()
+
+
+async def test_checked_out_connections_are_reported(engine):
+    # Act
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+        checked_out = pool_sample("db_pool_checked_out", "pool-test")
+
+    # Assert
+    assert checked_out == 1
+    assert pool_sample("db_pool_checked_out", "pool-test") == 0
+    assert pool_sample("db_pool_size", "pool-test") == 1
+    assert pool_sample("db_pool_wait_seconds_count", "pool-test") >= 1
+
+
+async def test_exhausted_pool_counts_timeouts(engine):
+    # Arrange
+    timeouts_before = pool_sample("db_pool_timeouts_total", "pool-test")
+
+    # Act
+    async with engine.connect():
+        with pytest.raises(TimeoutError):
+            async with engine.connect():
+                pass
+
+    # Assert
+    assert pool_sample("db_pool_timeouts_total", "pool-test") == timeouts_before + 1
+
+
+async def test_engine_follows_database_config():
+    # Arrange
+    database = config.database.model_copy(
+        update={"POOL_SIZE": 7, "MAX_OVERFLOW": 3, "ECHO": False},
+    )
+
+    # Act
+    engine = build_engine(database.DATABASE_URI, database, "config-test")
+    await engine.dispose()
+
+    # Assert
+    assert isinstance(engine.pool, InstrumentedAsyncQueuePool)
+    assert engine.pool.size() == 7
+    assert engine.pool._max_overflow == 3
+    assert engine.echo is False
+
+
+def test_pgbouncer_mode_disables_prepared_statement_caches():
+    # Arrange
+    database = config.database.model_copy(update={"PGBOUNCER": True})
+
+    # Act
+    args = connect_args(database)
+
+    # Assert
+    assert args["statement_cache_size"] == 0
+    assert args["prepared_statement_cache_size"] == 0
+    assert args["prepared_statement_name_func"]() != (
+        args["prepared_statement_name_func"]()
+    )
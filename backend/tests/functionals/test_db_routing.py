@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.db_routing import RoutingSession, read_primary, read_replica
+
+metadata = MetaData()
+origin = Table(
+    "origin",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String),
+)
+
+
+@pytest.fixture
+async def session_factory():
+    engines = {}
+    for name in ("primary", "replica"):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as connection:
+            await connection.run_sync(metadata.create_all)
+            await connection.execute(insert(origin).values(id=1, name=name))
+        engines[name] = engine
+
+    yield async_sessionmaker(
+        engines["primary"],
+        sync_session_class=RoutingSession,
+        replica=engines["replica"].sync_engine,
+        expire_on_commit=False,
+    )
+
+    for engine in engines.values():
+        await engine.dispose()
+
+
+async def read_origin(session) -> str:
+    return await session.scalar(select(origin.c.name).where(origin.c.id == 1))
+
+
+@read_replica
+async def read_origin_from_replica(session) -> str:
+    return await read_origin(session)
+
+
+@read_replica
+async def read_origin_from_primary_block(session) -> tuple[str, str]:
+    with read_primary():
+        inside = await read_origin(session)
+    return inside, await read_origin(session)
+
+
+@read_replica
+async def read_origin_for_update(session) -> str:
+    return await session.scalar(
+        select(origin.c.name).where(origin.c.id == 1).with_for_update(),
+    )
+
+
+class TestRoutingSession:
+    async def test_reads_use_primary_by_default(self, session_factory):
+        async with session_factory() as session:
+            assert await read_origin(session) == "primary"
+
+    async def test_read_replica_methods_use_replica(self, session_factory):
+        async with session_factory() as session:
+            assert await read_origin_from_replica(session) == "replica"
+            # Only for the duration of the decorated call.
+            assert await read_origin(session) == "primary"
+
+    async def test_read_primary_block_overrides_replica(self, session_factory):
+        async with session_factory() as session:
+            assert await read_origin_from_primary_block(session) == (
+                "primary", "replica",
+            )
+
+    async def test_locking_reads_stay_on_primary(self, session_factory):
+        async with session_factory() as session:
+            assert await read_origin_for_update(session) == "primary"
+
+    async def test_session_is_pinned_to_primary_after_a_write(self, session_factory):
+        async with session_factory() as session:
+            # Arrange
+            await session.execute(insert(origin).values(id=2, name="new"))
+
+            # Act
+            name = await read_origin_from_replica(session)
+
+            # Assert
+            assert name == "primary"
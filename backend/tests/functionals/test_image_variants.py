@@ -0,0 +1,55 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from core.image_processor import ImageProcessor
+from utils.images import render_variants
+
+
+def make_image(size=(2000, 1000), mode="RGB", fmt="JPEG", color="red") -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, size, color).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def test_render_variants_resizes_and_encodes_every_format():
+    variants = render_variants(
+        make_image(),
+        sizes={"thumbnail": 320, "medium": 1024},
+        formats=["webp", "jpeg"],
+    )
+
+    assert set(variants) == {"thumbnail", "medium"}
+    with Image.open(BytesIO(variants["thumbnail"]["webp"])) as image:
+        assert image.format == "WEBP"
+        assert image.size == (320, 160)
+    with Image.open(BytesIO(variants["medium"]["jpeg"])) as image:
+        assert image.format == "JPEG"
+        assert image.size == (1024, 512)
+
+
+def test_render_variants_never_upscales_and_keeps_alpha():
+    variants = render_variants(
+        make_image(size=(100, 50), mode="RGBA", fmt="PNG", color=(255, 0, 0, 128)),
+        sizes={"thumbnail": 320},
+        formats=["webp"],
+    )
+
+    with Image.open(BytesIO(variants["thumbnail"]["webp"])) as image:
+        assert image.size == (100, 50)
+        assert image.mode == "RGBA"
+
+
+@pytest.fixture
+def image_processor():
+    processor = ImageProcessor(sizes={"thumbnail": 64}, formats=["webp"], workers=1)
+    yield processor
+    processor.shutdown()
+
+
+async def test_image_processor_renders_in_worker_process(image_processor):
+    variants = await image_processor.render(make_image())
+
+    with Image.open(BytesIO(variants["thumbnail"]["webp"])) as image:
+        assert image.size == (64, 32)
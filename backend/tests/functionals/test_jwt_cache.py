@@ -0,0 +1,57 @@
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from utils.jwt_utils import (VerifiedTokenCache, decode_jwt, encode_jwt,
+                             verified_tokens)
+
+
+@pytest.fixture(autouse=True)
+def clear_verified_tokens():
+    verified_tokens.clear()
+    yield
+    verified_tokens.clear()
+
+
+def test_decode_jwt_caches_verified_claims():
+    token = encode_jwt({"sub": "1"})
+
+    first = decode_jwt(token)
+    second = decode_jwt(token)
+
+    assert first == second
+    assert verified_tokens.get(token)["sub"] == "1"
+
+
+def test_decode_jwt_rejects_tampered_token():
+    token = encode_jwt({"sub": "1"})
+    decode_jwt(token)
+    header, payload, signature = token.split(".")
+    tampered = ".".join([header, payload, signature[::-1]])
+
+    with pytest.raises(jwt.InvalidTokenError):
+        decode_jwt(tampered)
+
+
+def test_decode_jwt_does_not_serve_expired_token():
+    token = encode_jwt({"sub": "1"}, expire_timedelta=timedelta(seconds=-1))
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        decode_jwt(token)
+    assert verified_tokens.get(token) is None
+
+
+def test_verified_token_cache_expires_and_evicts():
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.set("expired", {"exp": time.time() - 1})
+    cache.set("a", {"exp": time.time() + 60})
+    cache.set("b", {"exp": time.time() + 60})
+    cache.get("a")
+    cache.set("c", {"exp": time.time() + 60})
+
+    assert cache.get("expired") is None
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
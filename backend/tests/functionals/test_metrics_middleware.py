@@ -0,0 +1,144 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+
+from middlewares.metrics import APP_NAME, MetricsMiddleware
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+
+    @app.get("/metrics-test/items/{item_id}")
+    async def metrics_test_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/metrics-test/stream")
+    async def metrics_test_stream():
+        async def body():
+            for _ in range(3):
+                yield b"chunk"
+
+        return StreamingResponse(body())
+
+    @app.get("/metrics-test/boom")
+    async def metrics_test_boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+def requests_total(path: str, handler: str, status_code: str) -> float:
+    return REGISTRY.get_sample_value(
+        "http_requests_total",
+        {
+            "method": "GET",
+            "path": path,
+            "handler": handler,
+            "status": f"{status_code[0]}xx",
+            "status_code": status_code,
+            "app_name": APP_NAME,
+        },
+    ) or 0.0
+
+
+async def test_requests_are_labelled_by_route_template(client):
+    path = "/metrics-test/items/{item_id}"
+    before = requests_total(path, "metrics_test_item", "200")
+
+    for item_id in range(3):
+        await client.get(f"/metrics-test/items/{item_id}")
+
+    assert requests_total(path, "metrics_test_item", "200") == before + 3
+    assert REGISTRY.get_sample_value(
+        "http_requests_total",
+        {
+            "method": "GET",
+            "path": "/metrics-test/items/1",
+            "handler": "metrics_test_item",
+            "status": "2xx",
+            "status_code": "200",
+            "app_name": APP_NAME,
+        },
+    ) is None
+
+
+async def test_streaming_response_is_passed_through(client):
+    before = requests_total("/metrics-test/stream", "metrics_test_stream", "200")
+
+    response = await client.get("/metrics-test/stream")
+
+    assert response.text == "chunk" * 3
+    assert requests_total(
+        "/metrics-test/stream", "metrics_test_stream", "200"
+    ) == before + 1
+
+
+async def test_unmatched_and_failing_requests(client):
+    unmatched = MetricsMiddleware.UNMATCHED
+    before_404 = requests_total(unmatched, unmatched, "404")
+    before_500 = requests_total("/metrics-test/boom", "metrics_test_boom", "500")
+
+    await client.get("/metrics-test/missing/42")
+    response = await client.get("/metrics-test/boom")
+
+    assert response.status_code == 500
+    assert requests_total(unmatched, unmatched, "404") == before_404 + 1
+    assert requests_total(
+        "/metrics-test/boom", "metrics_test_boom", "500"
+    ) == before_500 + 1
+    assert REGISTRY.get_sample_value(
+        "http_exceptions_total",
+        {
+            "path": "/metrics-test/boom",
+            "handler": "metrics_test_boom",
+            "app_name": APP_NAME,
+        },
+    ) >= 1
+
+
+async def test_traceparent_is_recorded_as_exemplar(client):
+    await client.get(
+        "/metrics-test/items/7",
+        headers={"traceparent": f"00-{TRACE_ID}-b7ad6b7169203331-01"},
+    )
+
+    exemplars = [
+        sample.exemplar
+        for metric in REGISTRY.collect()
+        if metric.name == "http_request_duration_seconds"
+        for sample in metric.samples
+        if sample.exemplar and sample.labels.get("handler") == "metrics_test_item"
+    ]
+    assert any(exemplar.labels == {"trace_id": TRACE_ID} for exemplar in exemplars)
+
+
+async def test_exemplars_are_skipped_in_multiprocess_mode(app, monkeypatch):
+    monkeypatch.setattr("middlewares.metrics.is_multiprocess", lambda: True)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get(
+            "/metrics-test/stream",
+            headers={"traceparent": f"00-{TRACE_ID}-b7ad6b7169203331-01"},
+        )
+
+    exemplars = [
+        sample.exemplar
+        for metric in REGISTRY.collect()
+        if metric.name == "http_request_duration_seconds"
+        for sample in metric.samples
+        if sample.exemplar and sample.labels.get("handler") == "metrics_test_stream"
+    ]
+    assert exemplars == []
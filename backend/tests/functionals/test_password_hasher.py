@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from core.exceptions import PasswordHasherBusyError
+from core.password_hasher import PasswordHasher
+from utils.strings import make_valid_password
+
+
+@pytest.fixture
+def password_hasher():
+    hasher = PasswordHasher(workers=1, max_pending=0)
+    yield hasher
+    hasher.shutdown()
+
+
+async def test_hash_and_verify_in_pool(password_hasher):
+    password = make_valid_password()
+
+    hashed_password = await password_hasher.hash(password)
+
+    assert await password_hasher.verify(password, hashed_password) is True
+    assert await password_hasher.verify(password + "x", hashed_password) is False
+
+
+async def test_saturated_pool_rejects_new_calls(password_hasher):
+    password = make_valid_password()
+
+    running = asyncio.create_task(password_hasher.hash(password))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherBusyError):
+        await password_hasher.hash(password)
+
+    assert await running
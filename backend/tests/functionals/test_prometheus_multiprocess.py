@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+from utils.prometheus import build_registry, cleanup_dead_processes
+
+WORKER = """
+from prometheus_client import Counter, Gauge
+Counter("test_jobs_total", "Jobs", ["queue"]).labels(queue="emails").inc({count})
+Gauge("test_busy", "Busy", multiprocess_mode="livesum").set(1)
+"""
+
+
+def run_worker(directory, count: int) -> None:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(directory)}
+    subprocess.run(
+        [sys.executable, "-c", WORKER.format(count=count)],
+        env=env,
+        check=True,
+    )
+
+
+def test_registry_aggregates_every_process(tmp_path):
+    run_worker(tmp_path, 2)
+    run_worker(tmp_path, 3)
+
+    registry = build_registry(str(tmp_path))
+
+    assert registry.get_sample_value("test_jobs_total", {"queue": "emails"}) == 5
+
+
+def test_cleanup_removes_files_of_dead_processes(tmp_path):
+    run_worker(tmp_path, 1)
+    alive = tmp_path / f"counter_{os.getpid()}.db"
+    alive.write_bytes(b"")
+
+    dead = cleanup_dead_processes(str(tmp_path))
+
+    assert len(dead) == 1
+    assert [file.name for file in tmp_path.iterdir()] == [alive.name]
@@ -0,0 +1,219 @@
+import pytest
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.integrations.fastapi import (DishkaRoute, FromDishka,
+                                         setup_dishka)
+from fakeredis import FakeAsyncRedis
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from httpx import ASGITransport, AsyncClient
+
+from core.rate_limiter import (Algorithm, LocalRateLimitFilter, RateLimiter,
+                               RateLimitResult, Strategy, rate_limit)
+from core.rate_limiter.rate_limiter_factory import parse_policy
+
+
+@pytest.fixture
+async def redis():
+    client = FakeAsyncRedis()
+    yield client
+
+    await client.flushall()
+    await client.aclose()
+
+
+@pytest.fixture
+def rate_limiter(redis) -> RateLimiter:
+    return RateLimiter(redis)
+
+
+class TestRateLimiter:
+    async def test_hit_reports_remaining_quota_of_tightest_window(self, rate_limiter):
+        # Act
+        first = await rate_limiter.hit("1.2.3.4", "/login", [(3, 60), (10, 3600)])
+        second = await rate_limiter.hit("1.2.3.4", "/login", [(3, 60), (10, 3600)])
+
+        # Assert
+        assert first.limited is False
+        assert (first.limit, first.remaining) == (3, 2)
+        assert (second.limit, second.remaining) == (3, 1)
+        assert 0 < second.reset_after <= 60
+
+    async def test_hit_blocks_when_any_window_is_exhausted(self, rate_limiter, redis):
+        # Arrange
+        windows = [(2, 60), (10, 3600)]
+        for _ in range(2):
+            await rate_limiter.hit("1.2.3.4", "/login", windows)
+
+        # Act
+        result = await rate_limiter.hit("1.2.3.4", "/login", windows)
+
+        # Assert
+        assert result.limited is True
+        assert result.remaining == 0
+        assert 0 < result.retry_after <= 60
+        # Rejected hits are not recorded.
+        assert await redis.zcard("rate_limiter:/login:1.2.3.4") == 2
+
+    async def test_keys_are_separate_per_identifier(self, rate_limiter):
+        # Arrange
+        await rate_limiter.hit("1.2.3.4", "/login", [(1, 60)])
+
+        # Act
+        result = await rate_limiter.hit("5.6.7.8", "/login", [(1, 60)])
+
+        # Assert
+        assert result.limited is False
+
+
+class TestGCRA:
+    async def test_allows_a_burst_of_the_window_limit(self, rate_limiter, redis):
+        # Arrange
+        windows = [(3, 60), (10, 3600)]
+
+        # Act
+        results = [
+            await rate_limiter.hit("1.2.3.4", "/login", windows, Algorithm.GCRA)
+            for _ in range(4)
+        ]
+
+        # Assert
+        assert [result.limited for result in results] == [False] * 3 + [True]
+        assert [result.remaining for result in results] == [2, 1, 0, 0]
+        # The next request fits once one emission interval (60s / 3) passed.
+        assert 19 < results[-1].retry_after <= 20
+        # State is one hash field per window, whatever the traffic.
+        key = "rate_limiter:gcra:/login:1.2.3.4"
+        assert await redis.hlen(key) == 2
+        assert 0 < await redis.pttl(key) <= 3600 * 1000
+
+    async def test_rejected_hit_does_not_move_the_schedule(self, rate_limiter, redis):
+        # Arrange
+        await rate_limiter.hit("1.2.3.4", "/login", [(1, 60)], Algorithm.GCRA)
+        key = "rate_limiter:gcra:/login:1.2.3.4"
+        before = await redis.hget(key, "1")
+
+        # Act
+        result = await rate_limiter.hit(
+            "1.2.3.4", "/login", [(1, 60)], Algorithm.GCRA,
+        )
+
+        # Assert
+        assert result.limited is True
+        assert await redis.hget(key, "1") == before
+
+
+class TestLocalRateLimitFilter:
+    async def test_blocked_key_is_rejected_without_redis(self, redis):
+        # Arrange
+        rate_limiter = RateLimiter(redis, local_filter=LocalRateLimitFilter())
+        await rate_limiter.hit("1.2.3.4", "/login", [(1, 60)])
+        blocked = await rate_limiter.hit("1.2.3.4", "/login", [(1, 60)])
+        await redis.flushall()
+
+        # Act
+        result = await rate_limiter.hit("1.2.3.4", "/login", [(1, 60)])
+
+        # Assert
+        assert blocked.limited is True
+        assert result.limited is True
+        assert 0 < result.retry_after <= blocked.retry_after
+        assert await redis.exists("rate_limiter:/login:1.2.3.4") == 0
+
+    def test_oldest_keys_are_evicted(self):
+        # Arrange
+        local_filter = LocalRateLimitFilter(max_keys=2)
+        result = RateLimitResult(True, 1, 0, 60, 60)
+
+        # Act
+        for key in ("a", "b", "c"):
+            local_filter.block(key, result)
+
+        # Assert
+        assert len(local_filter) == 2
+        assert local_filter.check("a") is None
+        assert local_filter.check("c").limited is True
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [
+        ("5/s", ((5, 1),)),
+        ("3/m;10/h;20/d", ((3, 60), (10, 3600), (20, 86400))),
+    ],
+)
+def test_parse_policy(policy, expected):
+    assert parse_policy(policy) == expected
+
+
+@pytest.mark.parametrize(
+    "policy", [None, "", "5/w", "5/m;", "m/5", "1/s;2/m;3/h;4/d"],
+)
+def test_invalid_policy_fails_at_decoration(policy):
+    with pytest.raises(ValueError):
+        rate_limit(policy=policy)
+
+
+class FakeUser:
+    id = 42
+
+
+async def test_arguments_are_resolved_by_position_and_user(rate_limiter, redis):
+    # Arrange
+    @rate_limit(strategy=Strategy.USER, policy="1/m")
+    async def endpoint(request: Request, limiter: RateLimiter, current_user):
+        return "ok"
+
+    request = Request({"type": "http", "path": "/orders", "headers": []})
+
+    # Act
+    first = await endpoint(request, rate_limiter, current_user=FakeUser())
+    with pytest.raises(HTTPException) as blocked:
+        await endpoint(request, rate_limiter, current_user=FakeUser())
+
+    # Assert
+    assert first == "ok"
+    assert blocked.value.status_code == 429
+    assert await redis.zcard("rate_limiter:/orders:42") == 1
+
+
+@pytest.fixture
+async def client(rate_limiter):
+    class LimiterProvider(Provider):
+        @provide(scope=Scope.APP)
+        def get_rate_limiter(self) -> RateLimiter:
+            return rate_limiter
+
+    router = APIRouter(route_class=DishkaRoute)
+
+    @router.get("/limited")
+    @rate_limit(strategy=Strategy.IP, policy="2/m")
+    async def limited(
+        request: Request,
+        rate_limiter: FromDishka[RateLimiter],
+    ):
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router)
+    setup_dishka(make_async_container(LimiterProvider()), app)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+    ) as client:
+        yield client
+
+
+async def test_rate_limited_endpoint_sends_headers(client):
+    # Act
+    first = await client.get("/limited")
+    await client.get("/limited")
+    blocked = await client.get("/limited")
+
+    # Assert
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert first.headers["RateLimit-Remaining"] == "1"
+    assert "Retry-After" not in first.headers
+    assert blocked.status_code == 429
+    assert blocked.headers["RateLimit-Remaining"] == "0"
+    assert 1 <= int(blocked.headers["Retry-After"]) <= 60
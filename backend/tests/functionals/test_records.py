@@ -0,0 +1,61 @@
+import pytest
+
+from utils.records import (RecordFormatError, read_csv, read_ndjson,
+                           write_csv, write_ndjson, write_records)
+
+
+async def stream(data: bytes, size: int = 3):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def test_read_csv_handles_split_chunks_and_multiline_fields():
+    data = (
+        "﻿name,description,price\r\n"
+        'Rose,"Red, fresh",10.50\r\n'
+        '"Tulip","Spring\nbouquet",\r\n'
+        "\r\n"
+        "Лилия,,7\n"
+    ).encode()
+
+    rows = [row async for row in read_csv(stream(data))]
+
+    assert rows == [
+        (2, {"name": "Rose", "description": "Red, fresh", "price": "10.50"}),
+        (3, {"name": "Tulip", "description": "Spring\nbouquet"}),
+        (6, {"name": "Лилия", "price": "7"}),
+    ]
+
+
+async def test_read_csv_reports_unterminated_quote():
+    data = b'name,description\nRose,"never closed\n'
+
+    with pytest.raises(RecordFormatError) as error:
+        [row async for row in read_csv(stream(data))]
+
+    assert error.value.line == 2
+
+
+async def test_read_ndjson_keeps_line_numbers_and_skips_blank_lines():
+    data = b'{"name": "Rose"}\n\n{"name": \n'
+
+    rows = [row async for row in read_ndjson(stream(data))]
+
+    assert rows == [(1, '{"name": "Rose"}'), (3, '{"name": ')]
+
+
+def test_write_records_round_trip_fields():
+    rows = [{"id": 1, "name": "Rose, red", "price": "10.50"}]
+
+    assert write_csv(rows, ["id", "name"], header=True) == 'id,name\r\n1,"Rose, red"\r\n'
+    assert write_ndjson(rows) == '{"id": 1, "name": "Rose, red", "price": "10.50"}\n'
+
+
+async def test_write_records_writes_csv_header_once():
+    async def batches():
+        yield [{"id": 1}]
+        yield [{"id": 2}]
+
+    chunks = [chunk async for chunk in write_records(batches(), "csv", ["id"])]
+
+    assert chunks == ["id\r\n1\r\n", "2\r\n"]
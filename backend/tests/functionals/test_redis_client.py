@@ -0,0 +1,73 @@
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeConnection
+from prometheus_client import REGISTRY
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError
+
+from clients import RedisClient
+from clients.redis_client import InstrumentedConnectionPool
+from entrypoint.config import config
+from middlewares.metrics import APP_NAME
+
+
+def pool_sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, {**labels, "app_name": APP_NAME}) or 0.0
+
+
+@pytest.fixture
+async def pool():
+    pool = InstrumentedConnectionPool(
+        connection_class=FakeConnection,
+        server=FakeServer(),
+        max_connections=1,
+        timeout=0.05,
+    )
+    yield pool
+
+    await pool.disconnect()
+
+
+async def test_pool_usage_is_reported(pool):
+    # Arrange
+    redis = Redis(connection_pool=pool)
+    in_use_before = pool_sample("redis_pool_connections", state="in_use")
+
+    # Act
+    connection = await pool.get_connection()
+    in_use = pool_sample("redis_pool_connections", state="in_use")
+    await pool.release(connection)
+    await redis.set("key", "value")
+
+    # Assert
+    assert in_use == in_use_before + 1
+    assert pool_sample("redis_pool_connections", state="in_use") == in_use_before
+    assert await redis.get("key") == b"value"
+
+
+async def test_exhausted_pool_fails_after_timeout(pool):
+    # Arrange
+    exhausted_before = pool_sample("redis_pool_exhausted_total")
+    connection = await pool.get_connection()
+
+    # Act
+    with pytest.raises(ConnectionError):
+        await pool.get_connection()
+
+    # Assert
+    assert pool_sample("redis_pool_exhausted_total") == exhausted_before + 1
+    await pool.release(connection)
+
+
+async def test_client_pool_is_bounded_by_config():
+    # Arrange
+    client = RedisClient(config)
+
+    # Act
+    pool = client.get_redis().connection_pool
+
+    # Assert
+    assert isinstance(pool, InstrumentedConnectionPool)
+    assert pool.max_connections == config.redis.MAX_CONNECTIONS
+    assert pool.connection_kwargs["socket_timeout"] == config.redis.SOCKET_TIMEOUT
+    await client.close()
@@ -0,0 +1,159 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import (Column, Integer, MetaData, String, Table, event,
+                        func, insert, select)
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.db_pool import InstrumentedAsyncQueuePool
+from core.uow import UnitOfWork
+from middlewares.metrics import APP_NAME
+
+metadata = MetaData()
+notes = Table(
+    "notes",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("text", String),
+)
+
+
+def pool_sample(name: str) -> float:
+    return REGISTRY.get_sample_value(
+        name, {"pool": "uow-test", "app_name": APP_NAME},
+    ) or 0.0
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name="uow-test",
+    )
+
+    # pysqlite opens transactions on its own, which breaks SAVEPOINT.
+    @event.listens_for(engine.sync_engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def do_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+
+async def count_notes(session) -> int:
+    return await session.scalar(select(func.count()).select_from(notes))
+
+
+class TestUnitOfWork:
+    async def test_can_be_entered_again_after_commit(self, session):
+        # Arrange
+        uow = UnitOfWork(session)
+
+        # Act
+        async with uow:
+            await session.execute(insert(notes).values(text="first"))
+        async with uow:
+            await session.execute(insert(notes).values(text="second"))
+
+        # Assert
+        assert await count_notes(session) == 2
+
+    async def test_failing_nested_block_rolls_back_to_savepoint(self, session):
+        # Arrange
+        uow = UnitOfWork(session)
+
+        # Act
+        async with uow:
+            await session.execute(insert(notes).values(text="kept"))
+            with pytest.raises(ValueError):
+                async with uow:
+                    await session.execute(insert(notes).values(text="dropped"))
+                    raise ValueError("inner failure")
+
+        # Assert
+        assert await session.scalar(select(notes.c.text)) == "kept"
+        assert await count_notes(session) == 1
+
+    async def test_failing_outer_block_rolls_back_nested_work(self, session):
+        # Arrange
+        uow = UnitOfWork(session)
+
+        # Act
+        with pytest.raises(ValueError):
+            async with uow:
+                async with uow:
+                    await session.execute(insert(notes).values(text="nested"))
+                raise ValueError("outer failure")
+
+        # Assert
+        assert await count_notes(session) == 0
+        assert uow.active is False
+
+    async def test_after_commit_waits_for_the_outermost_commit(self, session):
+        # Arrange
+        uow = UnitOfWork(session)
+        seen = []
+
+        async def callback():
+            seen.append(await count_notes(session))
+
+        # Act
+        async with uow:
+            async with uow:
+                await session.execute(insert(notes).values(text="nested"))
+                uow.after_commit(callback)
+            assert seen == []
+
+        # Assert
+        assert seen == [1]
+
+    async def test_after_commit_is_dropped_with_its_block(self, session):
+        # Arrange
+        uow = UnitOfWork(session)
+        seen = []
+
+        async def callback():
+            seen.append("called")
+
+        # Act
+        async with uow:
+            with pytest.raises(ValueError):
+                async with uow:
+                    uow.after_commit(callback)
+                    raise ValueError("inner failure")
+        async with uow:
+            pass
+
+        # Assert
+        assert seen == []
+
+
+async def test_connection_is_only_held_while_in_use(engine, session):
+    # Arrange
+    holds_before = pool_sample("db_connection_hold_seconds_count")
+    uow = UnitOfWork(session)
+
+    # Act
+    checked_out_idle = pool_sample("db_pool_checked_out")
+    async with uow:
+        await session.execute(insert(notes).values(text="note"))
+        checked_out_busy = pool_sample("db_pool_checked_out")
+
+    # Assert
+    assert checked_out_idle == 0
+    assert checked_out_busy == 1
+    assert pool_sample("db_pool_checked_out") == 0
+    assert pool_sample("db_connection_hold_seconds_count") == holds_before + 1
@@ -5,6 +5,7 @@ from typing import AsyncGenerator
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from redis.asyncio import Redis
 
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
@@ -49,6 +50,16 @@ def get_executed_tasks():
     return _get_tasks
 
 
+@pytest.fixture(autouse=True)
+async def reset_rate_limits():
+    # Every client logs in from the same address, and /users/login is
+    # limited per IP: start each test with empty windows.
+    redis = Redis(host=config.redis.HOST, port=config.redis.PORT)
+    async for key in redis.scan_iter("rate_limiter:*"):
+        await redis.delete(key)
+    await redis.aclose()
+
+
 @pytest.fixture(scope="function")
 async def async_engine() -> AsyncEngine:
     engine = create_async_engine(
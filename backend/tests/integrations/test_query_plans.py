@@ -0,0 +1,218 @@
+"""EXPLAIN every hot repository query against a seeded Postgres.
+
+A query fails the check when its plan contains a sequential scan on one of
+the large tables, which usually means an index is missing or not usable.
+The tables are seeded once per module; each scenario runs in a transaction
+that is rolled back.
+"""
+import hashlib
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from entrypoint.config import config
+from models import Base
+from repositories import (CategoryRepository, InvoiceRepository,
+                          OrderRepository, ProductImageRepository,
+                          ProductRepository, PromocodeRepository,
+                          UserRepository)
+from schemas.product import ProductFilterParams, ProductSortField
+from schemas.promocode import PromoActivateCreate
+
+pytestmark = [
+    pytest.mark.database,
+    pytest.mark.slow,
+    pytest.mark.asyncio(loop_scope="module"),
+]
+
+USERS = 20_000
+PRODUCTS = 20_000
+ORDERS = 40_000
+
+LARGE_TABLES = {
+    "users",
+    "products",
+    "product_images",
+    "orders",
+    "order_products",
+    "invoices",
+}
+
+SEED_SQL = [
+    """
+    INSERT INTO categories (name)
+    SELECT 'Category ' || n FROM generate_series(1, 50) AS n
+    """,
+    f"""
+    INSERT INTO users (username, email, password, role, email_verified, token)
+    SELECT 'user' || n, 'user' || n || '@test.com', 'hash', 'user', true,
+           md5('user' || n)::uuid
+    FROM generate_series(1, {USERS}) AS n
+    """,
+    f"""
+    INSERT INTO products (name, price, in_stock, quantity, category_id)
+    SELECT 'Product ' || n, (n % 500) + 0.99, n % 10 <> 0, n % 10, 1 + n % 50
+    FROM generate_series(1, {PRODUCTS}) AS n
+    """,
+    f"""
+    INSERT INTO product_images (product_id, url, "order", is_primary)
+    SELECT 1 + n % {PRODUCTS}, 'images/' || n || '.jpg', n % 2, n % 2 = 0
+    FROM generate_series(1, {PRODUCTS * 2}) AS n
+    """,
+    f"""
+    INSERT INTO orders (user_id, status, amount, created_at)
+    SELECT 1 + n % {USERS},
+           (ARRAY['IN_CART', 'WAITING_PAY', 'PAYED', 'ERROR'])[1 + n % 4]::orderstatus,
+           100, now() - n * interval '1 minute'
+    FROM generate_series(1, {ORDERS}) AS n
+    """,
+    f"""
+    INSERT INTO order_products (order_id, product_id, quantity, price)
+    SELECT 1 + n % {ORDERS}, 1 + (n + n / {ORDERS}) % {PRODUCTS}, 1, 10
+    FROM generate_series(1, {ORDERS * 2}) AS n
+    """,
+    f"""
+    INSERT INTO invoices (uid, method, provider_uid, name, order_id, user_id, amount, status)
+    SELECT md5(n::text)::uuid, 'stripe', 'provider-' || n, 'Invoice ' || n,
+           n, 1 + n % {USERS}, 100, 'created'
+    FROM generate_series(1, {ORDERS}) AS n
+    """,
+    """
+    INSERT INTO promocodes (code, count_activation, max_count_activators, percent)
+    SELECT 'PROMO' || n, 0, 10, 5 FROM generate_series(1, 1000) AS n
+    """,
+    """
+    INSERT INTO promocode_actions (promo_id, user_id)
+    SELECT n, n FROM generate_series(1, 1000) AS n
+    """,
+]
+
+
+def md5_uuid(value: str) -> uuid.UUID:
+    return uuid.UUID(hashlib.md5(value.encode()).hexdigest())
+
+
+SCENARIOS = {
+    "product_get_by_id": lambda s: ProductRepository(s).get_by_id(1234),
+    "product_filter_by_category": lambda s: ProductRepository(s).get_filtered(
+        ProductFilterParams(category_id=7),
+    ),
+    "product_filter_by_price_range": lambda s: ProductRepository(s).get_filtered(
+        ProductFilterParams(min_price=Decimal("10.00"), max_price=Decimal("12.00")),
+    ),
+    "product_page_by_price": lambda s: ProductRepository(s).get_page(
+        ProductFilterParams(sort_by=ProductSortField.PRICE),
+        after={"price": Decimal("250.99"), "id": 10_000},
+    ),
+    "product_page_in_stock": lambda s: ProductRepository(s).get_page(
+        ProductFilterParams(in_stock=True, sort_by=ProductSortField.PRICE),
+    ),
+    "product_page_by_category": lambda s: ProductRepository(s).get_page(
+        ProductFilterParams(category_id=7),
+        after={"id": 10_000},
+    ),
+    "product_adjust_quantities": lambda s: ProductRepository(s).adjust_quantities(
+        {1234: -1, 4321: -1},
+    ),
+    "product_images_by_product": lambda s: ProductImageRepository(s).get_by_product_id(1234),
+    "category_get_by_id": lambda s: CategoryRepository(s).get_by_id(7),
+    "order_get": lambda s: OrderRepository(s).get(777, user_id=None),
+    "order_get_cart": lambda s: OrderRepository(s).get_cart(1234),
+    "order_get_purchases_user": lambda s: OrderRepository(s).get_purchases_user(1234),
+    "order_get_all_user": lambda s: OrderRepository(s).get_all_user(1234),
+    "order_get_order_products": lambda s: OrderRepository(s).get_order_products(777),
+    "invoice_get_by_uid": lambda s: InvoiceRepository(s).get_by_uid(md5_uuid("777")),
+    "invoice_get_by_provider_uid": lambda s: InvoiceRepository(s).get_by_provider_uid(
+        "provider-777",
+    ),
+    "user_get_by_email": lambda s: UserRepository(s).get_user_by_email("user77@test.com"),
+    "user_get_by_email_token": lambda s: UserRepository(s).get_user_by_email_token(
+        str(md5_uuid("user77")),
+    ),
+    "promocode_is_activated": lambda s: PromocodeRepository(s).get_promo_is_activate(
+        PromoActivateCreate(user_id=78, code="PROMO77"),
+    ),
+}
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in LARGE_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def seeded_engine():
+    engine = create_async_engine(config.database.DATABASE_URI)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        for statement in SEED_SQL:
+            await conn.execute(text(statement))
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE"))
+        await conn.commit()
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def seeded_session(seeded_engine):
+    async with seeded_engine.connect() as connection:
+        transaction = await connection.begin()
+        async with AsyncSession(bind=connection) as session:
+            yield session
+        await transaction.rollback()
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+async def test_query_plan_has_no_seq_scan_on_large_tables(
+        seeded_engine,
+        seeded_session,
+        scenario,
+):
+    # Arrange
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(seeded_engine.sync_engine, "before_cursor_execute", capture)
+
+    # Act
+    try:
+        await SCENARIOS[scenario](seeded_session)
+    finally:
+        event.remove(seeded_engine.sync_engine, "before_cursor_execute", capture)
+
+    connection = await seeded_session.connection()
+    offenders = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            continue
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}",
+            parameters,
+        )
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        for table in find_seq_scans(plan[0]["Plan"]):
+            offenders.append(f"{table}: {statement}")
+
+    # Assert
+    assert statements
+    assert not offenders, "Sequential scan on a large table:\n" + "\n".join(offenders)
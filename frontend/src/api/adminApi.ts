@@ -247,8 +247,20 @@ export interface OrderItem {
     updated_at?: string;
 }
 
-export async function getAdminOrders(): Promise<OrderItem[]> {
-    return requestJson<OrderItem[]>("/orders/all");
+export interface OrdersPage {
+    items: OrderItem[];
+    next_cursor: string | null;
+}
+
+export async function getAdminOrders(cursor?: string | null): Promise<OrdersPage> {
+    const params = new URLSearchParams();
+
+    if (cursor) {
+        params.set("cursor", cursor);
+    }
+
+    const query = params.toString();
+    return requestJson<OrdersPage>(`/orders/all${query ? `?${query}` : ""}`);
 }
 
 export async function deleteAdminOrder(orderId: number): Promise<void> {
@@ -15,15 +15,18 @@ export default function AdminOrders() {
   const { user } = useAuth();
   const role = user?.role?.toLowerCase?.() ?? "";
   const [items, setItems] = useState<OrderItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   const load = async () => {
     setIsLoading(true);
     setError(null);
     try {
-      const data = await getAdminOrders();
-      setItems(data);
+      const page = await getAdminOrders();
+      setItems(page.items);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Ошибка загрузки");
     } finally {
@@ -31,6 +34,23 @@ export default function AdminOrders() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) {
+      return;
+    }
+    setIsLoadingMore(true);
+    setError(null);
+    try {
+      const page = await getAdminOrders(nextCursor);
+      setItems((current) => [...current, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : "Ошибка загрузки");
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     if (role !== "admin") {
       return;
@@ -130,6 +150,19 @@ export default function AdminOrders() {
           </table>
         </div>
       )}
+
+      {!isLoading && nextCursor && (
+        <div className="flex justify-center">
+          <button
+            type="button"
+            onClick={() => void loadMore()}
+            disabled={isLoadingMore}
+            className="rounded-md border border-slate-300 bg-white px-4 py-2 text-sm text-slate-700 hover:bg-slate-50 disabled:opacity-60"
+          >
+            {isLoadingMore ? "Загрузка..." : "Показать ещё"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }